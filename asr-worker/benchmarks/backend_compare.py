@@ -0,0 +1,132 @@
+"""Compare the NeMo and onnxruntime backends on CPU: startup, peak RSS, real-time factor and agreement."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+STARTED_AT = time.perf_counter()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="asr-worker NeMo vs ONNX backend comparison")
+    parser.add_argument("--model", default=os.getenv("ASR_MODEL_EN", "nvidia/parakeet-tdt-0.6b-v2"))
+    parser.add_argument("--onnx-dir", default=os.getenv("ASR_ONNX_DIR", ""))
+    parser.add_argument("--backends", nargs="+", choices=["nemo", "onnx"], default=["nemo", "onnx"])
+    parser.add_argument("--clips", default=None, help="directory of audio clips (default: synthetic speech)")
+    parser.add_argument("--seconds", type=float, nargs="+", default=[3.0, 10.0], help="synthetic clip lengths")
+    parser.add_argument("--threads", type=int, default=0, help="torch / onnxruntime intra-op threads")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--child", choices=["nemo", "onnx"], help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load_audio(args: argparse.Namespace) -> list[np.ndarray]:
+    from asr_worker.app import DEFAULT_MODEL_SAMPLE_RATE
+
+    if args.clips is None:
+        from worker_load import synthetic_speech
+
+        return [synthetic_speech(seconds, DEFAULT_MODEL_SAMPLE_RATE) for seconds in args.seconds]
+
+    from pathlib import Path
+
+    from cpu_int8 import load_clips
+
+    return [np.asarray(audio) for _, audio, _ in load_clips(Path(args.clips).expanduser())]
+
+
+def run_child(args: argparse.Namespace) -> None:
+    from asr_worker.app import DEFAULT_MODEL_SAMPLE_RATE, ModelRegistry, WorkerSettings, transcribe_batch
+
+    settings = WorkerSettings()
+    settings.device = "cpu"
+    settings.backend = args.child
+    settings.onnx_threads = args.threads
+    settings.torch_threads = args.threads
+    loader = None
+    if args.child == "onnx":
+        from pathlib import Path
+
+        from asr_worker.onnx_backend import onnx_model_loader
+
+        loader = onnx_model_loader(Path(args.onnx_dir).expanduser(), threads=args.threads)
+    elif args.threads > 0:
+        from asr_worker.torch_tuning import configure_torch_threads
+
+        configure_torch_threads(args.threads, 0)
+
+    registry = ModelRegistry(settings, loader=loader)
+    audios = load_audio(args)
+    registry.get(args.model)
+    transcribe_batch(registry, args.model, [audios[0]], DEFAULT_MODEL_SAMPLE_RATE)
+    startup_seconds = time.perf_counter() - STARTED_AT
+
+    compute_seconds = 0.0
+    audio_seconds = 0.0
+    texts: list[str] = []
+    for audio in audios:
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            text = transcribe_batch(registry, args.model, [audio], DEFAULT_MODEL_SAMPLE_RATE)[0]
+            compute_seconds += time.perf_counter() - started
+            audio_seconds += audio.shape[0] / DEFAULT_MODEL_SAMPLE_RATE
+        texts.append(text)
+    print(
+        json.dumps(
+            {
+                "backend": args.child,
+                "startupSeconds": startup_seconds,
+                "peakRssBytes": peak_rss_bytes(),
+                "rtf": compute_seconds / audio_seconds,
+                "texts": texts,
+            }
+        )
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    if args.child:
+        run_child(args)
+        return
+    if "onnx" in args.backends and not args.onnx_dir:
+        raise SystemExit("--onnx-dir (or ASR_ONNX_DIR) is required for the onnx backend")
+
+    print(f"model={args.model} threads={args.threads or 'default'} iterations={args.iterations}")
+    texts: dict[str, list[str]] = {}
+    for backend in args.backends:
+        command = [sys.executable, os.path.abspath(__file__), *sys.argv[1:], "--child", backend]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()
+            print(f"{backend:>5} failed: {error[-1] if error else completed.returncode}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        texts[backend] = result["texts"]
+        print(
+            f"{backend:>5} startup={result['startupSeconds']:7.2f}s "
+            f"peakRSS={result['peakRssBytes'] / (1024 * 1024):8.1f}MiB rtf={result['rtf']:.3f}"
+        )
+
+    if "nemo" in texts and "onnx" in texts:
+        from cpu_int8 import error_rate
+
+        scores = [error_rate(reference, hypothesis) for reference, hypothesis in zip(texts["nemo"], texts["onnx"])]
+        print(f"onnx diff-vs-nemo={sum(scores) / len(scores) * 100:6.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Compare fp32 and dynamic-int8 CPU inference on real clips: latency and accuracy."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from asr_worker.app import (
+    DEFAULT_MODEL_SAMPLE_RATE,
+    call_model_transcribe_arrays,
+    import_asr_model_class,
+    normalize_transcriptions,
+)
+from asr_worker.chunking import tokenize
+from asr_worker.resample import resample_audio
+from asr_worker.torch_tuning import configure_torch_threads, inference_context, quantize_encoder_int8
+
+Clip = tuple[str, np.ndarray, str | None]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="asr-worker fp32 vs int8 CPU comparison")
+    parser.add_argument("--clips", required=True, help="directory with audio clips and optional <name>.txt references")
+    parser.add_argument("--model", default=os.getenv("ASR_MODEL_EN", "nvidia/parakeet-tdt-0.6b-v2"))
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = torch default)")
+    parser.add_argument("--interop-threads", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    return parser.parse_args()
+
+
+def load_clips(directory: Path) -> list[Clip]:
+    clips: list[Clip] = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() not in {".wav", ".flac", ".ogg"}:
+            continue
+        waveform, sample_rate = sf.read(path, dtype="float32", always_2d=False)
+        if waveform.ndim == 2:
+            waveform = waveform.mean(axis=1)
+        waveform = resample_audio(waveform, int(sample_rate), DEFAULT_MODEL_SAMPLE_RATE)
+        reference_path = path.with_suffix(".txt")
+        reference = reference_path.read_text(encoding="utf-8").strip() if reference_path.is_file() else None
+        clips.append((path.name, waveform, reference))
+    if not clips:
+        raise SystemExit(f"no wav/flac/ogg clips in {directory}")
+    return clips
+
+
+def transcribe(model: Any, audio: np.ndarray) -> str:
+    with inference_context():
+        return normalize_transcriptions(call_model_transcribe_arrays(model, [audio]), 1)[0]
+
+
+def run_mode(model: Any, clips: list[Clip], iterations: int, warmup: int) -> dict[str, Any]:
+    texts: dict[str, str] = {}
+    latencies: list[float] = []
+    audio_seconds = 0.0
+    for name, audio, _ in clips:
+        for _ in range(warmup):
+            transcribe(model, audio)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            texts[name] = transcribe(model, audio)
+            latencies.append(time.perf_counter() - started)
+            audio_seconds += audio.shape[0] / DEFAULT_MODEL_SAMPLE_RATE
+    return {"texts": texts, "latencies": latencies, "rtf": sum(latencies) / audio_seconds}
+
+
+def error_rate(reference: str, hypothesis: str) -> float:
+    """Word error rate for spaced text, character error rate otherwise."""
+    unit = "word" if " " in reference.strip() else "char"
+    ref = [token for token, _ in tokenize(reference, unit)]
+    hyp = [token for token, _ in tokenize(hypothesis, unit)]
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = np.arange(len(hyp) + 1)
+    for index, token in enumerate(ref, start=1):
+        current = np.empty_like(previous)
+        current[0] = index
+        for column, other in enumerate(hyp, start=1):
+            current[column] = min(
+                previous[column] + 1, current[column - 1] + 1, previous[column - 1] + (token != other)
+            )
+        previous = current
+    return float(previous[-1]) / len(ref)
+
+
+def summarize(label: str, result: dict[str, Any], scores: list[float], score_label: str) -> None:
+    latencies = sorted(result["latencies"])
+    print(
+        f"{label:>5} p50={statistics.median(latencies) * 1000:8.1f}ms mean={statistics.fmean(latencies) * 1000:8.1f}ms "
+        f"rtf={result['rtf']:.3f} {score_label}={statistics.fmean(scores) * 100:6.2f}%"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    threads = configure_torch_threads(args.threads, args.interop_threads)
+    clips = load_clips(Path(args.clips).expanduser())
+    model = import_asr_model_class().from_pretrained(model_name=args.model, map_location="cpu")
+    model.eval()
+    print(f"model={args.model} clips={len(clips)} threads={threads}")
+
+    fp32 = run_mode(model, clips, args.iterations, args.warmup)
+    quantize_encoder_int8(model)
+    int8 = run_mode(model, clips, args.iterations, args.warmup)
+
+    has_references = all(reference is not None for _, _, reference in clips)
+    score_label = "error" if has_references else "diff-vs-fp32"
+    fp32_scores: list[float] = []
+    int8_scores: list[float] = []
+    for name, _, reference in clips:
+        baseline = reference if has_references else fp32["texts"][name]
+        fp32_scores.append(error_rate(baseline, fp32["texts"][name]))
+        int8_scores.append(error_rate(baseline, int8["texts"][name]))
+        if fp32["texts"][name] != int8["texts"][name]:
+            print(f"  {name}\n    fp32: {fp32['texts'][name]}\n    int8: {int8['texts'][name]}")
+
+    summarize("fp32", fp32, fp32_scores, score_label)
+    summarize("int8", int8, int8_scores, score_label)
+    speedup = statistics.median(fp32["latencies"]) / statistics.median(int8["latencies"])
+    print(f"int8 speed-up (p50): {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
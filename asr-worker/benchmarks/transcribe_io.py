@@ -0,0 +1,101 @@
+"""Compare per-request ASR latency of the temp-WAV path and the in-memory path."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable
+
+import numpy as np
+import soundfile as sf
+
+from asr_worker.app import (
+    DEFAULT_MODEL_SAMPLE_RATE,
+    call_model_transcribe_arrays,
+    normalize_transcriptions,
+    transcribe_via_files,
+)
+
+
+class IoOnlyModel:
+    """Mimics the input handling of ``ASRModel.transcribe`` without running a network."""
+
+    def transcribe(self, audio: list[Any], batch_size: int = 1) -> list[str]:
+        texts: list[str] = []
+        for item in audio:
+            if isinstance(item, str):
+                waveform, _ = sf.read(item, dtype="float32", always_2d=False)
+            else:
+                waveform = np.asarray(item, dtype=np.float32)
+            texts.append(f"{waveform.shape[0]} samples")
+        return texts
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="asr-worker transcribe I/O benchmark")
+    parser.add_argument("--model", default=None, help="NeMo model name; omit to use the I/O-only stand-in")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--seconds", type=float, nargs="+", default=[2.0, 5.0, 15.0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    return parser.parse_args()
+
+
+def load_model(args: argparse.Namespace) -> Any:
+    if not args.model:
+        return IoOnlyModel()
+
+    from nemo.collections.asr.models import ASRModel
+
+    return ASRModel.from_pretrained(model_name=args.model, map_location=args.device)
+
+
+def synthetic_audio(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    length = int(DEFAULT_MODEL_SAMPLE_RATE * seconds)
+    t = np.arange(length, dtype=np.float32) / DEFAULT_MODEL_SAMPLE_RATE
+    tone = 0.2 * np.sin(2 * np.pi * 220.0 * t)
+    return (tone + 0.02 * rng.standard_normal(length)).astype(np.float32)
+
+
+def measure(run: Callable[[], Any], iterations: int, warmup: int) -> list[float]:
+    for _ in range(warmup):
+        run()
+    samples: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples
+
+
+def summarize(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return f"mean={statistics.fmean(ordered):8.2f}ms p50={statistics.median(ordered):8.2f}ms p95={p95:8.2f}ms"
+
+
+def main() -> None:
+    args = parse_args()
+    model = load_model(args)
+    label = args.model or "io-only stand-in"
+    print(f"model={label} iterations={args.iterations}")
+
+    for seconds in args.seconds:
+        audio = synthetic_audio(seconds)
+        file_samples = measure(
+            lambda: transcribe_via_files(model, [audio], DEFAULT_MODEL_SAMPLE_RATE), args.iterations, args.warmup
+        )
+        memory_samples = measure(
+            lambda: normalize_transcriptions(call_model_transcribe_arrays(model, [audio]), 1),
+            args.iterations,
+            args.warmup,
+        )
+        saved = statistics.median(file_samples) - statistics.median(memory_samples)
+        print(f"[{seconds:5.1f}s] temp-wav  {summarize(file_samples)}")
+        print(f"[{seconds:5.1f}s] in-memory {summarize(memory_samples)}  (p50 saved {saved:.2f}ms)")
+
+
+if __name__ == "__main__":
+    main()
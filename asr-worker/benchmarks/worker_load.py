@@ -0,0 +1,245 @@
+"""Load-test the ASR worker end to end without downloading Parakeet."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import io
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import numpy as np
+import soundfile as sf
+
+from asr_worker.app import DEFAULT_MODEL_SAMPLE_RATE, WorkerSettings, create_app
+
+RSS_SAMPLE_SECONDS = 0.02
+
+
+class StubAsrModel:
+    """Deterministic stand-in for ``ASRModel`` with a configurable inference cost."""
+
+    def __init__(self, name: str, fixed_cost_ms: float, cost_ms_per_second: float):
+        self.name = name
+        self.fixed_cost_seconds = fixed_cost_ms / 1000.0
+        self.cost_per_audio_second = cost_ms_per_second / 1000.0
+
+    def transcribe(self, audio: list[Any], batch_size: int = 1, **_: Any) -> list[str]:
+        waveforms = [
+            sf.read(item, dtype="float32", always_2d=False)[0] if isinstance(item, str) else np.asarray(item)
+            for item in audio
+        ]
+        seconds = sum(waveform.shape[0] for waveform in waveforms) / DEFAULT_MODEL_SAMPLE_RATE
+        time.sleep(self.fixed_cost_seconds + self.cost_per_audio_second * seconds)
+        return [f"stub {self.name} {waveform.shape[0]} samples" for waveform in waveforms]
+
+    def to(self, _device: Any) -> StubAsrModel:
+        return self
+
+    def eval(self) -> StubAsrModel:
+        return self
+
+
+@dataclass
+class Payload:
+    label: str
+    mime_type: str
+    data: bytes
+
+
+@dataclass
+class RunResult:
+    latencies_ms: list[float]
+    errors: int
+    elapsed_seconds: float
+    peak_rss_bytes: int
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="asr-worker end-to-end load benchmark")
+    parser.add_argument("--endpoints", nargs="+", default=["fast", "en", "ja", "mixed", "auto"])
+    parser.add_argument("--seconds", type=float, nargs="+", default=[2.0, 8.0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=64, help="requests per endpoint/payload/concurrency cell")
+    parser.add_argument("--formats", nargs="+", choices=["wav", "webm"], default=["wav", "webm"])
+    parser.add_argument("--raw", action="store_true", help="use the binary /raw endpoints instead of base64 JSON")
+    parser.add_argument("--fixed-cost-ms", type=float, default=20.0, help="stand-in model sleep per batch")
+    parser.add_argument(
+        "--cost-ms-per-second", type=float, default=30.0, help="stand-in model sleep per second of audio"
+    )
+    parser.add_argument("--real-model", action="store_true", help="load the configured ASR_MODEL_* weights")
+    parser.add_argument(
+        "--transcript-cache",
+        action="store_true",
+        help="keep the transcript cache on (off by default so repeated payloads still run the model)",
+    )
+    return parser.parse_args()
+
+
+def synthetic_speech(seconds: float, sample_rate: int) -> np.ndarray:
+    """Syllable-like tone bursts over a noise floor, so VAD keeps most of the clip."""
+    rng = np.random.default_rng(int(seconds * 1000))
+    length = int(sample_rate * seconds)
+    t = np.arange(length, dtype=np.float32) / sample_rate
+    pitch = 140.0 + 40.0 * np.sin(2 * np.pi * 0.7 * t)
+    envelope = 0.5 * (1.0 + np.sin(2 * np.pi * 4.0 * t)) ** 2
+    voiced = 0.2 * envelope * np.sin(2 * np.pi * np.cumsum(pitch) / sample_rate)
+    return (voiced + 0.005 * rng.standard_normal(length)).astype(np.float32)
+
+
+def build_payloads(seconds_list: list[float], formats: list[str]) -> list[Payload]:
+    ffmpeg = shutil.which("ffmpeg")
+    if "webm" in formats and ffmpeg is None:
+        print("ffmpeg not found; skipping webm payloads", file=sys.stderr)
+
+    payloads: list[Payload] = []
+    for seconds in seconds_list:
+        # 48 kHz like a browser MediaRecorder, so the resample path is part of the measurement.
+        audio = synthetic_speech(seconds, 48_000)
+        buffer = io.BytesIO()
+        sf.write(buffer, audio, 48_000, format="WAV")
+        wav = buffer.getvalue()
+        if "wav" in formats:
+            payloads.append(Payload(f"wav {seconds:g}s", "audio/wav", wav))
+        if "webm" in formats and ffmpeg is not None:
+            payloads.append(Payload(f"webm {seconds:g}s", "audio/webm", encode_webm(ffmpeg, wav)))
+    return payloads
+
+
+def encode_webm(ffmpeg: str, wav: bytes) -> bytes:
+    with tempfile.TemporaryDirectory() as directory:
+        target = os.path.join(directory, "clip.webm")
+        subprocess.run(
+            [ffmpeg, "-nostdin", "-v", "error", "-i", "pipe:0", "-c:a", "libopus", "-b:a", "32k", target],
+            input=wav,
+            check=True,
+        )
+        with open(target, "rb") as handle:
+            return handle.read()
+
+
+def current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is KiB on Linux and bytes on macOS; it is a process-wide high-water mark.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    def __init__(self) -> None:
+        self.peak = current_rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def __enter__(self) -> RssSampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            self.peak = max(self.peak, current_rss_bytes())
+
+
+async def run_cell(
+    client: httpx.AsyncClient, endpoint: str, payload: Payload, concurrency: int, total: int, raw: bool
+) -> RunResult:
+    if raw:
+        url = f"/v1/asr/{endpoint}/raw"
+        request_kwargs: dict[str, Any] = {
+            "content": payload.data,
+            "headers": {"content-type": "application/octet-stream", "x-audio-mime-type": payload.mime_type},
+        }
+    else:
+        url = f"/v1/asr/{endpoint}"
+        body = {"audioBase64": base64.b64encode(payload.data).decode("ascii"), "mimeType": payload.mime_type}
+        request_kwargs = {"json": body}
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await client.post(url, **request_kwargs)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            if response.status_code != 200:
+                errors += 1
+
+    with RssSampler() as sampler:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return RunResult(latencies, errors, elapsed, sampler.peak)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def report(endpoint: str, payload: Payload, concurrency: int, result: RunResult) -> None:
+    ordered = sorted(result.latencies_ms)
+    rps = len(ordered) / result.elapsed_seconds if result.elapsed_seconds > 0 else 0.0
+    print(
+        f"{endpoint:>6} {payload.label:>10} c={concurrency:<3} "
+        f"p50={statistics.median(ordered):8.1f}ms p95={percentile(ordered, 0.95):8.1f}ms "
+        f"p99={percentile(ordered, 0.99):8.1f}ms rps={rps:7.1f} "
+        f"peakRSS={result.peak_rss_bytes / (1024 * 1024):7.1f}MiB errors={result.errors}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    settings = WorkerSettings()
+    if not args.transcript_cache:
+        settings.transcript_cache_entries = 0
+    loader = None
+    if not args.real_model:
+        settings.device = "cpu"
+
+        def loader(model_name: str, _map_location: str) -> StubAsrModel:
+            return StubAsrModel(model_name, args.fixed_cost_ms, args.cost_ms_per_second)
+
+    app = create_app(settings, model_loader=loader)
+    app.state.warmup.wait()
+    payloads = build_payloads(args.seconds, args.formats)
+    mode = "real model" if args.real_model else f"stub {args.fixed_cost_ms:g}ms + {args.cost_ms_per_second:g}ms/s"
+    print(f"mode={mode} raw={args.raw} requests/cell={args.requests} batch={settings.batch_max_size}")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://asr-worker", timeout=None) as client:
+        # One untimed request per endpoint so model loading is not part of the first cell.
+        for endpoint in args.endpoints:
+            await run_cell(client, endpoint, payloads[0], 1, 1, args.raw)
+        for endpoint in args.endpoints:
+            for payload in payloads:
+                for concurrency in args.concurrency:
+                    result = await run_cell(client, endpoint, payload, concurrency, args.requests, args.raw)
+                    report(endpoint, payload, concurrency, result)
+
+
+def main() -> None:
+    asyncio.run(main_async(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,118 @@
 from __future__ import annotations
 
 import argparse
+import logging
+import os
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="english-trainer asr-worker")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("ASR_WORKERS", "1")),
+        help="pre-forked worker processes sharing the loaded models (default: ASR_WORKERS or 1)",
+    )
     parser.add_argument("--smoke", action="store_true")
+    subparsers = parser.add_subparsers(dest="command")
+
+    snapshot = subparsers.add_parser("snapshot", help="build local model snapshots for fast reloads")
+    snapshot.add_argument(
+        "--model",
+        action="append",
+        dest="models",
+        help="model to snapshot (repeatable, default: ASR_MODEL_FAST/EN/JA)",
+    )
+    snapshot.add_argument("--dir", default=None, help="snapshot directory (default: ASR_SNAPSHOT_DIR)")
+
+    export = subparsers.add_parser("export-onnx", help="export models for the onnxruntime backend (ASR_BACKEND=onnx)")
+    export.add_argument(
+        "--model",
+        action="append",
+        dest="models",
+        help="model to export (repeatable, default: ASR_MODEL_FAST/EN/JA)",
+    )
+    export.add_argument("--dir", default=None, help="export directory (default: ASR_ONNX_DIR)")
     return parser.parse_args()
 
 
+def build_snapshots(args: argparse.Namespace) -> None:
+    from pathlib import Path
+
+    from nemo.collections.asr.models import ASRModel
+
+    from .app import WorkerSettings, ordered_unique
+    from .snapshot import build_snapshot
+
+    settings = WorkerSettings()
+    directory = (args.dir or settings.snapshot_dir).strip()
+    if not directory:
+        raise SystemExit("snapshot directory is not set (use --dir or ASR_SNAPSHOT_DIR)")
+
+    root = Path(directory).expanduser()
+    models = ordered_unique(args.models or [settings.fast_model, settings.en_model, settings.ja_model])
+    for model_name in models:
+        model = ASRModel.from_pretrained(model_name=model_name, map_location="cpu")
+        target = build_snapshot(model, root, model_name)
+        print(f"ASR worker snapshot: {model_name} -> {target}")
+        del model
+
+
+def export_onnx_models(args: argparse.Namespace) -> None:
+    from pathlib import Path
+
+    from nemo.collections.asr.models import ASRModel
+
+    from .app import WorkerSettings, ordered_unique
+    from .onnx_backend import export_onnx
+
+    settings = WorkerSettings()
+    directory = (args.dir or settings.onnx_dir).strip()
+    if not directory:
+        raise SystemExit("ONNX directory is not set (use --dir or ASR_ONNX_DIR)")
+
+    root = Path(directory).expanduser()
+    models = ordered_unique(args.models or [settings.fast_model, settings.en_model, settings.ja_model])
+    for model_name in models:
+        model = ASRModel.from_pretrained(model_name=model_name, map_location="cpu")
+        target = export_onnx(model, root, model_name)
+        print(f"ASR worker ONNX export: {model_name} -> {target}")
+        del model
+
+
+def configure_logging() -> None:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("[asr-worker] %(message)s"))
+    logger = logging.getLogger("asr_worker")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
 def main() -> None:
     args = parse_args()
+    configure_logging()
+    if args.command == "snapshot":
+        build_snapshots(args)
+        return
+    if args.command == "export-onnx":
+        export_onnx_models(args)
+        return
+
     if args.smoke:
         from nemo.collections.asr.models import ASRModel  # noqa: F401
 
         print("ASR worker smoke: imports OK")
         return
 
+    if args.workers > 1:
+        from .prefork import serve_prefork
+
+        serve_prefork(args.host, args.port, args.workers)
+        return
+
     import uvicorn
 
     uvicorn.run("asr_worker.app:create_app", factory=True, host=args.host, port=args.port)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any
+
+# Absolute deadline in Unix epoch milliseconds, set by the caller from its own request timeout.
+DEADLINE_HEADER = "x-request-deadline"
+# Priority of jobs submitted outside a request (warmup) or for unlisted endpoints; lower runs first.
+DEFAULT_PRIORITY = 1
+QUEUE_FULL_RETRY_AFTER_SECONDS = 1
+
+
+class DeadlineExceeded(Exception):
+    """The caller's deadline passed before inference started; the result would be discarded."""
+
+
+@dataclass(frozen=True)
+class AdmissionTicket:
+    priority: int
+    deadline: float | None  # time.monotonic() seconds
+
+
+_current_ticket: ContextVar[AdmissionTicket | None] = ContextVar("asr_admission_ticket", default=None)
+
+
+def begin_admission(ticket: AdmissionTicket) -> Token[AdmissionTicket | None]:
+    """Makes ``ticket`` apply to every job the current request submits to the scheduler."""
+    return _current_ticket.set(ticket)
+
+
+def end_admission(token: Token[AdmissionTicket | None]) -> None:
+    _current_ticket.reset(token)
+
+
+def current_ticket() -> AdmissionTicket | None:
+    return _current_ticket.get()
+
+
+def parse_endpoint_priorities(raw: str) -> dict[str, int]:
+    """``fast=0,en=1`` -> ``{"fast": 0, "en": 1}``; malformed entries are ignored."""
+    priorities: dict[str, int] = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        try:
+            priorities[name.strip().lower()] = int(value)
+        except ValueError:
+            continue
+    return priorities
+
+
+def parse_deadline(raw: str | None) -> float | None:
+    """Converts an epoch-millisecond deadline header to ``time.monotonic()`` seconds."""
+    if raw is None or not raw.strip():
+        return None
+    try:
+        epoch_seconds = float(raw) / 1000.0
+    except ValueError:
+        return None
+    return time.monotonic() + (epoch_seconds - time.time())
+
+
+class AdmissionController:
+    """Turns requests away before any work is done when too many are in flight or the deadline passed."""
+
+    def __init__(self, max_in_flight: int, priorities: dict[str, int]):
+        self.max_in_flight = max(0, max_in_flight)
+        self.priorities = priorities
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = {"queueFull": 0, "deadline": 0}
+
+    def priority(self, endpoint: str) -> int:
+        return self.priorities.get(endpoint, DEFAULT_PRIORITY)
+
+    def try_admit(self) -> bool:
+        """Claims an in-flight slot; every admitted request must call ``release`` when it finishes."""
+        with self._lock:
+            if self.max_in_flight > 0 and self._in_flight >= self.max_in_flight:
+                self._rejected["queueFull"] += 1
+                return False
+            self._in_flight += 1
+            self._admitted += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def record_expired(self) -> None:
+        with self._lock:
+            self._rejected["deadline"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "inFlight": self._in_flight,
+                "maxInFlight": self.max_in_flight,
+                "priorities": dict(self.priorities),
+                "admitted": self._admitted,
+                "rejected": dict(self._rejected),
+            }
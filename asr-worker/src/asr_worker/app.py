@@ -1,24 +1,80 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import gc
+import inspect
 import io
+import json
+import logging
 import os
 import shutil
 import subprocess
 import tempfile
 import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
-from typing import Any, Literal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterator, Literal
 
 import numpy as np
 import soundfile as sf
-from fastapi import FastAPI, HTTPException
-from nemo.collections.asr.models import ASRModel
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from starlette.datastructures import UploadFile
+
+from .admission import (
+    DEADLINE_HEADER,
+    QUEUE_FULL_RETRY_AFTER_SECONDS,
+    AdmissionController,
+    AdmissionTicket,
+    DeadlineExceeded,
+    begin_admission,
+    end_admission,
+    parse_deadline,
+    parse_endpoint_priorities,
+)
+from .chunking import plan_chunks, stitch_transcripts
+from .metrics import (
+    AsrMetrics,
+    begin_request_timing,
+    gauge_lines,
+    process_memory,
+    server_timing_header,
+    timed_stage,
+)
+from .onnx_backend import onnx_model_loader
+from .resample import resample_audio
+from .scheduler import BatchScheduler
+from .snapshot import build_snapshot, has_snapshot, restore_snapshot
+from .streaming import PcmFrameReader, StreamConfig, StreamingTranscriber, parse_stream_config
+from .torch_tuning import configure_torch_threads, inference_context, quantize_encoder_int8
+from .transcript_cache import TranscriptCache, transcript_cache_key
+from .vad import VadConfig, trim_silence
+from .warmup import WARMUP_RETRY_AFTER_SECONDS, WarmupStep, WorkerWarmup
+
+if TYPE_CHECKING:
+    # NeMo takes seconds to import; the worker imports it on the warmup thread instead.
+    from nemo.collections.asr.models import ASRModel
 
 
 Language = Literal["ja", "en", "mixed", "unknown"]
+AsrEndpoint = Literal["fast", "en", "ja", "mixed", "auto"]
+AsrRoute = Literal["en", "ja", "mixed"]
+# (model name, map location) -> model; replaces from_pretrained/snapshot loading when given.
+ModelLoader = Callable[[str, str], Any]
+
+logger = logging.getLogger("asr_worker")
+
+DEFAULT_MODEL_SAMPLE_RATE = 16_000
+# Containers whose index may sit at the end of the file; ffmpeg needs to seek for those.
+SEEKABLE_INPUT_SUFFIXES = {".m4a"}
+# Upper bound on encoded stream bytes per second of ASR_STREAM_MAX_SECONDS; well above browser opus bitrates.
+STREAM_MAX_ENCODED_BYTES_PER_SECOND = 64_000
 
 
 def parse_bool_env(name: str, default: bool) -> bool:
@@ -58,6 +114,15 @@ class AsrResponse(BaseModel):
     enConfidence: float
     clipped: bool = False
     audioSeconds: float = 0.0
+    speechSeconds: float | None = None
+    route: AsrRoute | None = None
+
+
+@dataclass
+class RawUpload:
+    payload: bytes
+    mime_type: str
+    model: str | None = None
 
 
 @dataclass
@@ -67,31 +132,102 @@ class WorkerSettings:
     ja_model: str = os.getenv("ASR_MODEL_JA", "nvidia/parakeet-tdt_ctc-0.6b-ja")
     fast_clip_seconds: float = float(os.getenv("ASR_FAST_CLIP_SECONDS", "8.0"))
     device: str = os.getenv("ASR_DEVICE", "cpu").strip().lower()
+    backend: str = os.getenv("ASR_BACKEND", "nemo").strip().lower()
+    onnx_dir: str = os.getenv("ASR_ONNX_DIR", "").strip()
+    onnx_threads: int = int(os.getenv("ASR_ONNX_THREADS", "0"))
     single_model_cache: bool = parse_bool_env("ASR_SINGLE_MODEL_CACHE", True)
     preload_models: bool = parse_bool_env("ASR_PRELOAD_MODELS", False)
+    cpu_int8: bool = parse_bool_env("ASR_CPU_INT8", False)
+    torch_threads: int = int(os.getenv("ASR_TORCH_THREADS", "0"))
+    torch_interop_threads: int = int(os.getenv("ASR_TORCH_INTEROP_THREADS", "0"))
+    inference_mode: bool = parse_bool_env("ASR_INFERENCE_MODE", True)
+    in_memory_transcribe: bool = parse_bool_env("ASR_IN_MEMORY_TRANSCRIBE", True)
+    ffmpeg_max_processes: int = int(os.getenv("ASR_FFMPEG_MAX_PROCESSES", "4"))
+    ffmpeg_queue_timeout_seconds: float = float(os.getenv("ASR_FFMPEG_QUEUE_TIMEOUT_SECONDS", "10.0"))
+    ffmpeg_timeout_seconds: float = float(os.getenv("ASR_FFMPEG_TIMEOUT_SECONDS", "30.0"))
+    batch_max_size: int = int(os.getenv("ASR_BATCH_MAX_SIZE", "8"))
+    batch_window_ms: float = float(os.getenv("ASR_BATCH_WINDOW_MS", "10"))
+    queue_max_depth: int = int(os.getenv("ASR_QUEUE_MAX_DEPTH", "32"))
+    endpoint_priorities: str = os.getenv("ASR_ENDPOINT_PRIORITIES", "fast=0,en=1,ja=1,auto=1,mixed=2")
+    model_replicas: int = int(os.getenv("ASR_MODEL_REPLICAS", "1"))
+    model_cache_mb: int = int(os.getenv("ASR_MODEL_CACHE_MB", "0"))
+    model_offload: bool = parse_bool_env("ASR_MODEL_OFFLOAD", False)
+    model_offload_mb: int = int(os.getenv("ASR_MODEL_OFFLOAD_MB", "0"))
+    snapshot_dir: str = os.getenv("ASR_SNAPSHOT_DIR", "").strip()
+    snapshot_auto_build: bool = parse_bool_env("ASR_SNAPSHOT_AUTO_BUILD", False)
+    transcript_cache_entries: int = int(os.getenv("ASR_TRANSCRIPT_CACHE_ENTRIES", "256"))
+    transcript_cache_mb: float = float(os.getenv("ASR_TRANSCRIPT_CACHE_MB", "8"))
+    transcript_cache_ttl_seconds: float = float(os.getenv("ASR_TRANSCRIPT_CACHE_TTL_SECONDS", "3600"))
+    transcript_cache_dir: str = os.getenv("ASR_TRANSCRIPT_CACHE_DIR", "").strip()
+    transcript_cache_dir_mb: float = float(os.getenv("ASR_TRANSCRIPT_CACHE_DIR_MB", "256"))
+    auto_language_threshold: float = float(os.getenv("ASR_AUTO_LANGUAGE_THRESHOLD", "0.75"))
+    vad_endpoints: str = os.getenv("ASR_VAD_ENDPOINTS", "")
+    vad_min_db: float = float(os.getenv("ASR_VAD_MIN_DB", "-50"))
+    vad_margin_db: float = float(os.getenv("ASR_VAD_MARGIN_DB", "12"))
+    vad_padding_seconds: float = float(os.getenv("ASR_VAD_PADDING_SECONDS", "0.2"))
+    vad_max_pause_seconds: float = float(os.getenv("ASR_VAD_MAX_PAUSE_SECONDS", "0"))
+    chunk_seconds: float = float(os.getenv("ASR_CHUNK_SECONDS", "0"))
+    chunk_overlap_seconds: float = float(os.getenv("ASR_CHUNK_OVERLAP_SECONDS", "1.0"))
+    stream_window_seconds: float = float(os.getenv("ASR_STREAM_WINDOW_SECONDS", "8.0"))
+    stream_partial_interval_seconds: float = float(os.getenv("ASR_STREAM_PARTIAL_INTERVAL_SECONDS", "1.0"))
+    stream_max_seconds: float = float(os.getenv("ASR_STREAM_MAX_SECONDS", "120.0"))
 
 
 class ModelRegistry:
-    def __init__(self, settings: WorkerSettings):
+    """LRU cache of loaded models bounded by a byte budget, with an optional host-RAM tier."""
+
+    def __init__(
+        self,
+        settings: WorkerSettings,
+        observe_load: Callable[[str, str, float], None] | None = None,
+        loader: ModelLoader | None = None,
+    ):
         self.settings = settings
-        self._cache: dict[str, ASRModel] = {}
+        self._observe_load = observe_load
+        self._loader = loader
+        self.map_location = resolve_map_location(settings.device)
+        self.budget_bytes = max(0, settings.model_cache_mb) * 1024 * 1024
+        self.offload_budget_bytes = max(0, settings.model_offload_mb) * 1024 * 1024
+        self.offload_enabled = settings.model_offload and self.map_location != "cpu"
+        self.cpu_int8 = settings.cpu_int8 and self.map_location == "cpu" and settings.backend == "nemo"
+        self._int8_models: set[str] = set()
+        self._cache: OrderedDict[str, ASRModel] = OrderedDict()
+        self._offloaded: OrderedDict[str, ASRModel] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._pins: dict[str, int] = {}
+        self._array_input: dict[str, bool] = {}
         self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self.snapshot_root = Path(settings.snapshot_dir).expanduser() if settings.snapshot_dir else None
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "snapshotLoads": 0,
+            "restores": 0,
+            "evictions": 0,
+            "offloads": 0,
+        }
+        self._load_seconds = 0.0
+        self._restore_seconds = 0.0
+        self._last_load_seconds = 0.0
 
-    def get(self, model_name: str) -> ASRModel:
-        with self._lock:
-            model = self._cache.get(model_name)
-            if model is not None:
-                return model
+    def get(self, model_name: str, replica: int = 0) -> ASRModel:
+        with self.acquire(model_name, replica) as model:
+            return model
 
-            if self.settings.single_model_cache and self.settings.device == "cuda" and self._cache:
-                self._evict_all_locked()
+    @contextmanager
+    def acquire(self, model_name: str, replica: int = 0) -> Iterator[ASRModel]:
+        cache_key = replica_cache_key(model_name, replica)
+        model = self._pin(model_name, cache_key)
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._pins[cache_key] -= 1
 
-            model = ASRModel.from_pretrained(
-                model_name=model_name,
-                map_location=resolve_map_location(self.settings.device),
-            )
-            self._cache[model_name] = model
-            return model
+    def single_model_mode(self) -> bool:
+        return self.settings.single_model_cache and self.settings.device == "cuda"
 
     def loaded_models(self) -> list[str]:
         with self._lock:
@@ -101,30 +237,544 @@ class ModelRegistry:
         with self._lock:
             return {name: model_device_name(model) for name, model in self._cache.items()}
 
-    def _evict_all_locked(self) -> None:
-        self._cache.clear()
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hitRate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "budgetBytes": self.budget_bytes,
+                "residentBytes": sum(self._sizes.get(key, 0) for key in self._cache),
+                "residentModelBytes": {key: self._sizes.get(key, 0) for key in self._cache},
+                "offloadEnabled": self.offload_enabled,
+                "offloadBudgetBytes": self.offload_budget_bytes,
+                "offloadedBytes": sum(self._sizes.get(key, 0) for key in self._offloaded),
+                "offloadedModels": list(self._offloaded.keys()),
+                "loadSecondsTotal": round(self._load_seconds, 3),
+                "lastLoadSeconds": round(self._last_load_seconds, 3),
+                "restoreSecondsTotal": round(self._restore_seconds, 3),
+                "cpuInt8Models": sorted(self._int8_models),
+            }
+
+    def supports_array_input(self, model_name: str, model: ASRModel) -> bool:
+        if not self.settings.in_memory_transcribe:
+            return False
+        with self._lock:
+            supported = self._array_input.get(model_name)
+        if supported is None:
+            supported = transcribe_accepts_arrays(model)
+            with self._lock:
+                supported = self._array_input.setdefault(model_name, supported)
+        return supported
+
+    def mark_array_input_unsupported(self, model_name: str) -> None:
+        with self._lock:
+            self._array_input[model_name] = False
+
+    def file_transcribe_models(self) -> list[str]:
+        with self._lock:
+            return sorted(name for name, supported in self._array_input.items() if not supported)
+
+    def _pin(self, model_name: str, cache_key: str) -> ASRModel:
+        with self._lock:
+            model = self._cache.get(cache_key)
+            if model is not None:
+                self._cache.move_to_end(cache_key)
+                self._pins[cache_key] = self._pins.get(cache_key, 0) + 1
+                self._counters["hits"] += 1
+                return model
+            load_lock = self._load_locks.setdefault(cache_key, threading.Lock())
+
+        # Only loads of the same key wait on each other; other lanes keep using cached models.
+        with load_lock:
+            with self._lock:
+                model = self._cache.get(cache_key)
+                if model is not None:
+                    self._cache.move_to_end(cache_key)
+                    self._pins[cache_key] = self._pins.get(cache_key, 0) + 1
+                    self._counters["hits"] += 1
+                    return model
+                self._counters["misses"] += 1
+                # Free room up front when the size is known from an earlier load.
+                victims = self._take_victims_locked(keep=cache_key)
+                model = self._offloaded.pop(cache_key, None)
+            self._evict(victims)
+
+            started = time.perf_counter()
+            if model is not None:
+                model = model.to(self.map_location)
+                restored = True
+                source = "offload"
+            else:
+                model, source = self._load(model_name)
+                restored = False
+                if self.cpu_int8:
+                    model = self._quantize(model_name, model)
+            elapsed = time.perf_counter() - started
+            if self._observe_load is not None:
+                self._observe_load(model_name, source, elapsed)
+
+            with self._lock:
+                if restored:
+                    self._counters["restores"] += 1
+                    self._restore_seconds += elapsed
+                else:
+                    self._counters["loads"] += 1
+                    self._load_seconds += elapsed
+                    self._last_load_seconds = elapsed
+                    self._sizes[cache_key] = model_footprint_bytes(model)
+                self._cache[cache_key] = model
+                self._pins[cache_key] = self._pins.get(cache_key, 0) + 1
+                victims = self._take_victims_locked(keep=cache_key)
+            self._evict(victims)
+            return model
+
+    def _load(self, model_name: str) -> tuple[ASRModel, str]:
+        if self._loader is not None:
+            return self._loader(model_name, self.map_location), "custom"
+        if self.snapshot_root is not None and has_snapshot(self.snapshot_root, model_name):
+            try:
+                model = restore_snapshot(self.snapshot_root, model_name, self.map_location)
+                with self._lock:
+                    self._counters["snapshotLoads"] += 1
+                return model, "snapshot"
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("snapshot restore failed for %s, reloading: %s", model_name, exc)
+
+        model = import_asr_model_class().from_pretrained(model_name=model_name, map_location=self.map_location)
+        if self.snapshot_root is not None and self.settings.snapshot_auto_build:
+            try:
+                build_snapshot(model, self.snapshot_root, model_name)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("snapshot build failed for %s: %s", model_name, exc)
+        return model, "pretrained"
+
+    def _quantize(self, model_name: str, model: ASRModel) -> ASRModel:
+        try:
+            model = quantize_encoder_int8(model)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("int8 quantization failed for %s, keeping fp32: %s", model_name, exc)
+            return model
+        with self._lock:
+            self._int8_models.add(model_name)
+        return model
+
+    def _take_victims_locked(self, keep: str) -> list[tuple[str, ASRModel, threading.Lock]]:
+        """Removes least recently used models until ``keep`` fits; the caller evicts them with the lock released."""
+        needed = self._sizes.get(keep, 0)
+        others = sum(self._sizes.get(key, 0) for key in self._cache if key != keep)
+        victims: list[tuple[str, ASRModel, threading.Lock]] = []
+        for key in list(self._cache.keys()):
+            if key == keep or self._pins.get(key, 0) > 0:
+                continue
+            over_budget = self.budget_bytes > 0 and others + needed > self.budget_bytes
+            if not (self.single_model_mode() or over_budget):
+                break
+            # Holding the victim's load lock makes a concurrent _pin of it wait for the move to finish.
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+            if not load_lock.acquire(blocking=False):
+                continue
+            victims.append((key, self._cache.pop(key), load_lock))
+            others -= self._sizes.get(key, 0)
+        return victims
+
+    def _evict(self, victims: list[tuple[str, ASRModel, threading.Lock]]) -> None:
+        if not victims:
+            return
+        while victims:
+            key, model, load_lock = victims.pop(0)
+            try:
+                self._evict_one(key, model)
+            finally:
+                load_lock.release()
+            # Drop the last reference here so gc can free the device copy.
+            del model
         gc.collect()
         maybe_empty_cuda_cache()
 
+    def _evict_one(self, key: str, model: ASRModel) -> None:
+        if not self.offload_enabled:
+            with self._lock:
+                self._counters["evictions"] += 1
+            return
+        try:
+            offloaded = model.to("cpu")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("offloading %s failed, keeping it resident: %s", key, exc)
+            with self._lock:
+                self._cache[key] = model
+            return
+
+        with self._lock:
+            self._counters["evictions"] += 1
+            self._counters["offloads"] += 1
+            self._offloaded[key] = offloaded
+            if self.offload_budget_bytes <= 0:
+                return
+            offloaded_bytes = sum(self._sizes.get(name, 0) for name in self._offloaded)
+            while self._offloaded and offloaded_bytes > self.offload_budget_bytes:
+                name, _ = self._offloaded.popitem(last=False)
+                offloaded_bytes -= self._sizes.get(name, 0)
+
+
+class FfmpegDecoder:
+    """Pipes payloads through ffmpeg with a cap on concurrently running processes."""
+
+    def __init__(self, settings: WorkerSettings):
+        self.max_processes = max(1, settings.ffmpeg_max_processes)
+        self.queue_timeout_seconds = max(0.0, settings.ffmpeg_queue_timeout_seconds)
+        self.timeout_seconds = settings.ffmpeg_timeout_seconds if settings.ffmpeg_timeout_seconds > 0 else None
+        self._slots = threading.BoundedSemaphore(self.max_processes)
+        self._state_lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+
+    def decode(self, raw: bytes, mime_type: str | None) -> tuple[np.ndarray, int]:
+        ffmpeg = self._acquire()
+        try:
+            return decode_with_ffmpeg(ffmpeg, raw, mime_type, timeout_seconds=self.timeout_seconds)
+        finally:
+            self._release()
+
+    def open_stream(self) -> FfmpegStreamDecoder:
+        """Starts a long-lived decoder for one stream; it holds a process slot until closed."""
+        ffmpeg = self._acquire()
+        try:
+            return FfmpegStreamDecoder(ffmpeg, self.timeout_seconds, on_close=self._release)
+        except BaseException:
+            self._release()
+            raise
+
+    def _acquire(self) -> str:
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported audio payload and ffmpeg is not available for fallback decode",
+            )
+
+        with self._state_lock:
+            self._waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout_seconds)
+        finally:
+            with self._state_lock:
+                self._waiting -= 1
+        if not acquired:
+            raise HTTPException(status_code=503, detail="Audio decoder is busy, retry shortly")
+
+        with self._state_lock:
+            self._active += 1
+        return ffmpeg
+
+    def _release(self) -> None:
+        with self._state_lock:
+            self._active -= 1
+        self._slots.release()
+
+    def stats(self) -> dict[str, int]:
+        with self._state_lock:
+            return {"maxProcesses": self.max_processes, "active": self._active, "waiting": self._waiting}
 
-def create_app() -> FastAPI:
-    settings = WorkerSettings()
-    registry = ModelRegistry(settings)
-    inference_lock = threading.Lock()
+
+class FfmpegStreamDecoder:
+    """One ffmpeg per stream: container bytes go in through stdin, 16 kHz PCM comes out as it decodes."""
+
+    def __init__(self, ffmpeg: str, timeout_seconds: float | None, on_close: Callable[[], None]):
+        cmd = [
+            ffmpeg,
+            "-v",
+            "error",
+            # Start emitting samples from the first cluster instead of buffering to probe the input.
+            "-probesize",
+            "32",
+            "-analyzeduration",
+            "0",
+            "-fflags",
+            "nobuffer",
+            "-i",
+            "pipe:0",
+            "-ac",
+            "1",
+            "-ar",
+            str(DEFAULT_MODEL_SAMPLE_RATE),
+            "-f",
+            "f32le",
+            "pipe:1",
+        ]
+        self.timeout_seconds = timeout_seconds
+        self._on_close = on_close
+        self._closed = False
+        self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._lock = threading.Lock()
+        self._decoded: list[bytes] = []
+        self._partial_sample = b""
+        self._reader = threading.Thread(target=self._read_stdout, name="asr-stream-ffmpeg", daemon=True)
+        self._reader.start()
+
+    def feed(self, data: bytes) -> None:
+        assert self._process.stdin is not None
+        try:
+            self._process.stdin.write(data)
+            self._process.stdin.flush()
+        except OSError as exc:
+            raise HTTPException(status_code=400, detail=f"Unsupported audio payload: {self._error_detail()}") from exc
+
+    def take(self) -> np.ndarray:
+        """Samples decoded since the previous call."""
+        with self._lock:
+            data = self._partial_sample + b"".join(self._decoded)
+            self._decoded = []
+            usable = len(data) - len(data) % 4
+            self._partial_sample = data[usable:]
+        return np.frombuffer(data, dtype="<f4", count=usable // 4)
+
+    def finish(self) -> np.ndarray:
+        """Ends the input and returns the remaining samples once ffmpeg has flushed them."""
+        assert self._process.stdin is not None
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(timeout=self.timeout_seconds)
+        except subprocess.TimeoutExpired as exc:
+            self.close()
+            detail = f"Unsupported audio payload: ffmpeg timed out after {exc.timeout}s"
+            raise HTTPException(status_code=400, detail=detail) from exc
+        self._reader.join()
+        if self._process.returncode != 0:
+            detail = self._error_detail()
+            self.close()
+            raise HTTPException(status_code=400, detail=f"Unsupported audio payload: {detail}")
+        samples = self.take()
+        self.close()
+        return samples
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        for pipe in (self._process.stdin, self._process.stdout, self._process.stderr):
+            if pipe is not None and not pipe.closed:
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+        self._on_close()
+
+    def _read_stdout(self) -> None:
+        assert self._process.stdout is not None
+        try:
+            while True:
+                data = self._process.stdout.read1(65536)
+                if not data:
+                    return
+                with self._lock:
+                    self._decoded.append(data)
+        except (OSError, ValueError):
+            # The pipe was closed by close(); nothing left to collect.
+            return
+
+    def _error_detail(self) -> str:
+        if self._process.poll() is None or self._process.stderr is None:
+            return "ffmpeg stopped reading the stream"
+        try:
+            stderr = self._process.stderr.read().decode("utf-8", errors="replace").strip()
+        except (OSError, ValueError):
+            stderr = ""
+        return stderr[:300] if stderr else f"ffmpeg exited with code {self._process.returncode}"
+
+
+def create_app(settings: WorkerSettings | None = None, model_loader: ModelLoader | None = None) -> FastAPI:
+    """Builds the worker app; ``model_loader`` lets benchmarks and tools supply their own models."""
+    settings = settings or WorkerSettings()
+    if model_loader is None and settings.backend == "onnx":
+        if not settings.onnx_dir:
+            raise ValueError("ASR_BACKEND=onnx requires ASR_ONNX_DIR (see `asr-worker export-onnx`)")
+        model_loader = onnx_model_loader(Path(settings.onnx_dir).expanduser(), threads=settings.onnx_threads)
+    elif settings.backend not in {"nemo", "onnx"}:
+        raise ValueError(f"unknown ASR_BACKEND: {settings.backend} (expected nemo or onnx)")
+    metrics = AsrMetrics()
+    registry = ModelRegistry(settings, observe_load=metrics.observe_load, loader=model_loader)
+    decoder = FfmpegDecoder(settings)
+
+    def run_batch(model_name: str, replica: int, audios: list[np.ndarray], sample_rate: int) -> list[str]:
+        started = time.perf_counter()
+        texts = transcribe_batch(registry, model_name, audios, sample_rate, replica=replica, metrics=metrics)
+        audio_seconds = sum(duration_seconds(audio, sample_rate) for audio in audios)
+        metrics.observe_batch(model_name, audio_seconds, time.perf_counter() - started, len(audios))
+        return texts
+
+    scheduler = BatchScheduler(
+        run_batch,
+        observe_queue_wait=metrics.observe_queue_wait,
+        max_batch_size=settings.batch_max_size,
+        max_wait_seconds=settings.batch_window_ms / 1000.0,
+        replicas=settings.model_replicas,
+        # With a single-model GPU cache, running two models at once would load both anyway.
+        shared_lock=threading.Lock() if registry.single_model_mode() else None,
+    )
+    admission = AdmissionController(settings.queue_max_depth, parse_endpoint_priorities(settings.endpoint_priorities))
+    vad_endpoints = {name.strip().lower() for name in settings.vad_endpoints.split(",") if name.strip()}
+    vad_config = VadConfig(
+        min_db=settings.vad_min_db,
+        margin_db=settings.vad_margin_db,
+        padding_seconds=settings.vad_padding_seconds,
+        max_pause_seconds=settings.vad_max_pause_seconds,
+    )
+    transcript_cache = TranscriptCache(
+        max_entries=settings.transcript_cache_entries,
+        max_bytes=int(settings.transcript_cache_mb * 1024 * 1024),
+        ttl_seconds=settings.transcript_cache_ttl_seconds,
+        persist_dir=settings.transcript_cache_dir,
+        max_disk_bytes=int(settings.transcript_cache_dir_mb * 1024 * 1024),
+    )
+    # Settings that change a response for the same decoded audio; part of every transcript cache key.
+    transcript_config = {
+        "backend": settings.backend,
+        "cpuInt8": settings.cpu_int8,
+        "fastClipSeconds": settings.fast_clip_seconds,
+        "autoLanguageThreshold": settings.auto_language_threshold,
+        "chunkSeconds": settings.chunk_seconds,
+        "chunkOverlapSeconds": settings.chunk_overlap_seconds,
+        "vad": [vad_config.min_db, vad_config.margin_db, vad_config.padding_seconds, vad_config.max_pause_seconds],
+    }
     app = FastAPI(title="english-trainer-asr-worker", version="0.1.0")
     configured_models = ordered_unique([settings.fast_model, settings.en_model, settings.ja_model])
 
-    @app.on_event("startup")
-    def preload_on_startup() -> None:
-        if not settings.preload_models:
-            return
+    def warm_model(model_name: str) -> None:
+        # A short noise burst runs the full lane path once (allocator, kernels, decoding graph).
+        rng = np.random.default_rng(0)
+        audio = (0.01 * rng.standard_normal(DEFAULT_MODEL_SAMPLE_RATE)).astype(np.float32)
+        scheduler.transcribe(model_name, audio, DEFAULT_MODEL_SAMPLE_RATE)
+
+    torch_threads: dict[str, int] = {}
+
+    def configure_threads() -> None:
+        torch_threads.update(configure_torch_threads(settings.torch_threads, settings.torch_interop_threads))
+
+    warmup_steps: list[WarmupStep] = []
+    if settings.torch_threads > 0 or settings.torch_interop_threads > 0:
+        # Inter-op threads can only be set before torch runs parallel work, so this goes first.
+        warmup_steps.append(("configure torch threads", configure_threads))
+    if model_loader is None:
+        warmup_steps.append(("import nemo", import_asr_model_class))
+    if settings.preload_models:
         for model_name in configured_models:
-            registry.get(model_name)
+            warmup_steps.append((f"load {model_name}", lambda name=model_name: registry.get(name)))
+            warmup_steps.append((f"warm {model_name}", lambda name=model_name: warm_model(name)))
+    warmup = WorkerWarmup(warmup_steps)
+    app.state.warmup = warmup
+
+    @app.on_event("startup")
+    def start_warmup() -> None:
+        warmup.start()
+
+    def not_ready_response(extra: dict[str, Any] | None = None) -> JSONResponse:
+        headers = {} if warmup.failed else {"Retry-After": str(WARMUP_RETRY_AFTER_SECONDS)}
+        content = {**(extra or {}), "detail": warmup.not_ready_detail()}
+        return JSONResponse(status_code=503, content=content, headers=headers)
+
+    @app.exception_handler(DeadlineExceeded)
+    async def deadline_exceeded(_request: Request, exc: DeadlineExceeded) -> JSONResponse:
+        admission.record_expired()
+        return JSONResponse(status_code=504, content={"detail": f"ASR {exc}; inference skipped"})
+
+    @app.middleware("http")
+    async def admit_request(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        path = request.url.path
+        if not path.startswith("/v1/asr/"):
+            return await call_next(request)
+        ticket = AdmissionTicket(
+            priority=admission.priority(path.split("/")[3]),
+            deadline=parse_deadline(request.headers.get(DEADLINE_HEADER)),
+        )
+        if ticket.deadline is not None and ticket.deadline <= time.monotonic():
+            return await deadline_exceeded(request, DeadlineExceeded("request deadline passed before admission"))
+        # Counts requests from admission to response, so ones still reading or decoding audio count too.
+        if not admission.try_admit():
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "detail": "ASR worker is at capacity",
+                    "inFlight": admission.in_flight(),
+                    "maxInFlight": admission.max_in_flight,
+                },
+                headers={"Retry-After": str(QUEUE_FULL_RETRY_AFTER_SECONDS)},
+            )
+        token = begin_admission(ticket)
+        try:
+            return await call_next(request)
+        finally:
+            end_admission(token)
+            admission.release()
+
+    @app.middleware("http")
+    async def require_warmup(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        if request.url.path.startswith("/v1/asr/") and not warmup.ready:
+            warmup.start()
+            return not_ready_response()
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def record_server_timing(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        timings = begin_request_timing()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            path = request.url.path
+            if path.startswith("/v1/asr/"):
+                metrics.request_seconds.observe(time.perf_counter() - started, path.split("/")[3], str(status))
+        if timings:
+            response.headers["Server-Timing"] = server_timing_header(timings)
+        return response
+
+    @app.get("/metrics")
+    def prometheus_metrics() -> Response:
+        scheduler_stats = scheduler.stats()
+        cache_stats = registry.stats()
+        transcript_stats = transcript_cache.stats()
+        extra = [
+            *gauge_lines(
+                "asr_queue_depth",
+                "Jobs waiting for a model lane.",
+                [({"model": name}, depth) for name, depth in scheduler_stats["queueDepthByModel"].items()],
+            ),
+            *gauge_lines(
+                "asr_model_cache_resident_bytes",
+                "Bytes of models resident on the device.",
+                [({}, cache_stats["residentBytes"])],
+            ),
+            *gauge_lines("asr_model_cache_hit_ratio", "Model cache hit ratio.", [({}, cache_stats["hitRate"])]),
+            *gauge_lines(
+                "asr_transcript_cache_hit_ratio", "Transcript cache hit ratio.", [({}, transcript_stats["hitRate"])]
+            ),
+            *gauge_lines(
+                "asr_transcript_cache_bytes", "Bytes held by the transcript cache.", [({}, transcript_stats["bytes"])]
+            ),
+        ]
+        return Response(metrics.render(extra), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    @app.get("/ready")
+    def ready() -> Response:
+        if not warmup.ready:
+            return not_ready_response(warmup.status())
+        return JSONResponse(warmup.status())
 
     @app.get("/health")
     def health() -> dict[str, Any]:
         return {
             "ok": True,
+            "pid": os.getpid(),
+            "memory": process_memory(),
+            "warmup": warmup.status(),
             "fastModel": settings.fast_model,
             "enModel": settings.en_model,
             "jaModel": settings.ja_model,
@@ -132,118 +782,408 @@ def create_app() -> FastAPI:
             "loadedModelDevices": registry.loaded_model_devices(),
             "configuredModels": configured_models,
             "device": settings.device,
+            "backend": settings.backend,
             "singleModelCache": settings.single_model_cache,
             "preloadModels": settings.preload_models,
+            "snapshotDir": settings.snapshot_dir or None,
+            "vadEndpoints": sorted(vad_endpoints),
+            "inMemoryTranscribe": settings.in_memory_transcribe,
+            "cpuInt8": registry.cpu_int8,
+            "torchThreads": torch_threads or None,
+            "fileTranscribeModels": registry.file_transcribe_models(),
+            "ffmpegDecoder": decoder.stats(),
+            "scheduler": scheduler.stats(),
+            "admission": admission.stats(),
+            "modelCache": registry.stats(),
+            "transcriptCache": transcript_cache.stats(),
         }
 
+    def respond(endpoint: AsrEndpoint, audio: np.ndarray, sample_rate: int, model: str | None) -> AsrResponse:
+        if not transcript_cache.enabled:
+            return respond_uncached(endpoint, audio, sample_rate, model)
+        config = {**transcript_config, "vadEnabled": endpoint in vad_endpoints}
+        key = transcript_cache_key(audio, sample_rate, endpoint, endpoint_models(endpoint, model), config)
+        payload = transcript_cache.get_or_compute(
+            key, lambda: respond_uncached(endpoint, audio, sample_rate, model).model_dump()
+        )
+        return AsrResponse(**payload)
+
+    def endpoint_models(endpoint: AsrEndpoint, model: str | None) -> list[str]:
+        if endpoint == "fast":
+            return [model or settings.fast_model]
+        if endpoint == "en":
+            return [model or settings.en_model]
+        if endpoint == "ja":
+            return [model or settings.ja_model]
+        if endpoint == "auto":
+            return [model or settings.fast_model, settings.en_model, settings.ja_model]
+        return [settings.en_model, settings.ja_model]
+
+    def respond_uncached(
+        endpoint: AsrEndpoint, audio: np.ndarray, sample_rate: int, model: str | None
+    ) -> AsrResponse:
+        audio_seconds = duration_seconds(audio, sample_rate)
+        speech_seconds: float | None = None
+        if endpoint in vad_endpoints:
+            with metrics.stage("vad"):
+                vad = trim_silence(audio, sample_rate, vad_config)
+            if vad.is_silent:
+                return silent_response(audio_seconds)
+            audio, speech_seconds = vad.audio, vad.speech_seconds
+
+        if endpoint == "fast":
+            return fast_response(audio, sample_rate, model or settings.fast_model, audio_seconds, speech_seconds)
+        if endpoint == "en":
+            model_name = model or settings.en_model
+            return single_model_response("en", audio, sample_rate, model_name, audio_seconds, speech_seconds)
+        if endpoint == "ja":
+            model_name = model or settings.ja_model
+            return single_model_response("ja", audio, sample_rate, model_name, audio_seconds, speech_seconds)
+        if endpoint == "auto":
+            return auto_response(audio, sample_rate, model or settings.fast_model, audio_seconds, speech_seconds)
+        return mixed_response(audio, sample_rate, audio_seconds, speech_seconds)
+
+    def fast_response(
+        audio: np.ndarray, sample_rate: int, model_name: str, audio_seconds: float, speech_seconds: float | None
+    ) -> AsrResponse:
+        with metrics.stage("clip"):
+            clipped, was_clipped, _ = clip_audio(audio, sample_rate, settings.fast_clip_seconds)
+        with metrics.stage("inference"):
+            transcript = scheduler.transcribe(model_name, clipped, sample_rate)
+        confidence = estimate_language_confidence(transcript)
+        language = confidence_to_language(confidence)
+        return AsrResponse(
+            text=transcript,
+            language=language,
+            languageConfidence=confidence,
+            jaConfidence=confidence["ja"],
+            enConfidence=confidence["en"],
+            clipped=was_clipped,
+            audioSeconds=audio_seconds,
+            speechSeconds=speech_seconds,
+        )
+
+    def single_model_response(
+        language: Literal["en", "ja"],
+        audio: np.ndarray,
+        sample_rate: int,
+        model_name: str,
+        audio_seconds: float,
+        speech_seconds: float | None,
+    ) -> AsrResponse:
+        with metrics.stage("inference"):
+            transcript = submit_long(model_name, audio, sample_rate)()
+        confidence = estimate_language_confidence(transcript)
+        return AsrResponse(
+            text=transcript,
+            language=language,
+            languageConfidence=confidence,
+            jaConfidence=confidence["ja"],
+            enConfidence=confidence["en"],
+            clipped=False,
+            audioSeconds=audio_seconds,
+            speechSeconds=speech_seconds,
+        )
+
+    def submit_long(model_name: str, audio: np.ndarray, sample_rate: int) -> Callable[[], str]:
+        """Queues audio (in pause-aligned windows when chunking applies) and returns a callable for the text."""
+        if settings.chunk_seconds <= 0:
+            return scheduler.submit(model_name, audio, sample_rate).result
+        chunks = plan_chunks(audio, sample_rate, settings.chunk_seconds, settings.chunk_overlap_seconds, vad_config)
+        if len(chunks) == 1:
+            return scheduler.submit(model_name, audio, sample_rate).result
+        # Bounded per request so a long clip neither fills the lane ahead of other clients nor queues every window.
+        windows = [audio[start:end] for start, end in chunks]
+        futures = scheduler.submit_windows(model_name, windows, sample_rate, settings.batch_max_size)
+        return lambda: stitch_transcripts([future.result() for future in futures], settings.chunk_overlap_seconds)
+
+    def mixed_response(
+        audio: np.ndarray, sample_rate: int, audio_seconds: float, speech_seconds: float | None
+    ) -> AsrResponse:
+        with metrics.stage("inference"):
+            en_result = submit_long(settings.en_model, audio, sample_rate)
+            ja_result = submit_long(settings.ja_model, audio, sample_rate)
+            en_text = en_result()
+            ja_text = ja_result()
+
+        text = merge_mixed_transcripts(ja_text, en_text)
+        confidence = estimate_language_confidence(text)
+        return AsrResponse(
+            text=text,
+            language="mixed",
+            languageConfidence=confidence,
+            jaConfidence=confidence["ja"],
+            enConfidence=confidence["en"],
+            clipped=False,
+            audioSeconds=audio_seconds,
+            speechSeconds=speech_seconds,
+        )
+
+    def auto_response(
+        audio: np.ndarray, sample_rate: int, fast_model: str, audio_seconds: float, speech_seconds: float | None
+    ) -> AsrResponse:
+        """Runs the fast model on the clipped prefix, then the full model(s) for the detected language."""
+        fast = fast_response(audio, sample_rate, fast_model, audio_seconds, speech_seconds)
+        route = confidence_to_language(fast.languageConfidence, settings.auto_language_threshold)
+        if route == "en" or route == "ja":
+            model_name = settings.en_model if route == "en" else settings.ja_model
+            if model_name == fast_model and not fast.clipped and fast.text:
+                response = fast.model_copy(update={"language": route})
+            else:
+                response = single_model_response(route, audio, sample_rate, model_name, audio_seconds, speech_seconds)
+        else:
+            route = "mixed"
+            response = mixed_response(audio, sample_rate, audio_seconds, speech_seconds)
+        return response.model_copy(update={"route": route})
+
     @app.post("/v1/asr/fast", response_model=AsrResponse)
     def fast_decode(request: AsrRequest) -> AsrResponse:
-        with inference_lock:
-            audio, sample_rate = decode_audio_base64(request.audioBase64, request.mimeType)
-            clipped, was_clipped, audio_seconds = clip_audio(audio, sample_rate, settings.fast_clip_seconds)
-            transcript = transcribe(
-                registry,
-                model_name=request.model or settings.fast_model,
-                audio=clipped,
-                sample_rate=sample_rate,
-            )
-            confidence = estimate_language_confidence(transcript)
-            language = confidence_to_language(confidence)
-            return AsrResponse(
-                text=transcript,
-                language=language,
-                languageConfidence=confidence,
-                jaConfidence=confidence["ja"],
-                enConfidence=confidence["en"],
-                clipped=was_clipped,
-                audioSeconds=audio_seconds,
-            )
+        audio, sample_rate = decode_audio_base64(request.audioBase64, request.mimeType, decoder, metrics)
+        return respond("fast", audio, sample_rate, request.model)
 
     @app.post("/v1/asr/en", response_model=AsrResponse)
     def en_decode(request: AsrRequest) -> AsrResponse:
-        with inference_lock:
-            transcript, audio_seconds = decode_with_single_model(
-                registry, request.audioBase64, request.mimeType, request.model or settings.en_model
-            )
-            confidence = estimate_language_confidence(transcript)
-            return AsrResponse(
-                text=transcript,
-                language="en",
-                languageConfidence=confidence,
-                jaConfidence=confidence["ja"],
-                enConfidence=confidence["en"],
-                clipped=False,
-                audioSeconds=audio_seconds,
-            )
+        audio, sample_rate = decode_audio_base64(request.audioBase64, request.mimeType, decoder, metrics)
+        return respond("en", audio, sample_rate, request.model)
 
     @app.post("/v1/asr/ja", response_model=AsrResponse)
     def ja_decode(request: AsrRequest) -> AsrResponse:
-        with inference_lock:
-            transcript, audio_seconds = decode_with_single_model(
-                registry, request.audioBase64, request.mimeType, request.model or settings.ja_model
-            )
-            confidence = estimate_language_confidence(transcript)
-            return AsrResponse(
-                text=transcript,
-                language="ja",
-                languageConfidence=confidence,
-                jaConfidence=confidence["ja"],
-                enConfidence=confidence["en"],
-                clipped=False,
-                audioSeconds=audio_seconds,
-            )
+        audio, sample_rate = decode_audio_base64(request.audioBase64, request.mimeType, decoder, metrics)
+        return respond("ja", audio, sample_rate, request.model)
 
     @app.post("/v1/asr/mixed", response_model=AsrResponse)
     def mixed_decode(request: AsrRequest) -> AsrResponse:
-        with inference_lock:
-            audio, sample_rate = decode_audio_base64(request.audioBase64, request.mimeType)
-            en_text = transcribe(
-                registry,
-                model_name=settings.en_model,
-                audio=audio,
-                sample_rate=sample_rate,
-            )
-            ja_text = transcribe(
-                registry,
-                model_name=settings.ja_model,
-                audio=audio,
-                sample_rate=sample_rate,
-            )
+        audio, sample_rate = decode_audio_base64(request.audioBase64, request.mimeType, decoder, metrics)
+        return respond("mixed", audio, sample_rate, request.model)
 
-            text = merge_mixed_transcripts(ja_text, en_text)
-            confidence = estimate_language_confidence(text)
-            return AsrResponse(
-                text=text,
-                language="mixed",
-                languageConfidence=confidence,
-                jaConfidence=confidence["ja"],
-                enConfidence=confidence["en"],
-                clipped=False,
-                audioSeconds=duration_seconds(audio, sample_rate),
-            )
+    @app.post("/v1/asr/auto", response_model=AsrResponse)
+    def auto_decode(request: AsrRequest) -> AsrResponse:
+        audio, sample_rate = decode_audio_base64(request.audioBase64, request.mimeType, decoder, metrics)
+        return respond("auto", audio, sample_rate, request.model)
+
+    @app.post("/v1/asr/{endpoint}/raw", response_model=AsrResponse)
+    async def raw_decode(endpoint: AsrEndpoint, request: Request) -> AsrResponse:
+        upload = await read_raw_upload(request)
+
+        def run() -> AsrResponse:
+            audio, sample_rate = decode_audio_bytes(upload.payload, upload.mime_type, decoder, metrics)
+            return respond(endpoint, audio, sample_rate, upload.model)
+
+        return await run_in_threadpool(run)
+
+    @app.websocket("/v1/asr/stream")
+    async def stream_decode(websocket: WebSocket) -> None:
+        try:
+            config = parse_stream_config(dict(websocket.query_params))
+        except ValueError as exc:
+            await websocket.close(code=1008, reason=str(exc))
+            return
+        if not warmup.ready:
+            warmup.start()
+            # 1013: try again later.
+            await websocket.close(code=1013, reason=warmup.not_ready_detail())
+            return
+        # BaseHTTPMiddleware never sees websocket scopes, so streams are admitted here.
+        ticket = AdmissionTicket(
+            priority=admission.priority("stream"),
+            deadline=parse_deadline(websocket.headers.get(DEADLINE_HEADER)),
+        )
+        if ticket.deadline is not None and ticket.deadline <= time.monotonic():
+            admission.record_expired()
+            await websocket.close(code=1008, reason="request deadline passed before admission")
+            return
+        if not admission.try_admit():
+            await websocket.close(code=1013, reason="ASR worker is at capacity")
+            return
+        token = begin_admission(ticket)
+        try:
+            await run_stream(websocket, config)
+        finally:
+            end_admission(token)
+            admission.release()
+
+    async def run_stream(websocket: WebSocket, config: StreamConfig) -> None:
+        await websocket.accept()
+
+        if config.language == "en":
+            model_name = config.model or settings.en_model
+        elif config.language == "ja":
+            model_name = config.model or settings.ja_model
+        else:
+            model_name = config.model or settings.fast_model
+
+        async def transcribe_segment(audio: np.ndarray, sample_rate: int) -> str:
+            audio = resample_audio(audio, sample_rate, DEFAULT_MODEL_SAMPLE_RATE)
+            return await asyncio.wrap_future(scheduler.submit(model_name, audio, DEFAULT_MODEL_SAMPLE_RATE))
+
+        pcm_reader = PcmFrameReader(config.encoding) if config.encoding != "opus" else None
+        transcriber = StreamingTranscriber(
+            # Container streams come out of ffmpeg already at the model rate.
+            sample_rate=config.sample_rate if pcm_reader is not None else DEFAULT_MODEL_SAMPLE_RATE,
+            window_seconds=settings.stream_window_seconds,
+            partial_interval_seconds=settings.stream_partial_interval_seconds,
+            max_seconds=settings.stream_max_seconds,
+            transcribe=transcribe_segment,
+        )
+        max_encoded_bytes = int(max(0.0, settings.stream_max_seconds) * STREAM_MAX_ENCODED_BYTES_PER_SECOND)
+        encoded_bytes = 0
+        stream_decoder: FfmpegStreamDecoder | None = None
+        pending: asyncio.Task[None] | None = None
+
+        async def send_partial() -> None:
+            audio_seconds = transcriber.audio_seconds
+            try:
+                text = await transcriber.partial()
+            except HTTPException:
+                # A failed partial only costs this update; the final pass retries.
+                return
+            await websocket.send_json({"type": "partial", "text": text, "audioSeconds": audio_seconds})
+
+        try:
+            if pcm_reader is None:
+                stream_decoder = await run_in_threadpool(decoder.open_stream)
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    if pending is not None:
+                        pending.cancel()
+                    return
+
+                if message.get("bytes") is not None:
+                    frame = message["bytes"]
+                    if pcm_reader is not None:
+                        transcriber.append(pcm_reader.read(frame))
+                    else:
+                        assert stream_decoder is not None
+                        encoded_bytes += len(frame)
+                        if max_encoded_bytes and encoded_bytes > max_encoded_bytes:
+                            raise HTTPException(status_code=413, detail="Stream exceeds ASR_STREAM_MAX_SECONDS")
+                        await run_in_threadpool(stream_decoder.feed, frame)
+                        transcriber.append(stream_decoder.take())
+                    if transcriber.over_limit():
+                        raise HTTPException(status_code=413, detail="Stream exceeds ASR_STREAM_MAX_SECONDS")
+                    if transcriber.partial_due() and (pending is None or pending.done()):
+                        pending = asyncio.create_task(send_partial())
+                    continue
+
+                text_message = message.get("text") or ""
+                try:
+                    control = json.loads(text_message) if text_message else {}
+                except json.JSONDecodeError:
+                    control = {"type": text_message.strip()}
+                if isinstance(control, dict) and control.get("type") == "end":
+                    break
+
+            if pending is not None:
+                await pending
+            if stream_decoder is not None:
+                if encoded_bytes == 0:
+                    raise HTTPException(status_code=400, detail="Audio payload is empty")
+                transcriber.append(await run_in_threadpool(stream_decoder.finish))
+                if transcriber.over_limit():
+                    raise HTTPException(status_code=413, detail="Stream exceeds ASR_STREAM_MAX_SECONDS")
+            text = await transcriber.final()
+        except WebSocketDisconnect:
+            if pending is not None:
+                pending.cancel()
+            return
+        except HTTPException as exc:
+            if pending is not None:
+                pending.cancel()
+            await close_stream_with_error(websocket, exc.status_code, str(exc.detail))
+            return
+        except DeadlineExceeded as exc:
+            if pending is not None:
+                pending.cancel()
+            admission.record_expired()
+            await close_stream_with_error(websocket, 504, f"ASR {exc}; inference skipped")
+            return
+        except Exception as exc:  # noqa: BLE001
+            if pending is not None:
+                pending.cancel()
+            logger.exception("stream transcription failed")
+            await close_stream_with_error(websocket, 500, f"ASR transcription failed: {exc}")
+            return
+        finally:
+            if stream_decoder is not None:
+                stream_decoder.close()
+
+        confidence = estimate_language_confidence(text)
+        language: Language = config.language if config.language != "auto" else confidence_to_language(confidence)
+        response = AsrResponse(
+            text=text,
+            language=language,
+            languageConfidence=confidence,
+            jaConfidence=confidence["ja"],
+            enConfidence=confidence["en"],
+            clipped=False,
+            audioSeconds=transcriber.audio_seconds,
+        )
+        await websocket.send_json({"type": "final", **response.model_dump()})
+        await websocket.close()
 
     return app
 
 
-def decode_with_single_model(
-    registry: ModelRegistry, audio_base64: str, mime_type: str, model_name: str
-) -> tuple[str, float]:
-    audio, sample_rate = decode_audio_base64(audio_base64, mime_type)
-    transcript = transcribe(registry, model_name=model_name, audio=audio, sample_rate=sample_rate)
-    return transcript, duration_seconds(audio, sample_rate)
+async def close_stream_with_error(websocket: WebSocket, status: int, detail: str) -> None:
+    # 1009: message too big, 1008: policy violation (other client errors), 1011: server failure.
+    code = 1009 if status == 413 else 1008 if 400 <= status < 500 else 1011
+    try:
+        await websocket.send_json({"type": "error", "status": status, "detail": detail})
+        await websocket.close(code=code)
+    except (WebSocketDisconnect, RuntimeError):
+        # The client is already gone; there is nobody left to tell.
+        return
+
+
+async def read_raw_upload(request: Request) -> RawUpload:
+    """Reads a binary audio body (raw or multipart) plus its MIME type and model override."""
+    content_type = request.headers.get("content-type", "")
+    mime_type = request.query_params.get("mimeType") or request.headers.get("x-audio-mime-type")
+    model = request.query_params.get("model") or request.headers.get("x-asr-model")
+
+    if content_type.lower().startswith("multipart/form-data"):
+        form = await request.form()
+        audio = form.get("audio") or form.get("file")
+        if not isinstance(audio, UploadFile):
+            raise HTTPException(status_code=400, detail="Multipart upload needs an 'audio' file field")
+        payload = await audio.read()
+        form_mime_type = form.get("mimeType")
+        form_model = form.get("model")
+        mime_type = mime_type or (form_mime_type if isinstance(form_mime_type, str) else None) or audio.content_type
+        model = model or (form_model if isinstance(form_model, str) else None)
+    else:
+        payload = await request.body()
+        base_type = content_type.split(";", 1)[0].strip().lower()
+        if not mime_type and base_type and base_type != "application/octet-stream":
+            mime_type = content_type
+
+    if len(payload) < 16:
+        raise HTTPException(status_code=400, detail="Audio payload is empty")
+    return RawUpload(payload=payload, mime_type=mime_type or "audio/webm", model=model or None)
 
 
-def decode_audio_base64(audio_base64: str, mime_type: str | None = None) -> tuple[np.ndarray, int]:
+def decode_audio_base64(
+    audio_base64: str, mime_type: str | None, decoder: FfmpegDecoder, metrics: AsrMetrics | None = None
+) -> tuple[np.ndarray, int]:
     try:
-        raw = base64.b64decode(audio_base64, validate=True)
+        with timed_stage(metrics, "base64"):
+            raw = base64.b64decode(audio_base64, validate=True)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=f"Invalid audioBase64: {exc}") from exc
+    return decode_audio_bytes(raw, mime_type, decoder, metrics)
 
+
+def decode_audio_bytes(
+    raw: bytes, mime_type: str | None, decoder: FfmpegDecoder, metrics: AsrMetrics | None = None
+) -> tuple[np.ndarray, int]:
     try:
-        waveform, sample_rate = sf.read(io.BytesIO(raw), dtype="float32", always_2d=False)
+        with timed_stage(metrics, "soundfile"):
+            waveform, sample_rate = sf.read(io.BytesIO(raw), dtype="float32", always_2d=False)
     except Exception as exc:  # noqa: BLE001
         try:
-            waveform, sample_rate = decode_with_ffmpeg(raw, mime_type)
+            with timed_stage(metrics, "ffmpeg"):
+                waveform, sample_rate = decoder.decode(raw, mime_type)
         except HTTPException:
             raise
         except Exception:  # noqa: BLE001
@@ -256,57 +1196,74 @@ def decode_audio_base64(audio_base64: str, mime_type: str | None = None) -> tupl
         waveform = waveform.mean(axis=1)
     if waveform.size == 0:
         raise HTTPException(status_code=400, detail="Audio payload is empty")
-    return waveform.astype("float32"), int(sample_rate)
-
+    # Browser/container rates (44.1/48 kHz) are converted once here instead of inside NeMo.
+    with timed_stage(metrics, "resample"):
+        waveform = resample_audio(waveform, int(sample_rate), DEFAULT_MODEL_SAMPLE_RATE)
+    return waveform, DEFAULT_MODEL_SAMPLE_RATE
 
-def decode_with_ffmpeg(raw: bytes, mime_type: str | None) -> tuple[np.ndarray, int]:
-    ffmpeg = shutil.which("ffmpeg")
-    if not ffmpeg:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported audio payload and ffmpeg is not available for fallback decode",
-        )
 
+def decode_with_ffmpeg(
+    ffmpeg: str, raw: bytes, mime_type: str | None, timeout_seconds: float | None = None
+) -> tuple[np.ndarray, int]:
     input_suffix = suffix_from_mime_type(mime_type)
+    try:
+        return run_ffmpeg_pcm(ffmpeg, "pipe:0", raw, timeout_seconds)
+    except HTTPException:
+        if input_suffix not in SEEKABLE_INPUT_SUFFIXES:
+            raise
+
+    # mp4-family uploads can keep their index after the samples, which a pipe cannot reach.
     with tempfile.NamedTemporaryFile(suffix=input_suffix, delete=False) as src:
         src.write(raw)
         src_path = src.name
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as dst:
-        dst_path = dst.name
-
     try:
-        cmd = [
-            ffmpeg,
-            "-nostdin",
-            "-v",
-            "error",
-            "-y",
-            "-i",
-            src_path,
-            "-ac",
-            "1",
-            "-ar",
-            "16000",
-            "-f",
-            "wav",
-            dst_path,
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        if result.returncode != 0:
-            stderr = (result.stderr or "").strip()
-            detail = stderr[:300] if stderr else f"ffmpeg exited with code {result.returncode}"
-            raise HTTPException(status_code=400, detail=f"Unsupported audio payload: {detail}")
-        waveform, sample_rate = sf.read(dst_path, dtype="float32", always_2d=False)
-        return waveform, int(sample_rate)
+        return run_ffmpeg_pcm(ffmpeg, src_path, None, timeout_seconds)
     finally:
         try:
             os.remove(src_path)
         except OSError:
             pass
-        try:
-            os.remove(dst_path)
-        except OSError:
-            pass
+
+
+def run_ffmpeg_pcm(
+    ffmpeg: str, source: str, stdin_payload: bytes | None, timeout_seconds: float | None
+) -> tuple[np.ndarray, int]:
+    cmd = [
+        ffmpeg,
+        "-nostdin",
+        "-v",
+        "error",
+        "-i",
+        source,
+        "-ac",
+        "1",
+        "-ar",
+        str(DEFAULT_MODEL_SAMPLE_RATE),
+        "-f",
+        "f32le",
+        "pipe:1",
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            input=stdin_payload,
+            stdin=subprocess.DEVNULL if stdin_payload is None else None,
+            capture_output=True,
+            timeout=timeout_seconds,
+            check=False,
+        )
+    except subprocess.TimeoutExpired as exc:
+        detail = f"Unsupported audio payload: ffmpeg timed out after {exc.timeout}s"
+        raise HTTPException(status_code=400, detail=detail) from exc
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        detail = stderr[:300] if stderr else f"ffmpeg exited with code {result.returncode}"
+        raise HTTPException(status_code=400, detail=f"Unsupported audio payload: {detail}")
+
+    usable = len(result.stdout) - len(result.stdout) % 4
+    waveform = np.frombuffer(result.stdout, dtype="<f4", count=usable // 4)
+    return waveform, DEFAULT_MODEL_SAMPLE_RATE
 
 
 def suffix_from_mime_type(mime_type: str | None) -> str:
@@ -326,6 +1283,19 @@ def suffix_from_mime_type(mime_type: str | None) -> str:
     return ".bin"
 
 
+def silent_response(audio_seconds: float) -> AsrResponse:
+    return AsrResponse(
+        text="",
+        language="unknown",
+        languageConfidence={"ja": 0.5, "en": 0.5},
+        jaConfidence=0.5,
+        enConfidence=0.5,
+        clipped=False,
+        audioSeconds=audio_seconds,
+        speechSeconds=0.0,
+    )
+
+
 def clip_audio(audio: np.ndarray, sample_rate: int, seconds: float) -> tuple[np.ndarray, bool, float]:
     audio_seconds = duration_seconds(audio, sample_rate)
     if seconds <= 0:
@@ -342,31 +1312,83 @@ def duration_seconds(audio: np.ndarray, sample_rate: int) -> float:
     return round(float(audio.shape[0] / sample_rate), 3)
 
 
-def transcribe(registry: ModelRegistry, model_name: str, audio: np.ndarray, sample_rate: int) -> str:
-    model = registry.get(model_name)
-
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp_path = tmp.name
+def transcribe_batch(
+    registry: ModelRegistry,
+    model_name: str,
+    audios: list[np.ndarray],
+    sample_rate: int,
+    replica: int = 0,
+    metrics: AsrMetrics | None = None,
+) -> list[str]:
+    torch_backend = registry.settings.backend == "nemo"
+    inference = inference_context() if registry.settings.inference_mode and torch_backend else nullcontext()
+    with registry.acquire(model_name, replica) as model, inference:
+        if registry.supports_array_input(model_name, model) and sample_rate == model_sample_rate(model):
+            try:
+                output = call_model_transcribe_arrays(model, audios)
+                return normalize_transcriptions(output, len(audios))
+            except TypeError as exc:
+                if not is_array_input_rejection(exc):
+                    raise HTTPException(status_code=500, detail=f"ASR transcription failed: {exc}") from exc
+                # The model takes ``audio`` but only as paths; remember that and fall back for good.
+                registry.mark_array_input_unsupported(model_name)
+                logger.warning("in-memory transcribe unavailable for %s: %s", model_name, exc)
+            except HTTPException:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                raise HTTPException(status_code=500, detail=f"ASR transcription failed: {exc}") from exc
+
+        return transcribe_via_files(model, audios, sample_rate, metrics)
+
+
+def transcribe_via_files(
+    model: ASRModel, audios: list[np.ndarray], sample_rate: int, metrics: AsrMetrics | None = None
+) -> list[str]:
+    tmp_paths: list[str] = []
     try:
-        sf.write(tmp_path, audio, sample_rate, format="WAV")
-        output = call_model_transcribe(model, tmp_path)
-        return normalize_transcription(output)
+        with timed_stage(metrics, "tempfile_io"):
+            for audio in audios:
+                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+                    tmp_paths.append(tmp.name)
+                sf.write(tmp_paths[-1], audio, sample_rate, format="WAV")
+        output = call_model_transcribe(model, tmp_paths)
+        return normalize_transcriptions(output, len(audios))
     except HTTPException:
         raise
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=f"ASR transcription failed: {exc}") from exc
     finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
+        for tmp_path in tmp_paths:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def transcribe_accepts_arrays(model: ASRModel) -> bool:
+    # NeMo 1.x names the first argument paths2audio_files and only reads files from it.
+    try:
+        parameters = inspect.signature(model.transcribe).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return "paths2audio_files" not in parameters
+
 
+def is_array_input_rejection(exc: TypeError) -> bool:
+    # e.g. "expected str, bytes or os.PathLike object, not ndarray" from a release that treats audio as paths.
+    return "ndarray" in str(exc)
 
-def call_model_transcribe(model: ASRModel, audio_path: str) -> Any:
+
+def call_model_transcribe_arrays(model: ASRModel, audio: list[np.ndarray]) -> Any:
+    batch = [np.ascontiguousarray(item, dtype=np.float32) for item in audio]
+    return model.transcribe(batch, batch_size=len(batch))
+
+
+def call_model_transcribe(model: ASRModel, audio_paths: list[str]) -> Any:
     attempts = (
-        lambda: model.transcribe(paths2audio_files=[audio_path], batch_size=1),
-        lambda: model.transcribe(audio=[audio_path], batch_size=1),
-        lambda: model.transcribe([audio_path], batch_size=1),
+        lambda: model.transcribe(paths2audio_files=audio_paths, batch_size=len(audio_paths)),
+        lambda: model.transcribe(audio=audio_paths, batch_size=len(audio_paths)),
+        lambda: model.transcribe(audio_paths, batch_size=len(audio_paths)),
     )
 
     errors: list[str] = []
@@ -381,22 +1403,26 @@ def call_model_transcribe(model: ASRModel, audio_path: str) -> Any:
     raise TypeError(f"ASR transcribe signature mismatch: {joined}")
 
 
-def normalize_transcription(output: Any) -> str:
-    if isinstance(output, list) and output:
-        first = output[0]
-        if isinstance(first, str):
-            return first.strip()
-        if isinstance(first, dict):
-            if isinstance(first.get("text"), str):
-                return first["text"].strip()
-        if hasattr(first, "text") and isinstance(first.text, str):
-            return first.text.strip()
-        return str(first).strip()
+def normalize_transcriptions(output: Any, expected: int) -> list[str]:
+    if isinstance(output, tuple) and output and isinstance(output[0], list):
+        # RNNT models on some NeMo releases return (best_hypotheses, all_hypotheses).
+        output = output[0]
+    if not isinstance(output, list):
+        output = [output]
+    if len(output) != expected:
+        raise RuntimeError(f"ASR returned {len(output)} transcripts for {expected} inputs")
+    return [normalize_hypothesis(item) for item in output]
 
-    if isinstance(output, str):
-        return output.strip()
 
-    return str(output).strip()
+def normalize_hypothesis(item: Any) -> str:
+    if isinstance(item, str):
+        return item.strip()
+    if isinstance(item, dict):
+        if isinstance(item.get("text"), str):
+            return item["text"].strip()
+    if hasattr(item, "text") and isinstance(item.text, str):
+        return item.text.strip()
+    return str(item).strip()
 
 
 def merge_mixed_transcripts(ja_text: str, en_text: str) -> str:
@@ -439,10 +1465,10 @@ def estimate_language_confidence(text: str) -> dict[Literal["ja", "en"], float]:
     return {"ja": 0.5, "en": 0.5}
 
 
-def confidence_to_language(confidence: dict[Literal["ja", "en"], float]) -> Language:
-    if confidence["ja"] >= 0.75 and confidence["ja"] > confidence["en"]:
+def confidence_to_language(confidence: dict[Literal["ja", "en"], float], threshold: float = 0.75) -> Language:
+    if confidence["ja"] >= threshold and confidence["ja"] > confidence["en"]:
         return "ja"
-    if confidence["en"] >= 0.75 and confidence["en"] > confidence["ja"]:
+    if confidence["en"] >= threshold and confidence["en"] > confidence["ja"]:
         return "en"
     return "mixed"
 
@@ -456,6 +1482,12 @@ def is_japanese_char(char: str) -> bool:
     )
 
 
+def replica_cache_key(model_name: str, replica: int) -> str:
+    if replica <= 0:
+        return model_name
+    return f"{model_name}#{replica}"
+
+
 def resolve_map_location(device: str) -> str:
     normalized = device.strip().lower()
     if normalized in {"cpu", "cuda"}:
@@ -480,6 +1512,35 @@ def maybe_empty_cuda_cache() -> None:
         return
 
 
+def import_asr_model_class() -> type[ASRModel]:
+    from nemo.collections.asr.models import ASRModel
+
+    return ASRModel
+
+
+def model_sample_rate(model: ASRModel) -> int:
+    try:
+        return int(model.cfg.sample_rate)
+    except Exception:  # noqa: BLE001
+        pass
+    try:
+        return int(model.preprocessor._sample_rate)
+    except Exception:  # noqa: BLE001
+        return DEFAULT_MODEL_SAMPLE_RATE
+
+
+def model_footprint_bytes(model: ASRModel) -> int:
+    if hasattr(model, "footprint_bytes"):
+        return int(model.footprint_bytes())
+    total = 0
+    try:
+        for tensor in (*model.parameters(), *model.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    except Exception:  # noqa: BLE001
+        return 0
+    return total
+
+
 def model_device_name(model: ASRModel) -> str:
     try:
         first_parameter = next(model.parameters())
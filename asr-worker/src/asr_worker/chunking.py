@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+
+import numpy as np
+
+from .textjoin import join_transcripts
+from .vad import FRAME_SECONDS, VadConfig, find_quiet_cut, speech_frame_mask
+
+# How far before the nominal window end a pause may be used as the cut.
+PAUSE_SEARCH_SECONDS = 3.0
+# Speaking rate ceiling used to bound how many tokens an overlap can repeat.
+MAX_TOKENS_PER_SECOND = {"word": 5, "char": 12}
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    sample_rate: int,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    vad_config: VadConfig | None = None,
+) -> list[tuple[int, int]]:
+    """Splits audio into overlapping (start, end) windows of at most chunk_seconds, cut at pauses."""
+    total = audio.shape[0]
+    window = int(chunk_seconds * sample_rate)
+    overlap = min(int(overlap_seconds * sample_rate), window // 2)
+    if window <= 0 or total <= window + overlap:
+        return [(0, total)]
+
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    speech = speech_frame_mask(audio, sample_rate, vad_config or VadConfig())
+    chunks: list[tuple[int, int]] = []
+    start = 0
+    while start < total:
+        nominal_end = start + window
+        if nominal_end >= total:
+            chunks.append((start, total))
+            break
+        end = pause_cut(speech, frame, start + overlap + frame, nominal_end, sample_rate)
+        if end is None:
+            end = find_quiet_cut(audio, nominal_end, sample_rate)
+        end = min(max(end, start + overlap + frame), nominal_end)
+        chunks.append((start, end))
+        start = end - overlap
+    return chunks
+
+
+def pause_cut(speech: np.ndarray, frame: int, earliest: int, nominal_end: int, sample_rate: int) -> int | None:
+    """Middle of the longest non-speech run between ``earliest`` and ``nominal_end``."""
+    first = max(earliest, nominal_end - int(PAUSE_SEARCH_SECONDS * sample_rate)) // frame
+    last = min(nominal_end // frame, speech.shape[0])
+    if last - first < 2:
+        return None
+    silent = ~speech[first:last]
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size == 0:
+        return None
+    longest = int(np.argmax(ends - starts))
+    middle = (starts[longest] + ends[longest]) // 2
+    return (first + int(middle)) * frame + frame // 2
+
+
+def stitch_transcripts(texts: list[str], overlap_seconds: float) -> str:
+    """Joins window transcripts, dropping the words each window repeats from the previous one."""
+    merged: list[str] = []
+    for text in texts:
+        text = text.strip()
+        if not text:
+            continue
+        if merged:
+            text = drop_repeated_prefix(merged[-1], text, overlap_seconds)
+        if text:
+            merged.append(text)
+    return join_transcripts(merged)
+
+
+def drop_repeated_prefix(previous: str, current: str, overlap_seconds: float) -> str:
+    unit = "word" if " " in current.strip() or " " in previous.strip() else "char"
+    previous_tokens = tokenize(previous, unit)
+    current_tokens = tokenize(current, unit)
+    limit = min(
+        len(previous_tokens),
+        len(current_tokens),
+        max(1, int(round(overlap_seconds * MAX_TOKENS_PER_SECOND[unit]))) + 1,
+    )
+
+    # Longest suffix of the previous window that reappears at the start of this one.
+    # A single short word is too weak a signal to drop (e.g. "the", "a").
+    for size in range(limit, 0, -1):
+        tail = [token for token, _ in previous_tokens[-size:]]
+        head = [token for token, _ in current_tokens[:size]]
+        if tail != head:
+            continue
+        if size == 1 and len(head[0]) < (4 if unit == "word" else 2):
+            break
+        cut = current_tokens[size - 1][1]
+        return current[cut:].lstrip(" 、。,.!?")
+    return current
+
+
+def tokenize(text: str, unit: str) -> list[tuple[str, int]]:
+    """Normalized tokens with the offset just past each one in ``text``."""
+    if unit == "word":
+        return [(match.group(0).casefold(), match.end()) for match in TOKEN_PATTERN.finditer(text)]
+    return [
+        (unicodedata.normalize("NFKC", char).casefold(), index + 1)
+        for index, char in enumerate(text)
+        if not char.isspace() and unicodedata.category(char)[0] not in {"P", "Z"}
+    ]
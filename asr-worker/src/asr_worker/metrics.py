@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Iterator
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LOAD_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+# Stage durations of the request being served; the HTTP middleware installs a fresh list.
+_request_timings: ContextVar[list[tuple[str, float]] | None] = ContextVar("asr_request_timings", default=None)
+
+LabelValues = tuple[str, ...]
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...], labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            counts, totals = self._series.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            counts[-1] += 1
+            totals[0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), totals[0]) for labels, (counts, totals) in self._series.items())
+        for labels, counts, total in series:
+            for bound, count in zip(self.buckets, counts):
+                bucket_labels = format_labels(self.labelnames, labels, le=format_value(bound))
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            lines.append(f"{self.name}_bucket{format_labels(self.labelnames, labels, le='+Inf')} {counts[-1]}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {counts[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}")
+        return lines
+
+
+class AsrMetrics:
+    """Stage histograms and model counters of one worker, rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.stage_seconds = Histogram(
+            "asr_stage_duration_seconds", "Time spent in each request pipeline stage.", LATENCY_BUCKETS, ("stage",)
+        )
+        self.request_seconds = Histogram(
+            "asr_request_duration_seconds", "End-to-end ASR request latency.", LATENCY_BUCKETS, ("endpoint", "status")
+        )
+        self.queue_wait_seconds = Histogram(
+            "asr_queue_wait_seconds", "Time a job waited for its model lane.", LATENCY_BUCKETS, ("model",)
+        )
+        self.inference_seconds = Histogram(
+            "asr_inference_duration_seconds", "Model time per transcribe batch.", LATENCY_BUCKETS, ("model",)
+        )
+        self.batch_size = Histogram("asr_batch_size", "Requests per transcribe batch.", BATCH_SIZE_BUCKETS, ("model",))
+        self.real_time_factor = Histogram(
+            "asr_real_time_factor", "Batch inference seconds per second of audio.", RTF_BUCKETS, ("model",)
+        )
+        self.model_load_seconds = Histogram(
+            "asr_model_load_duration_seconds",
+            "Model load time by source (pretrained, snapshot, offload, custom).",
+            LOAD_BUCKETS,
+            ("model", "source"),
+        )
+        self.audio_seconds = Counter("asr_audio_seconds_total", "Seconds of audio transcribed.", ("model",))
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stage_seconds.observe(elapsed, name)
+            timings = _request_timings.get()
+            if timings is not None:
+                timings.append((name, elapsed))
+
+    def observe_batch(self, model_name: str, audio_seconds: float, elapsed: float, batch_size: int) -> None:
+        self.inference_seconds.observe(elapsed, model_name)
+        self.batch_size.observe(batch_size, model_name)
+        self.audio_seconds.inc(audio_seconds, model_name)
+        if audio_seconds > 0:
+            self.real_time_factor.observe(elapsed / audio_seconds, model_name)
+
+    def observe_queue_wait(self, model_name: str, waits: list[float]) -> None:
+        for waited in waits:
+            self.queue_wait_seconds.observe(waited, model_name)
+
+    def observe_load(self, model_name: str, source: str, elapsed: float) -> None:
+        self.model_load_seconds.observe(elapsed, model_name, source)
+
+    def render(self, extra_lines: list[str] | None = None) -> str:
+        lines: list[str] = []
+        for metric in (
+            self.request_seconds,
+            self.stage_seconds,
+            self.queue_wait_seconds,
+            self.inference_seconds,
+            self.batch_size,
+            self.real_time_factor,
+            self.audio_seconds,
+            self.model_load_seconds,
+        ):
+            lines.extend(metric.render())
+        lines.extend(extra_lines or [])
+        return "\n".join(lines) + "\n"
+
+
+def timed_stage(metrics: AsrMetrics | None, name: str) -> AbstractContextManager[None]:
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+def begin_request_timing() -> list[tuple[str, float]]:
+    timings: list[tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: list[tuple[str, float]]) -> str:
+    """Sums repeated stages (e.g. the fast and full passes of ``/v1/asr/auto``) into one ``Server-Timing`` entry."""
+    totals: dict[str, float] = {}
+    for name, elapsed in timings:
+        totals[name] = totals.get(name, 0.0) + elapsed
+    return ", ".join(f"{name};dur={elapsed * 1000.0:.1f}" for name, elapsed in totals.items())
+
+
+def gauge_lines(name: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for labels, value in samples:
+        lines.append(f"{name}{format_labels(tuple(labels), tuple(labels.values()))} {format_value(value)}")
+    return lines
+
+
+def process_memory() -> dict[str, int] | None:
+    """RSS, proportional set size and shared bytes of this process (Linux only)."""
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as handle:
+            lines = handle.read().splitlines()[1:]
+    except OSError:
+        return None
+    fields = dict(line.split(":", 1) for line in lines if ":" in line)
+    values: dict[str, int] = {}
+    for key, name in (("Rss", "rssBytes"), ("Pss", "pssBytes"), ("Shared_Clean", "sharedCleanBytes")):
+        if key in fields:
+            values[name] = int(fields[key].split()[0]) * 1024
+    return values or None
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(str(value))}"' for name, value in pairs) + "}"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import numpy as np
+import soundfile as sf
+
+from .snapshot import snapshot_path
+
+ONNX_MANIFEST = "onnx.json"
+FRONTEND_ARRAYS = "preprocessor.npz"
+ENCODER_MODEL = "encoder-model.onnx"
+DECODER_JOINT_MODEL = "decoder_joint-model.onnx"
+# NeMo's default zero guard for log-mel features (2 ** -24).
+LOG_ZERO_GUARD = 5.960464477539063e-08
+NORMALIZE_EPSILON = 1e-5
+MAX_SYMBOLS_PER_STEP = 10
+SENTENCEPIECE_SPACE = "▁"
+
+
+def has_onnx_export(root: Path, model_name: str) -> bool:
+    return (snapshot_path(root, model_name) / ONNX_MANIFEST).is_file()
+
+
+def export_onnx(model: Any, root: Path, model_name: str) -> Path:
+    """Exports a NeMo Parakeet model for :class:`OnnxAsrModel`; replaces an existing export."""
+    root.mkdir(parents=True, exist_ok=True)
+    target = snapshot_path(root, model_name)
+    staging = Path(tempfile.mkdtemp(prefix=f".{target.name}.", dir=root))
+    try:
+        model.eval()
+        manifest: dict[str, Any] = {"model": model_name, "createdAt": int(time.time())}
+        manifest.update(export_frontend(model, staging / FRONTEND_ARRAYS))
+        vocabulary = tokenizer_vocabulary(model)
+        manifest["vocabulary"] = vocabulary
+
+        if hasattr(model, "ctc_decoder"):
+            # Hybrid TDT/CTC models: export the TDT head, which is what NeMo decodes with.
+            model.set_export_config({"decoder_type": "rnnt"})
+        # RNNT-family models write encoder-model.onnx and decoder_joint-model.onnx.
+        model.export(str(staging / "model.onnx"))
+        durations = [int(value) for value in model_tdt_durations(model)]
+        manifest.update(
+            {
+                "decoder": "tdt" if durations else "rnnt",
+                "blank": int(model.decoder.blank_idx),
+                "durations": durations,
+                "predictionLayers": int(model.decoder.pred_rnn_layers),
+                "predictionHidden": int(model.decoder.pred_hidden),
+            }
+        )
+        (staging / ONNX_MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+        if target.exists():
+            shutil.rmtree(target)
+        staging.rename(target)
+        return target
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def export_frontend(model: Any, arrays_path: Path) -> dict[str, Any]:
+    featurizer = model.preprocessor.featurizer
+    window = featurizer.window.detach().cpu().numpy().astype(np.float32)
+    filterbank = featurizer.fb.detach().cpu().numpy().astype(np.float32).reshape(-1, featurizer.n_fft // 2 + 1)
+    np.savez(arrays_path, window=window, filterbank=filterbank)
+    guard = getattr(featurizer, "log_zero_guard_value", LOG_ZERO_GUARD)
+    return {
+        "sampleRate": int(model.cfg.preprocessor.sample_rate),
+        "nFft": int(featurizer.n_fft),
+        "hopLength": int(featurizer.hop_length),
+        "preemphasis": float(featurizer.preemph or 0.0),
+        "magPower": float(featurizer.mag_power),
+        "logZeroGuard": float(guard) if isinstance(guard, (int, float)) else LOG_ZERO_GUARD,
+        "normalize": str(featurizer.normalize or ""),
+    }
+
+
+def tokenizer_vocabulary(model: Any) -> list[str]:
+    tokenizer = model.tokenizer
+    return [str(token) for token in tokenizer.ids_to_tokens(list(range(tokenizer.vocab_size)))]
+
+
+def model_tdt_durations(model: Any) -> list[int]:
+    try:
+        return list(model.cfg.model_defaults.tdt_durations or [])
+    except Exception:  # noqa: BLE001
+        return []
+
+
+class MelFrontend:
+    """NumPy port of NeMo's ``AudioToMelSpectrogramPreprocessor`` at inference time (no dither)."""
+
+    def __init__(self, manifest: dict[str, Any], window: np.ndarray, filterbank: np.ndarray):
+        self.n_fft = int(manifest["nFft"])
+        self.hop_length = int(manifest["hopLength"])
+        self.preemphasis = float(manifest["preemphasis"])
+        self.mag_power = float(manifest["magPower"])
+        self.log_zero_guard = float(manifest["logZeroGuard"])
+        self.normalize = manifest["normalize"]
+        padded = np.zeros(self.n_fft, dtype=np.float32)
+        offset = (self.n_fft - window.shape[0]) // 2
+        padded[offset : offset + window.shape[0]] = window
+        self.window = padded
+        self.filterbank = np.ascontiguousarray(filterbank, dtype=np.float32)
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        """Log-mel features of one clip, ``(n_mels, frames)``."""
+        signal = np.asarray(audio, dtype=np.float32)
+        if self.preemphasis:
+            signal = np.concatenate((signal[:1], signal[1:] - self.preemphasis * signal[:-1]))
+        half = self.n_fft // 2
+        signal = np.pad(signal, (half, half))
+        windows = np.lib.stride_tricks.sliding_window_view(signal, self.n_fft)[:: self.hop_length]
+        spectrum = np.abs(np.fft.rfft(windows * self.window, axis=-1)).astype(np.float32)
+        if self.mag_power != 1.0:
+            spectrum = spectrum**self.mag_power
+        features = np.log(self.filterbank @ spectrum.T + self.log_zero_guard)
+        if self.normalize == "per_feature" and features.shape[1] > 1:
+            mean = features.mean(axis=1, keepdims=True)
+            std = features.std(axis=1, ddof=1, keepdims=True)
+            features = (features - mean) / (std + NORMALIZE_EPSILON)
+        return features.astype(np.float32)
+
+    def batch(self, audios: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        features = [self(audio) for audio in audios]
+        lengths = np.array([item.shape[1] for item in features], dtype=np.int64)
+        batch = np.zeros((len(features), features[0].shape[0], int(lengths.max())), dtype=np.float32)
+        for index, item in enumerate(features):
+            batch[index, :, : item.shape[1]] = item
+        return batch, lengths
+
+
+class OnnxAsrModel:
+    """onnxruntime stand-in for NeMo's ``ASRModel``; only ``transcribe`` (greedy TDT/RNNT) is implemented."""
+
+    def __init__(self, directory: Path, threads: int = 0):
+        import onnxruntime
+
+        self.directory = directory
+        self.manifest = json.loads((directory / ONNX_MANIFEST).read_text(encoding="utf-8"))
+        arrays = np.load(directory / FRONTEND_ARRAYS)
+        self.frontend = MelFrontend(self.manifest, arrays["window"], arrays["filterbank"])
+        self.cfg = SimpleNamespace(sample_rate=int(self.manifest["sampleRate"]))
+        self.vocabulary: list[str] = self.manifest["vocabulary"]
+        self.blank = int(self.manifest["blank"])
+        self.decoder = self.manifest["decoder"]
+        if self.decoder not in ("tdt", "rnnt"):
+            raise ValueError(f"unsupported {self.decoder} export in {directory}; re-run `asr-worker export-onnx`")
+        self.durations: list[int] = self.manifest.get("durations", [])
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+
+        def session(name: str) -> Any:
+            return onnxruntime.InferenceSession(
+                str(directory / name), sess_options=options, providers=["CPUExecutionProvider"]
+            )
+
+        self.encoder = session(ENCODER_MODEL)
+        self.decoder_joint = session(DECODER_JOINT_MODEL)
+
+    def to(self, _device: Any) -> OnnxAsrModel:
+        return self
+
+    def eval(self) -> OnnxAsrModel:
+        return self
+
+    def footprint_bytes(self) -> int:
+        # Large encoders keep their weights in external data files next to the graph.
+        return sum(path.stat().st_size for path in self.directory.iterdir() if path.is_file())
+
+    def transcribe(self, audio: list[Any], batch_size: int = 1, **_: Any) -> list[str]:
+        waveforms = [self._waveform(item) for item in audio]
+        features, lengths = self.frontend.batch(waveforms)
+        encoded, encoded_lengths = self.encoder.run(None, feeds(self.encoder, [features, lengths]))[:2]
+        return [
+            self.detokenize(self._transducer_greedy(encoded[index : index + 1, :, : encoded_lengths[index]]))
+            for index in range(len(waveforms))
+        ]
+
+    def detokenize(self, token_ids: list[int]) -> str:
+        pieces = [self.vocabulary[token] for token in token_ids if 0 <= token < len(self.vocabulary)]
+        text = "".join(piece for piece in pieces if not (piece.startswith("<") and piece.endswith(">")))
+        return text.replace(SENTENCEPIECE_SPACE, " ").strip()
+
+    def _waveform(self, item: Any) -> np.ndarray:
+        if isinstance(item, (str, Path)):
+            waveform, sample_rate = sf.read(item, dtype="float32", always_2d=False)
+            if waveform.ndim == 2:
+                waveform = waveform.mean(axis=1)
+            if sample_rate != self.cfg.sample_rate:
+                from .resample import resample_audio
+
+                waveform = resample_audio(waveform, int(sample_rate), self.cfg.sample_rate)
+            return waveform
+        return np.asarray(item, dtype=np.float32)
+
+    def _transducer_greedy(self, encoded: np.ndarray) -> list[int]:
+        """NeMo's greedy TDT (or plain RNNT) decoding over one utterance ``(1, dim, frames)``."""
+        shape = (int(self.manifest["predictionLayers"]), 1, int(self.manifest["predictionHidden"]))
+        states = [np.zeros(shape, dtype=np.float32), np.zeros(shape, dtype=np.float32)]
+        last_token = self.blank
+        tokens: list[int] = []
+        vocabulary_size = self.blank + 1
+        frame, total, emitted = 0, encoded.shape[2], 0
+        while frame < total:
+            inputs = [encoded[:, :, frame : frame + 1], [[last_token]], [1], *states]
+            logits, _, *next_states = self.decoder_joint.run(None, feeds(self.decoder_joint, inputs))
+            logits = logits.reshape(-1)
+            token = int(np.argmax(logits[:vocabulary_size]))
+            if token != self.blank:
+                tokens.append(token)
+                last_token = token
+                states = next_states
+                emitted += 1
+            if self.durations:
+                skip = self.durations[int(np.argmax(logits[vocabulary_size:]))]
+                if skip == 0 and (token == self.blank or emitted >= MAX_SYMBOLS_PER_STEP):
+                    skip = 1
+            else:
+                skip = 1 if token == self.blank or emitted >= MAX_SYMBOLS_PER_STEP else 0
+            if skip > 0:
+                frame += skip
+                emitted = 0
+        return tokens
+
+
+def feeds(session: Any, values: list[Any]) -> dict[str, np.ndarray]:
+    """Maps positional inputs to the session's input names, casting to the declared dtypes."""
+    dtypes = {"tensor(float)": np.float32, "tensor(int64)": np.int64, "tensor(int32)": np.int32}
+    return {
+        spec.name: np.asarray(value, dtype=dtypes.get(spec.type, np.float32))
+        for spec, value in zip(session.get_inputs(), values)
+    }
+
+
+def onnx_model_loader(root: Path, threads: int = 0) -> Callable[[str, str], OnnxAsrModel]:
+    def load(model_name: str, _map_location: str) -> OnnxAsrModel:
+        if not has_onnx_export(root, model_name):
+            raise FileNotFoundError(
+                f"no ONNX export for {model_name} in {root} (run `asr-worker export-onnx --model {model_name}`)"
+            )
+        return OnnxAsrModel(snapshot_path(root, model_name), threads=threads)
+
+    return load
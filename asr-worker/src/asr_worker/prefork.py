@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any
+
+import uvicorn
+
+from .app import (
+    ModelLoader,
+    ModelRegistry,
+    WorkerSettings,
+    create_app,
+    import_asr_model_class,
+    ordered_unique,
+    resolve_map_location,
+)
+from .torch_tuning import configure_torch_threads
+
+logger = logging.getLogger("asr_worker")
+
+# A worker that exits sooner than this after being forked is not restarted (it would crash-loop).
+MIN_WORKER_UPTIME_SECONDS = 5.0
+
+
+def shared_model_loader(models: dict[str, Any]) -> ModelLoader:
+    """Hands out the models loaded by the parent; anything else is loaded by the worker itself."""
+
+    def load(model_name: str, map_location: str) -> Any:
+        model = models.get(model_name)
+        if model is not None:
+            return model
+        return import_asr_model_class().from_pretrained(model_name=model_name, map_location=map_location)
+
+    return load
+
+
+def check_prefork_settings(settings: WorkerSettings) -> None:
+    if settings.backend == "onnx":
+        # onnxruntime sessions own thread pools that do not survive fork, and sessions created
+        # after it would each hold a private copy of the weights.
+        raise SystemExit("--workers > 1 does not support ASR_BACKEND=onnx; run one worker and set ASR_ONNX_THREADS")
+    if resolve_map_location(settings.device) != "cpu":
+        raise SystemExit("--workers > 1 needs ASR_DEVICE=cpu (CUDA contexts do not survive fork)")
+
+
+def worker_torch_threads(settings: WorkerSettings, workers: int) -> int:
+    if settings.torch_threads > 0:
+        return settings.torch_threads
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def preload_shared_models(settings: WorkerSettings) -> dict[str, Any]:
+    registry = ModelRegistry(settings)
+    models: dict[str, Any] = {}
+    for model_name in ordered_unique([settings.fast_model, settings.en_model, settings.ja_model]):
+        started = time.perf_counter()
+        models[model_name] = registry.get(model_name)
+        elapsed = time.perf_counter() - started
+        logger.info("loaded %s for prefork in %.1fs", model_name, elapsed)
+    return models
+
+
+def serve_prefork(host: str, port: int, workers: int) -> None:
+    """Loads the models once, then forks ``workers`` uvicorn servers that share the weights copy-on-write."""
+    settings = WorkerSettings()
+    check_prefork_settings(settings)
+    # OpenMP/MKL pools started before fork() are unusable in the children (libgomp can hang), so the
+    # parent loads on a single thread and each worker sizes its own pool in warmup after the fork.
+    configure_torch_threads(1, 0)
+    loader = shared_model_loader(preload_shared_models(settings))
+    settings.torch_threads = worker_torch_threads(settings, workers)
+    # Already quantized in the parent; quantizing again would copy the encoder per worker.
+    settings.cpu_int8 = False
+    if settings.model_replicas > 1:
+        logger.warning("ASR_MODEL_REPLICAS is ignored with --workers; each worker runs one lane")
+        settings.model_replicas = 1
+
+    # A shared accept queue favours whichever worker woke last, so one worker takes most requests.
+    reuse_port = sys.platform.startswith("linux") and hasattr(socket, "SO_REUSEPORT")
+    shared_listener = None if reuse_port else listen_socket(host, port, reuse_port=False)
+
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, tuple[int, float]] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                listener = shared_listener or listen_socket(host, port, reuse_port=True)
+                run_worker(listener, settings, loader)
+                status = 0
+            except BaseException:  # noqa: BLE001
+                logger.exception("worker %d failed", index)
+            finally:
+                os._exit(status)
+        children[pid] = (index, time.monotonic())
+
+    def stop(signum: int, _frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for index in range(workers):
+        spawn(index)
+    logger.info("serving on http://%s:%d with %d workers", host, port, workers)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index, started_at = children.pop(pid, (-1, 0.0))
+        if stopping or index < 0:
+            continue
+        uptime = time.monotonic() - started_at
+        logger.warning("worker %d (pid %d) exited (%d) after %.0fs", index, pid, status, uptime)
+        if uptime < MIN_WORKER_UPTIME_SECONDS:
+            stop(signal.SIGTERM, None)
+            raise SystemExit(f"worker {index} exited during startup; stopping")
+        spawn(index)
+    if shared_listener is not None:
+        shared_listener.close()
+
+
+def listen_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    listener = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    listener.bind((host, port))
+    listener.listen(2048)
+    return listener
+
+
+def run_worker(listener: socket.socket, settings: WorkerSettings, loader: ModelLoader) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    app = create_app(settings, model_loader=loader)
+    server = uvicorn.Server(uvicorn.Config(app, log_level="info"))
+    server.run(sockets=[listener])
+
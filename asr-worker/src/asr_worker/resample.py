@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from math import ceil, gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Zero crossings of the windowed sinc on each side, counted at the lower of the two rates.
+HALF_ZERO_CROSSINGS = 16
+KAISER_BETA = 8.6
+# Cutoff as a fraction of the lower Nyquist frequency; leaves room for the transition band.
+ROLLOFF = 0.945
+
+
+def resample_audio(audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Polyphase band-limited resampling of mono float32 audio, one strided product per phase."""
+    audio = np.asarray(audio, dtype=np.float32)
+    if source_rate == target_rate or audio.size == 0:
+        return audio
+
+    divisor = gcd(int(source_rate), int(target_rate))
+    up, down = int(target_rate) // divisor, int(source_rate) // divisor
+    kernels, center = polyphase_kernels(up, down)
+    taps = kernels.shape[1]
+
+    output_length = ceil(audio.shape[0] * up / down)
+    right_pad = ceil(center / up) + 1
+    padded = np.concatenate(
+        [np.zeros(taps - 1, dtype=np.float32), audio, np.zeros(right_pad, dtype=np.float32)]
+    )
+    windows = sliding_window_view(padded, taps)
+
+    output = np.empty(output_length, dtype=np.float32)
+    for first in range(min(up, output_length)):
+        offset = first * down + center
+        count = len(range(first, output_length, up))
+        rows = windows[offset // up :: down][:count]
+        output[first::up] = rows @ kernels[offset % up]
+    return output
+
+
+@lru_cache(maxsize=16)
+def polyphase_kernels(up: int, down: int) -> tuple[np.ndarray, int]:
+    """Returns the ``(up, taps)`` phase kernels (reversed for window dot products) and the delay."""
+    ratio = max(up, down)
+    center = HALF_ZERO_CROSSINGS * ratio
+    cutoff = ROLLOFF / (2.0 * ratio)
+    index = np.arange(2 * center + 1, dtype=np.float64) - center
+    prototype = 2.0 * cutoff * np.sinc(2.0 * cutoff * index) * np.kaiser(index.size, KAISER_BETA) * up
+
+    taps = ceil(prototype.size / up)
+    padded = np.zeros(taps * up, dtype=np.float64)
+    padded[: prototype.size] = prototype
+    # kernels[phase, k] weights x[q0 - k]; windows run oldest-first, hence the reversal.
+    kernels = padded.reshape(taps, up).T[:, ::-1]
+    kernels = np.ascontiguousarray(kernels, dtype=np.float32)
+    kernels.setflags(write=False)
+    return kernels, center
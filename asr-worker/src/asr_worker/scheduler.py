@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import numpy as np
+
+from .admission import DEFAULT_PRIORITY, AdmissionTicket, DeadlineExceeded, current_ticket
+
+BatchRunner = Callable[[str, int, list[np.ndarray], int], list[str]]
+QueueWaitObserver = Callable[[str, list[float]], None]
+
+
+@dataclass
+class _Job:
+    audio: np.ndarray
+    sample_rate: int
+    future: Future[str]
+    priority: int = DEFAULT_PRIORITY
+    deadline: float | None = None
+    sequence: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: float = 0.0
+
+
+@dataclass
+class _Queue:
+    jobs: deque[_Job] = field(default_factory=deque)
+    lanes: list[threading.Thread | None] = field(default_factory=list)
+    busy_lanes: int = 0
+
+
+class BatchScheduler:
+    """Per-model execution lanes that run concurrent requests as one transcribe batch, in priority order."""
+
+    def __init__(
+        self,
+        run_batch: BatchRunner,
+        *,
+        max_batch_size: int,
+        max_wait_seconds: float,
+        replicas: int = 1,
+        shared_lock: AbstractContextManager[Any] | None = None,
+        observe_queue_wait: QueueWaitObserver | None = None,
+    ):
+        self._run_batch = run_batch
+        self._observe_queue_wait = observe_queue_wait
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self.replicas = max(1, replicas)
+        self._shared_lock: AbstractContextManager[Any] = shared_lock if shared_lock is not None else nullcontext()
+        self.serialized = shared_lock is not None
+        self._cond = threading.Condition()
+        self._queues: dict[str, _Queue] = {}
+        self._sequence = 0
+        self._expired = 0
+        self._batches = 0
+        self._batched_requests = 0
+        self._last_batch_size = 0
+        self._largest_batch_size = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seen_seconds = 0.0
+
+    def submit(self, model_name: str, audio: np.ndarray, sample_rate: int) -> Future[str]:
+        return self._enqueue(model_name, audio, sample_rate, current_ticket())
+
+    def submit_windows(
+        self, model_name: str, audios: list[np.ndarray], sample_rate: int, max_outstanding: int
+    ) -> list[Future[str]]:
+        """Queues ``audios`` in order, keeping at most ``max_outstanding`` of them queued or running."""
+        ticket = current_ticket()
+        results: list[Future[str]] = [Future() for _ in audios]
+        lock = threading.Lock()
+        next_index = 0
+
+        def submit_next() -> None:
+            nonlocal next_index
+            with lock:
+                if next_index >= len(audios):
+                    return
+                index = next_index
+                next_index += 1
+            future = self._enqueue(model_name, audios[index], sample_rate, ticket)
+            future.add_done_callback(lambda done: finish(index, done))
+
+        def finish(index: int, done: Future[str]) -> None:
+            nonlocal next_index
+            error = done.exception()
+            if error is None:
+                results[index].set_result(done.result())
+                submit_next()
+                return
+            results[index].set_exception(error)
+            # The request fails as a whole, so the windows not yet queued are never run.
+            with lock:
+                skipped = range(next_index, len(audios))
+                next_index = len(audios)
+            for later in skipped:
+                results[later].set_exception(error)
+
+        for _ in range(min(max(1, max_outstanding), len(audios))):
+            submit_next()
+        return results
+
+    def _enqueue(
+        self, model_name: str, audio: np.ndarray, sample_rate: int, ticket: AdmissionTicket | None
+    ) -> Future[str]:
+        job = _Job(audio=audio, sample_rate=int(sample_rate), future=Future())
+        if ticket is not None:
+            job.priority = ticket.priority
+            job.deadline = ticket.deadline
+        with self._cond:
+            self._sequence += 1
+            job.sequence = self._sequence
+            queue = self._queues.get(model_name)
+            if queue is None:
+                queue = _Queue(lanes=[None] * self.replicas)
+                self._queues[model_name] = queue
+            queue.jobs.append(job)
+            self._ensure_lanes_locked(model_name, queue)
+            self._cond.notify_all()
+        return job.future
+
+    def transcribe(self, model_name: str, audio: np.ndarray, sample_rate: int) -> str:
+        return self.submit(model_name, audio, sample_rate).result()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            depth_by_model = {name: len(queue.jobs) for name, queue in self._queues.items()}
+            busy_by_model = {name: queue.busy_lanes for name, queue in self._queues.items()}
+            batches = self._batches
+            return {
+                "maxBatchSize": self.max_batch_size,
+                "maxWaitMs": round(self.max_wait_seconds * 1000.0, 3),
+                "replicasPerModel": self.replicas,
+                "serialized": self.serialized,
+                "queueDepth": sum(depth_by_model.values()),
+                "queueDepthByModel": depth_by_model,
+                "busyLanesByModel": busy_by_model,
+                "expired": self._expired,
+                "batches": batches,
+                "requests": self._batched_requests,
+                "avgBatchSize": round(self._batched_requests / batches, 3) if batches else 0.0,
+                "lastBatchSize": self._last_batch_size,
+                "largestBatchSize": self._largest_batch_size,
+                "avgQueueWaitMs": (
+                    round(self._total_wait_seconds * 1000.0 / self._batched_requests, 3)
+                    if self._batched_requests
+                    else 0.0
+                ),
+                "maxQueueWaitMs": round(self._max_wait_seen_seconds * 1000.0, 3),
+            }
+
+    def _ensure_lanes_locked(self, model_name: str, queue: _Queue) -> None:
+        for replica, lane in enumerate(queue.lanes):
+            if lane is not None and lane.is_alive():
+                continue
+            lane = threading.Thread(
+                target=self._lane_loop,
+                args=(model_name, replica),
+                name=f"asr-lane-{model_name}#{replica}",
+                daemon=True,
+            )
+            queue.lanes[replica] = lane
+            lane.start()
+
+    def _lane_loop(self, model_name: str, replica: int) -> None:
+        while True:
+            batch = self._next_batch(model_name)
+            self._run(model_name, replica, batch)
+
+    def _next_batch(self, model_name: str) -> list[_Job]:
+        with self._cond:
+            queue = self._queues[model_name]
+            while not queue.jobs:
+                self._cond.wait()
+
+            deadline = queue.jobs[0].enqueued_at + self.max_wait_seconds
+            while len(queue.jobs) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not queue.jobs:
+                    break
+                self._cond.wait(timeout=remaining)
+            self._drop_expired_locked(queue)
+            if not queue.jobs:
+                # Another lane of the same model took the jobs while this one waited.
+                return []
+
+            # Highest priority first, then arrival order. A batch must share one sample rate;
+            # other jobs stay queued in arrival order.
+            ordered = sorted(queue.jobs, key=lambda job: (job.priority, job.sequence))
+            sample_rate = ordered[0].sample_rate
+            batch: list[_Job] = []
+            for job in ordered:
+                if len(batch) >= self.max_batch_size:
+                    break
+                if job.sample_rate == sample_rate:
+                    batch.append(job)
+            taken = {id(job) for job in batch}
+            queue.jobs = deque(job for job in queue.jobs if id(job) not in taken)
+            batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+
+            started = time.monotonic()
+            for job in batch:
+                job.started_at = started
+                waited = started - job.enqueued_at
+                self._total_wait_seconds += waited
+                self._max_wait_seen_seconds = max(self._max_wait_seen_seconds, waited)
+            if batch:
+                queue.busy_lanes += 1
+                self._batches += 1
+                self._batched_requests += len(batch)
+                self._last_batch_size = len(batch)
+                self._largest_batch_size = max(self._largest_batch_size, len(batch))
+            return batch
+
+    def _drop_expired_locked(self, queue: _Queue) -> None:
+        now = time.monotonic()
+        live: deque[_Job] = deque()
+        for job in queue.jobs:
+            if job.deadline is not None and job.deadline <= now:
+                if job.future.set_running_or_notify_cancel():
+                    job.future.set_exception(DeadlineExceeded("request deadline passed while queued"))
+                self._expired += 1
+                continue
+            live.append(job)
+        queue.jobs = live
+
+    def _run(self, model_name: str, replica: int, batch: list[_Job]) -> None:
+        if not batch:
+            return
+        if self._observe_queue_wait is not None:
+            self._observe_queue_wait(model_name, [job.started_at - job.enqueued_at for job in batch])
+        try:
+            with self._shared_lock:
+                texts = self._run_batch(model_name, replica, [job.audio for job in batch], batch[0].sample_rate)
+            if len(texts) != len(batch):
+                raise RuntimeError(f"ASR returned {len(texts)} transcripts for {len(batch)} inputs")
+        except BaseException as exc:  # noqa: BLE001
+            for job in batch:
+                job.future.set_exception(exc)
+            return
+        finally:
+            with self._cond:
+                self._queues[model_name].busy_lanes -= 1
+
+        for job, text in zip(batch, texts):
+            job.future.set_result(text)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+SNAPSHOT_MARKER = "snapshot.json"
+
+
+def snapshot_path(root: Path, model_name: str) -> Path:
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "__", model_name.strip())
+    return root / safe_name
+
+
+def has_snapshot(root: Path, model_name: str) -> bool:
+    return (snapshot_path(root, model_name) / SNAPSHOT_MARKER).is_file()
+
+
+def restore_snapshot(root: Path, model_name: str, map_location: str) -> Any:
+    """Restores a model from an already extracted ``.nemo`` directory, skipping tar extraction."""
+    from nemo.collections.asr.models import ASRModel
+
+    directory = snapshot_path(root, model_name)
+    if not (directory / SNAPSHOT_MARKER).is_file():
+        raise FileNotFoundError(f"no snapshot for {model_name} in {root}")
+
+    connector = mmap_save_restore_connector()
+    # Written against nemo-toolkit 2.3 (the pyproject floor): SaveRestoreConnector uses
+    # model_extracted_dir as-is when it is set; don't rely on restore_from setting it for directories.
+    connector.model_extracted_dir = str(directory)
+    return ASRModel.restore_from(
+        restore_path=str(directory),
+        map_location=map_location,
+        save_restore_connector=connector,
+    )
+
+
+def build_snapshot(model: Any, root: Path, model_name: str) -> Path:
+    """Writes ``model`` as an extracted archive under ``root``; replaces an existing snapshot."""
+    root.mkdir(parents=True, exist_ok=True)
+    target = snapshot_path(root, model_name)
+    staging = Path(tempfile.mkdtemp(prefix=f".{target.name}.", dir=root))
+    try:
+        archive = staging / "model.nemo"
+        model.save_to(str(archive))
+        extracted = staging / "extracted"
+        with tarfile.open(archive, "r:*") as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(extracted, filter="data")
+            else:
+                tar.extractall(extracted)  # noqa: S202 - archive was written by save_to above
+        (extracted / SNAPSHOT_MARKER).write_text(
+            json.dumps({"model": model_name, "createdAt": int(time.time())}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+        if target.exists():
+            shutil.rmtree(target)
+        extracted.rename(target)
+        return target
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def mmap_save_restore_connector() -> Any:
+    import torch
+    from nemo.core.connectors.save_restore_connector import SaveRestoreConnector
+
+    class MmapSaveRestoreConnector(SaveRestoreConnector):
+        @staticmethod
+        def _load_state_dict_from_disk(model_weights: str, map_location: Any = None) -> Any:
+            try:
+                return torch.load(model_weights, map_location="cpu", mmap=True, weights_only=True)
+            except Exception:  # noqa: BLE001
+                return torch.load(model_weights, map_location=map_location)
+
+    return MmapSaveRestoreConnector()
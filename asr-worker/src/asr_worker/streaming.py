@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Literal
+
+import numpy as np
+
+from .textjoin import join_transcripts
+from .vad import find_quiet_cut
+
+StreamEncoding = Literal["pcm_s16le", "pcm_f32le", "opus"]
+StreamLanguage = Literal["en", "ja", "auto"]
+STREAM_ENCODINGS: tuple[StreamEncoding, ...] = ("pcm_s16le", "pcm_f32le", "opus")
+STREAM_LANGUAGES: tuple[StreamLanguage, ...] = ("en", "ja", "auto")
+
+
+@dataclass(frozen=True)
+class StreamConfig:
+    language: StreamLanguage
+    encoding: StreamEncoding
+    sample_rate: int
+    mime_type: str
+    model: str | None = None
+
+
+def parse_stream_config(params: dict[str, str]) -> StreamConfig:
+    language = (params.get("language") or "auto").strip().lower()
+    if language not in STREAM_LANGUAGES:
+        raise ValueError(f"language must be one of {', '.join(STREAM_LANGUAGES)}")
+
+    encoding = (params.get("encoding") or "pcm_s16le").strip().lower()
+    if encoding not in STREAM_ENCODINGS:
+        raise ValueError(f"encoding must be one of {', '.join(STREAM_ENCODINGS)}")
+
+    try:
+        sample_rate = int(params.get("sampleRate") or "16000")
+    except ValueError as exc:
+        raise ValueError("sampleRate must be an integer") from exc
+    if sample_rate <= 0:
+        raise ValueError("sampleRate must be positive")
+
+    return StreamConfig(
+        language=language,  # type: ignore[arg-type]
+        encoding=encoding,  # type: ignore[arg-type]
+        sample_rate=sample_rate,
+        mime_type=(params.get("mimeType") or "audio/webm").strip(),
+        model=(params.get("model") or "").strip() or None,
+    )
+
+
+class PcmFrameReader:
+    """Turns raw PCM frames into float32 samples, carrying partial samples across frames."""
+
+    def __init__(self, encoding: Literal["pcm_s16le", "pcm_f32le"]):
+        self.encoding = encoding
+        self._sample_width = 2 if encoding == "pcm_s16le" else 4
+        self._pending = b""
+
+    def read(self, frame: bytes) -> np.ndarray:
+        data = self._pending + frame if self._pending else frame
+        usable = len(data) - len(data) % self._sample_width
+        self._pending = data[usable:]
+        if usable == 0:
+            return np.zeros(0, dtype=np.float32)
+        if self.encoding == "pcm_s16le":
+            samples = np.frombuffer(data, dtype="<i2", count=usable // 2)
+            return samples.astype(np.float32) / 32768.0
+        return np.frombuffer(data, dtype="<f4", count=usable // 4).astype(np.float32)
+
+
+class StreamingTranscriber:
+    """Incremental transcription of a growing utterance; audio older than one window is committed once."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int,
+        window_seconds: float,
+        partial_interval_seconds: float,
+        max_seconds: float,
+        transcribe: Callable[[np.ndarray, int], Awaitable[str]],
+    ):
+        self.sample_rate = sample_rate
+        self.window_seconds = max(1.0, window_seconds)
+        self.partial_interval_seconds = max(0.1, partial_interval_seconds)
+        self.max_seconds = max_seconds
+        self._transcribe = transcribe
+        self._buffer = np.zeros(max(1, sample_rate), dtype=np.float32)
+        self._length = 0
+        self._committed_samples = 0
+        self._committed_texts: list[str] = []
+        self._last_partial_samples = 0
+
+    @property
+    def audio_seconds(self) -> float:
+        if self.sample_rate <= 0:
+            return 0.0
+        return round(self._length / self.sample_rate, 3)
+
+    def audio(self) -> np.ndarray:
+        return self._buffer[: self._length]
+
+    def append(self, samples: np.ndarray) -> None:
+        if samples.size == 0:
+            return
+        self._ensure_capacity(samples.size)
+        self._buffer[self._length : self._length + samples.size] = samples
+        self._length += samples.size
+
+    def over_limit(self) -> bool:
+        return self.max_seconds > 0 and self._length > self.max_seconds * self.sample_rate
+
+    def partial_due(self) -> bool:
+        interval = int(self.partial_interval_seconds * self.sample_rate)
+        return self._length - self._last_partial_samples >= interval
+
+    async def partial(self) -> str:
+        self._last_partial_samples = self._length
+        await self._commit_full_windows()
+        tail = await self._transcribe_tail()
+        return join_transcripts([*self._committed_texts, tail])
+
+    async def final(self) -> str:
+        await self._commit_full_windows()
+        tail = await self._transcribe_tail()
+        return join_transcripts([*self._committed_texts, tail])
+
+    async def _commit_full_windows(self) -> None:
+        window = int(self.window_seconds * self.sample_rate)
+        # Keep at least one window of tail so the final pass still has context.
+        while self._length - self._committed_samples >= 2 * window:
+            start = self._committed_samples
+            end = find_quiet_cut(self._buffer, start + window, self.sample_rate)
+            text = await self._transcribe(self._buffer[start:end].copy(), self.sample_rate)
+            self._committed_texts.append(text)
+            self._committed_samples = end
+
+    async def _transcribe_tail(self) -> str:
+        if self._length <= self._committed_samples:
+            return ""
+        tail = self._buffer[self._committed_samples : self._length].copy()
+        return await self._transcribe(tail, self.sample_rate)
+
+    def _ensure_capacity(self, extra: int) -> None:
+        needed = self._length + extra
+        if needed <= self._buffer.size:
+            return
+        grown = np.zeros(max(needed, self._buffer.size * 2), dtype=np.float32)
+        grown[: self._length] = self._buffer[: self._length]
+        self._buffer = grown
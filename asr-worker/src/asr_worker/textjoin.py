@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+
+def join_transcripts(texts: list[str]) -> str:
+    """Joins transcript pieces in order, skipping empty ones."""
+    parts = [text.strip() for text in texts if text and text.strip()]
+    if not parts:
+        return ""
+    joined = parts[0]
+    for part in parts[1:]:
+        # Japanese transcripts carry no spaces between words; only join Latin text with one.
+        if joined[-1].isascii() and part[0].isascii():
+            joined = f"{joined} {part}"
+        else:
+            joined = f"{joined}{part}"
+    return joined
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import logging
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any
+
+logger = logging.getLogger("asr_worker")
+
+
+def configure_torch_threads(intra_op_threads: int, inter_op_threads: int) -> dict[str, int]:
+    """Applies the configured torch thread pools (``0`` keeps torch's default) and reports them."""
+    import torch
+
+    if intra_op_threads > 0:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads > 0:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError as exc:
+            # Only allowed before the first inter-op parallel work in the process.
+            logger.warning("could not set inter-op threads: %s", exc)
+    return {"intraOp": torch.get_num_threads(), "interOp": torch.get_num_interop_threads()}
+
+
+def quantize_encoder_int8(model: Any) -> Any:
+    """Swaps the encoder's nn.Linear layers for dynamically quantized int8 ones (CPU only)."""
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    encoder = getattr(model, "encoder", None)
+    if encoder is None:
+        raise ValueError("model has no encoder to quantize")
+    model.encoder = quantize_dynamic(encoder, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def inference_context() -> AbstractContextManager[Any]:
+    try:
+        import torch
+    except ImportError:
+        return nullcontext()
+    return torch.inference_mode()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+# Files written between scans of the persist directory for expired entries.
+DISK_PRUNE_EVERY_WRITES = 256
+
+
+def transcript_cache_key(
+    audio: np.ndarray, sample_rate: int, endpoint: str, models: list[str], config: Mapping[str, Any]
+) -> str:
+    """Content address of a request: decoded PCM, endpoint, models and the settings applied to the audio."""
+    digest = hashlib.sha256()
+    digest.update(f"{endpoint}\0{int(sample_rate)}\0{chr(0).join(models)}\0".encode("utf-8"))
+    digest.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    digest.update(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """LRU cache of finished ASR responses keyed by ``transcript_cache_key``, optionally persisted."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        persist_dir: str = "",
+        max_disk_bytes: int = 0,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.persist_dir = Path(persist_dir).expanduser() if persist_dir else None
+        self.max_disk_bytes = max(0, max_disk_bytes)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, int, dict[str, Any]]] = OrderedDict()
+        # Resolves to None when the computing request failed; joiners then compute for themselves.
+        self._inflight: dict[str, Future[dict[str, Any] | None]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._inflight_joins = 0
+        self._misses = 0
+        self._evictions = 0
+        self._prune_lock = threading.Lock()
+        self._disk_bytes = 0
+        self._disk_writes = 0
+        self._disk_evictions = 0
+        if self.enabled and self.persist_dir is not None:
+            self.prune_disk()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        if not self.enabled:
+            return compute()
+
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                self._hits += 1
+                return value
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = Future()
+                self._inflight[key] = pending
+                owner = True
+                self._misses += 1
+            else:
+                owner = False
+                self._inflight_joins += 1
+
+        if not owner:
+            value = pending.result()
+            if value is not None:
+                return value
+            # The owner's failure may be its own (e.g. its deadline passed); this request starts over.
+            with self._lock:
+                self._inflight_joins -= 1
+                self._misses += 1
+            value = compute()
+            self._store(key, value)
+            return value
+
+        try:
+            record = self._read_disk(key)
+            if record is None:
+                value = compute()
+                self._store(key, value)
+            else:
+                # Keep the file's timestamp so reading an entry back does not restart its TTL.
+                stored_at, value = record
+                with self._lock:
+                    self._disk_hits += 1
+                    self._put_locked(key, value, stored_at)
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set_result(None)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+        pending.set_result(value)
+        return value
+
+    def prune_disk(self) -> None:
+        """Deletes expired files, then the oldest ones until the directory fits ``max_disk_bytes``."""
+        if self.persist_dir is None or not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            files: list[tuple[float, int, Path]] = []
+            for path in self.persist_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if self._expired(stat.st_mtime):
+                    path.unlink(missing_ok=True)
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in files)
+            evicted = 0
+            if self.max_disk_bytes > 0 and total > self.max_disk_bytes:
+                files.sort()
+                for _, size, path in files:
+                    if total <= self.max_disk_bytes:
+                        break
+                    path.unlink(missing_ok=True)
+                    total -= size
+                    evicted += 1
+            with self._lock:
+                self._disk_bytes = total
+                self._disk_evictions += evicted
+        finally:
+            self._prune_lock.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._inflight_joins + self._misses
+            served = self._hits + self._inflight_joins + self._disk_hits
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl_seconds,
+                "persistDir": str(self.persist_dir) if self.persist_dir else None,
+                "diskBytes": self._disk_bytes,
+                "maxDiskBytes": self.max_disk_bytes,
+                "diskEvictions": self._disk_evictions,
+                "hits": self._hits,
+                "diskHits": self._disk_hits,
+                "inflightJoins": self._inflight_joins,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "inflight": len(self._inflight),
+                "hitRate": round(served / lookups, 4) if lookups else 0.0,
+            }
+
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        self._write_disk(key, value)
+        with self._lock:
+            self._put_locked(key, value, time.time())
+
+    def _get_locked(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, size, value = entry
+        if self._expired(stored_at):
+            del self._entries[key]
+            self._bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_locked(self, key: str, value: dict[str, Any], stored_at: float) -> None:
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._entries[key] = (stored_at, size, value)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._evictions += 1
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def _read_disk(self, key: str) -> tuple[float, dict[str, Any]] | None:
+        if self.persist_dir is None:
+            return None
+        path = self.persist_dir / f"{key}.json"
+        try:
+            stored_at = path.stat().st_mtime
+            if self._expired(stored_at):
+                path.unlink(missing_ok=True)
+                return None
+            return stored_at, json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, value: dict[str, Any]) -> None:
+        if self.persist_dir is None:
+            return
+        try:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+            fd, staging = tempfile.mkstemp(prefix=f".{key}.", dir=self.persist_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(value, handle, ensure_ascii=False)
+                size = handle.tell()
+            os.replace(staging, self.persist_dir / f"{key}.json")
+        except OSError:
+            # Persistence is best effort; the in-memory entry is still served.
+            return
+        with self._lock:
+            self._disk_bytes += size
+            self._disk_writes += 1
+            due = self._disk_writes % DISK_PRUNE_EVERY_WRITES == 0
+            over = self.max_disk_bytes > 0 and self._disk_bytes > self.max_disk_bytes
+        if due or over:
+            self.prune_disk()
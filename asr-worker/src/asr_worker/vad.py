@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+FRAME_SECONDS = 0.02
+# Frames this far below the clip's loudest frame never count as speech.
+PEAK_RELATIVE_FLOOR_DB = 20.0
+# Zero-crossing band of unvoiced consonants (s, sh, f) that are quiet but still speech.
+FRICATIVE_ZCR_RANGE = (0.25, 0.6)
+FRICATIVE_ENERGY_ALLOWANCE_DB = 8.0
+EPSILON = 1e-10
+# How far before a nominal cut point to look for the quietest frame.
+QUIET_SEARCH_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class VadConfig:
+    min_db: float = -50.0
+    margin_db: float = 12.0
+    padding_seconds: float = 0.2
+    max_pause_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class VadResult:
+    audio: np.ndarray
+    speech_seconds: float
+    is_silent: bool
+
+
+def speech_frame_mask(audio: np.ndarray, sample_rate: int, config: VadConfig) -> np.ndarray:
+    """Marks 20 ms frames as speech from frame energy plus zero-crossing rate."""
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    frames = audio.shape[0] // frame
+    if frames == 0:
+        return np.zeros(0, dtype=bool)
+
+    framed = audio[: frames * frame].reshape(frames, frame)
+    energy_db = 10.0 * np.log10(np.mean(np.square(framed, dtype=np.float64), axis=1) + EPSILON)
+    signs = np.signbit(framed)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(1, frame - 1)
+
+    noise_floor_db = float(np.percentile(energy_db, 10))
+    peak_db = float(energy_db.max())
+    threshold_db = max(config.min_db, min(noise_floor_db + config.margin_db, peak_db - PEAK_RELATIVE_FLOOR_DB))
+
+    voiced = energy_db >= threshold_db
+    low, high = FRICATIVE_ZCR_RANGE
+    fricative = (
+        (energy_db >= threshold_db - FRICATIVE_ENERGY_ALLOWANCE_DB)
+        & (energy_db >= config.min_db)
+        & (zcr >= low)
+        & (zcr <= high)
+    )
+    return voiced | fricative
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int, config: VadConfig) -> VadResult:
+    """Drops leading/trailing silence and, optionally, shortens long internal pauses."""
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    mask = speech_frame_mask(audio, sample_rate, config)
+    if mask.size == 0 or not mask.any():
+        return VadResult(audio=audio[:0], speech_seconds=0.0, is_silent=True)
+
+    padding = int(round(config.padding_seconds / FRAME_SECONDS))
+    if padding > 0:
+        # Dilate the speech mask so word onsets and releases survive the cut.
+        kernel = np.ones(2 * padding + 1, dtype=np.int32)
+        keep = np.convolve(mask.astype(np.int32), kernel, mode="same") > 0
+    else:
+        keep = mask.copy()
+
+    if config.max_pause_seconds > 0:
+        keep = shorten_pauses(keep, int(round(config.max_pause_seconds / FRAME_SECONDS)))
+    else:
+        speech = np.flatnonzero(keep)
+        keep[speech[0] : speech[-1] + 1] = True
+
+    # Frames past the last full frame follow the final frame's decision.
+    sample_keep = np.repeat(keep, frame)
+    if sample_keep.shape[0] < audio.shape[0]:
+        tail = np.full(audio.shape[0] - sample_keep.shape[0], keep[-1], dtype=bool)
+        sample_keep = np.concatenate([sample_keep, tail])
+
+    kept_indices = np.flatnonzero(sample_keep)
+    if kept_indices.size == audio.shape[0]:
+        trimmed = audio
+    elif kept_indices.size and kept_indices[-1] - kept_indices[0] + 1 == kept_indices.size:
+        trimmed = audio[kept_indices[0] : kept_indices[-1] + 1]
+    else:
+        trimmed = audio[sample_keep]
+    return VadResult(audio=trimmed, speech_seconds=round(trimmed.shape[0] / sample_rate, 3), is_silent=False)
+
+
+def shorten_pauses(keep: np.ndarray, max_pause_frames: int) -> np.ndarray:
+    """Keeps at most ``max_pause_frames`` of every silent run between speech frames."""
+    speech = np.flatnonzero(keep)
+    result = np.zeros_like(keep)
+    result[speech[0] : speech[-1] + 1] = True
+
+    inner = keep[speech[0] : speech[-1] + 1]
+    edges = np.diff(np.concatenate(([1], inner.astype(np.int8), [1])))
+    starts = np.flatnonzero(edges == -1)
+    ends = np.flatnonzero(edges == 1)
+    long_runs = (ends - starts) > max_pause_frames
+    for start, end in zip(starts[long_runs], ends[long_runs]):
+        head = max_pause_frames // 2
+        tail = max_pause_frames - head
+        result[speech[0] + start + head : speech[0] + end - tail] = False
+    return result
+
+
+def find_quiet_cut(audio: np.ndarray, nominal_end: int, sample_rate: int) -> int:
+    """Middle of the lowest-energy frame in the second before ``nominal_end``."""
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    search_start = max(frame, nominal_end - int(QUIET_SEARCH_SECONDS * sample_rate))
+    span = audio[search_start:nominal_end]
+    frames = span.shape[0] // frame
+    if frames == 0:
+        return nominal_end
+    energy = np.square(span[: frames * frame].reshape(frames, frame)).mean(axis=1)
+    return search_start + int(np.argmin(energy)) * frame + frame // 2
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger("asr_worker")
+
+# Seconds clients are told to wait before retrying while the worker is still warming up.
+WARMUP_RETRY_AFTER_SECONDS = 5
+
+WarmupStep = tuple[str, Callable[[], None]]
+
+
+class WorkerWarmup:
+    """Runs the slow startup steps (NeMo import, model loads, first inference) off the event loop."""
+
+    def __init__(self, steps: list[WarmupStep]):
+        self._steps = steps
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._current_step = "starting"
+        self._completed: dict[str, float] = {}
+        self._error: str | None = None
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and self._error is None
+
+    @property
+    def failed(self) -> bool:
+        return self._error is not None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="asr-warmup", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        self.start()
+        self._done.wait(timeout)
+        return self.ready
+
+    def not_ready_detail(self) -> str:
+        with self._lock:
+            if self._error is not None:
+                return f"ASR worker failed to start: {self._error}"
+            return f"ASR worker is warming up ({self._current_step})"
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            finished_at = self._finished_at if self._finished_at is not None else time.monotonic()
+            return {
+                "ready": self._done.is_set() and self._error is None,
+                "step": "done" if self._done.is_set() and self._error is None else self._current_step,
+                "error": self._error,
+                "completedSteps": {name: round(seconds, 3) for name, seconds in self._completed.items()},
+                "elapsedSeconds": (
+                    round(finished_at - self._started_at, 3) if self._started_at is not None else 0.0
+                ),
+            }
+
+    def _run(self) -> None:
+        try:
+            for name, step in self._steps:
+                with self._lock:
+                    self._current_step = name
+                started = time.perf_counter()
+                step()
+                with self._lock:
+                    self._completed[name] = time.perf_counter() - started
+        except Exception as exc:  # noqa: BLE001
+            with self._lock:
+                self._error = f"{self._current_step}: {exc}"
+            logger.error("warmup failed at %s: %s", self._current_step, exc)
+        finally:
+            with self._lock:
+                self._finished_at = time.monotonic()
+            self._done.set()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from fakes import FakeAsrModel, worker_settings
+from fastapi.testclient import TestClient
+
+from asr_worker.app import create_app
+
+
+@pytest.fixture
+def make_client():
+    clients: list[TestClient] = []
+
+    def make(model: FakeAsrModel, **overrides: Any) -> TestClient:
+        app = create_app(worker_settings(**overrides), model_loader=lambda _name, _location: model)
+        client = TestClient(app)
+        client.__enter__()
+        app.state.warmup.wait(10)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.__exit__(None, None, None)
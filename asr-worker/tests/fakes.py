@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import base64
+import io
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from asr_worker.app import DEFAULT_MODEL_SAMPLE_RATE, WorkerSettings
+
+
+class FakeAsrModel:
+    """Stands in for a NeMo model: takes in-memory arrays and sleeps ``delay`` per batch."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.cfg = type("Cfg", (), {"sample_rate": DEFAULT_MODEL_SAMPLE_RATE})()
+        self.delay = delay
+        self.batches: list[int] = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio: list[np.ndarray], batch_size: int = 1) -> list[str]:
+        with self._lock:
+            self.batches.append(len(audio))
+        time.sleep(self.delay)
+        return [f"samples {len(item)}" for item in audio]
+
+    def parameters(self) -> Any:
+        return iter([])
+
+
+def worker_settings(**overrides: Any) -> WorkerSettings:
+    defaults: dict[str, Any] = {
+        "device": "cpu",
+        "backend": "nemo",
+        "preload_models": False,
+        "inference_mode": False,
+        "batch_window_ms": 0.0,
+        "transcript_cache_entries": 0,
+        "transcript_cache_dir": "",
+        "vad_endpoints": "",
+        "chunk_seconds": 0.0,
+    }
+    return WorkerSettings(**{**defaults, **overrides})
+
+
+def wav_request(seconds: float = 1.0, sample_rate: int = DEFAULT_MODEL_SAMPLE_RATE, seed: int = 0) -> dict[str, str]:
+    rng = np.random.default_rng(seed)
+    audio = (0.1 * rng.standard_normal(int(seconds * sample_rate))).astype(np.float32)
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format="WAV")
+    return {"audioBase64": base64.b64encode(buffer.getvalue()).decode("ascii"), "mimeType": "audio/wav"}
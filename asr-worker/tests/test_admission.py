@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fakes import FakeAsrModel, wav_request
+
+from asr_worker.admission import AdmissionController, parse_deadline, parse_endpoint_priorities
+
+
+def test_controller_bounds_admitted_requests() -> None:
+    admission = AdmissionController(2, {})
+    assert admission.try_admit()
+    assert admission.try_admit()
+    assert not admission.try_admit()
+    admission.release()
+    assert admission.try_admit()
+    stats = admission.stats()
+    assert stats["inFlight"] == 2
+    assert stats["admitted"] == 3
+    assert stats["rejected"]["queueFull"] == 1
+
+
+def test_controller_without_limit_admits_everything() -> None:
+    admission = AdmissionController(0, {})
+    assert all(admission.try_admit() for _ in range(100))
+
+
+def test_controller_check_and_claim_is_atomic() -> None:
+    admission = AdmissionController(5, {})
+    start = threading.Barrier(32)
+
+    def claim() -> bool:
+        start.wait()
+        return admission.try_admit()
+
+    with ThreadPoolExecutor(32) as pool:
+        admitted = sum(pool.map(lambda _: claim(), range(32)))
+    assert admitted == 5
+    assert admission.in_flight() == 5
+
+
+def test_parse_helpers() -> None:
+    assert parse_endpoint_priorities("fast=0, EN=2,bad,mixed=x") == {"fast": 0, "en": 2}
+    assert parse_deadline(None) is None
+    assert parse_deadline("soon") is None
+    deadline = parse_deadline(str(int(time.time() * 1000) + 5000))
+    assert deadline is not None and 4.0 < deadline - time.monotonic() <= 5.0
+
+
+def test_burst_beyond_limit_gets_429(make_client) -> None:
+    model = FakeAsrModel(delay=0.3)
+    client = make_client(model, queue_max_depth=2, batch_max_size=1)
+    body = wav_request()
+
+    with ThreadPoolExecutor(12) as pool:
+        responses = list(pool.map(lambda _: client.post("/v1/asr/en", json=body), range(12)))
+
+    statuses = [response.status_code for response in responses]
+    assert statuses.count(429) > 0
+    assert statuses.count(200) >= 2
+    assert set(statuses) <= {200, 429}
+    rejected = next(response for response in responses if response.status_code == 429)
+    assert rejected.headers["Retry-After"]
+    assert rejected.json()["maxInFlight"] == 2
+
+    admission = client.get("/health").json()["admission"]
+    assert admission["inFlight"] == 0
+    assert admission["rejected"]["queueFull"] == statuses.count(429)
+    assert client.post("/v1/asr/en", json=body).status_code == 200
+
+
+def test_expired_deadline_gets_504_without_inference(make_client) -> None:
+    model = FakeAsrModel()
+    client = make_client(model)
+    expired = str(int(time.time() * 1000) - 1000)
+    response = client.post("/v1/asr/en", json=wav_request(), headers={"x-request-deadline": expired})
+    assert response.status_code == 504
+    assert model.batches == []
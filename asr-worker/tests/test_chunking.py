@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+from fakes import FakeAsrModel, wav_request
+
+from asr_worker.chunking import plan_chunks, stitch_transcripts
+from asr_worker.textjoin import join_transcripts
+from asr_worker.vad import find_quiet_cut
+
+SAMPLE_RATE = 16_000
+
+
+def tone(seconds: float) -> np.ndarray:
+    samples = np.arange(int(seconds * SAMPLE_RATE))
+    return (0.3 * np.sin(2 * np.pi * 220 * samples / SAMPLE_RATE)).astype(np.float32)
+
+
+def silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def seconds(chunks: list[tuple[int, int]]) -> list[tuple[float, float]]:
+    return [(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in chunks]
+
+
+def test_short_clips_stay_whole() -> None:
+    audio = tone(5.2)
+    assert plan_chunks(audio, SAMPLE_RATE, 5.0, 0.5) == [(0, audio.shape[0])]
+    assert plan_chunks(audio, SAMPLE_RATE, 0.0, 0.5) == [(0, audio.shape[0])]
+
+
+def test_windows_are_cut_in_pauses_and_overlap() -> None:
+    audio = np.concatenate([tone(3.5), silence(0.5), tone(3.5), silence(0.5), tone(3.0)])
+    chunks = plan_chunks(audio, SAMPLE_RATE, 5.0, 0.5)
+
+    assert seconds(chunks) == [(0.0, 3.75), (3.25, 7.75), (7.25, 11.0)]
+    assert all(end - start <= 5 * SAMPLE_RATE for start, end in chunks)
+
+
+def test_windows_without_pauses_end_at_the_nominal_length() -> None:
+    chunks = plan_chunks(tone(12.0), SAMPLE_RATE, 5.0, 0.5)
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == 12 * SAMPLE_RATE
+    assert all(end - start <= 5 * SAMPLE_RATE for start, end in chunks)
+    assert all(previous[1] - current[0] == SAMPLE_RATE // 2 for previous, current in zip(chunks, chunks[1:]))
+
+
+def test_quiet_cut_lands_in_the_quietest_frame() -> None:
+    audio = np.concatenate([tone(2.0), silence(0.1), tone(1.0)])
+    cut = find_quiet_cut(audio, int(2.5 * SAMPLE_RATE), SAMPLE_RATE)
+    assert 2.0 * SAMPLE_RATE <= cut <= 2.1 * SAMPLE_RATE
+
+
+def test_stitching_drops_words_repeated_by_the_overlap() -> None:
+    assert (
+        stitch_transcripts(["the quick brown fox jumps", "fox jumps over the lazy dog"], 0.5)
+        == "the quick brown fox jumps over the lazy dog"
+    )
+    assert stitch_transcripts(["今日はいい天気です", "天気ですね"], 0.5) == "今日はいい天気ですね"
+    # One short word is too weak a signal to drop.
+    assert stitch_transcripts(["I saw a", "a cat"], 0.5) == "I saw a a cat"
+
+
+def test_join_spaces_only_latin_text() -> None:
+    assert join_transcripts(["hello", "", "  world "]) == "hello world"
+    assert join_transcripts(["今日は", "hello", "です"]) == "今日はhelloです"
+    assert join_transcripts([]) == ""
+
+
+def test_long_clips_are_transcribed_as_one_batch_of_windows(make_client) -> None:
+    model = FakeAsrModel()
+    client = make_client(model, chunk_seconds=4.0, chunk_overlap_seconds=0.5, batch_max_size=8)
+    response = client.post("/v1/asr/en", json=wav_request(seconds=10.0))
+
+    assert response.status_code == 200
+    # All windows are queued at once, so one batch carries them (cuts may fall early on noise).
+    assert len(model.batches) == 1 and model.batches[0] >= 3
+    assert response.json()["text"].count("samples") == model.batches[0]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fakes import worker_settings
+from fastapi import HTTPException
+
+from asr_worker import app as app_module
+from asr_worker.app import DEFAULT_MODEL_SAMPLE_RATE, FfmpegDecoder
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app_module.shutil, "which", lambda name: f"/usr/bin/{name}")
+
+
+def tone(seconds: float, sample_rate: int) -> np.ndarray:
+    samples = np.arange(int(seconds * sample_rate), dtype=np.float32)
+    return (0.3 * np.sin(2 * np.pi * 440 * samples / sample_rate)).astype(np.float32)
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_busy_decoder_returns_503_after_queue_timeout(fake_ffmpeg: None) -> None:
+    decoder = FfmpegDecoder(worker_settings(ffmpeg_max_processes=1, ffmpeg_queue_timeout_seconds=0.05))
+    decoder._acquire()
+
+    with pytest.raises(HTTPException) as raised:
+        decoder._acquire()
+
+    assert raised.value.status_code == 503
+    assert decoder.stats() == {"maxProcesses": 1, "active": 1, "waiting": 0}
+    decoder._release()
+    assert decoder.stats()["active"] == 0
+
+
+def test_waiting_callers_are_counted_and_get_the_released_slot(fake_ffmpeg: None) -> None:
+    decoder = FfmpegDecoder(worker_settings(ffmpeg_max_processes=1, ffmpeg_queue_timeout_seconds=5.0))
+    decoder._acquire()
+    acquired = threading.Event()
+
+    def waiter() -> None:
+        decoder._acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    wait_for(lambda: decoder.stats()["waiting"] == 1)
+    assert not acquired.is_set()
+
+    decoder._release()
+    thread.join(timeout=5)
+
+    assert acquired.is_set()
+    assert decoder.stats() == {"maxProcesses": 1, "active": 1, "waiting": 0}
+
+
+def test_missing_ffmpeg_is_a_bad_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app_module.shutil, "which", lambda name: None)
+    decoder = FfmpegDecoder(worker_settings())
+
+    with pytest.raises(HTTPException) as raised:
+        decoder.decode(b"payload", "audio/webm")
+
+    assert raised.value.status_code == 400
+    assert decoder.stats()["active"] == 0
+
+
+@requires_ffmpeg
+def test_decode_pipes_and_resamples_to_the_model_rate() -> None:
+    buffer = io.BytesIO()
+    sf.write(buffer, tone(1.0, 24_000), 24_000, format="OGG", subtype="VORBIS")
+    decoder = FfmpegDecoder(worker_settings())
+
+    waveform, sample_rate = decoder.decode(buffer.getvalue(), "audio/ogg")
+
+    assert sample_rate == DEFAULT_MODEL_SAMPLE_RATE
+    assert waveform.dtype == np.float32
+    assert abs(waveform.shape[0] - DEFAULT_MODEL_SAMPLE_RATE) < DEFAULT_MODEL_SAMPLE_RATE // 50
+    assert decoder.stats()["active"] == 0
+
+
+@requires_ffmpeg
+def test_m4a_falls_back_to_a_file_when_the_pipe_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "tone.wav"
+    sf.write(source, tone(1.0, DEFAULT_MODEL_SAMPLE_RATE), DEFAULT_MODEL_SAMPLE_RATE)
+    m4a = tmp_path / "tone.m4a"
+    subprocess.run(["ffmpeg", "-v", "error", "-i", str(source), "-c:a", "aac", str(m4a)], check=True)
+    run_ffmpeg_pcm = app_module.run_ffmpeg_pcm
+    sources: list[str] = []
+
+    def pipe_cannot_seek(
+        ffmpeg: str, source: str, stdin_payload: bytes | None, timeout: float | None
+    ) -> tuple[np.ndarray, int]:
+        # Stands in for an mp4 whose index sits after the samples, out of reach of a pipe.
+        sources.append(source)
+        if source == "pipe:0":
+            raise HTTPException(status_code=400, detail="Unsupported audio payload: moov atom not found")
+        return run_ffmpeg_pcm(ffmpeg, source, stdin_payload, timeout)
+
+    monkeypatch.setattr(app_module, "run_ffmpeg_pcm", pipe_cannot_seek)
+    decoder = FfmpegDecoder(worker_settings())
+
+    waveform, sample_rate = decoder.decode(m4a.read_bytes(), "audio/mp4")
+
+    assert sources[0] == "pipe:0" and sources[1].endswith(".m4a")
+    assert not Path(sources[1]).exists()
+    assert sample_rate == DEFAULT_MODEL_SAMPLE_RATE
+    assert abs(waveform.shape[0] - DEFAULT_MODEL_SAMPLE_RATE) < DEFAULT_MODEL_SAMPLE_RATE // 20
+
+
+@requires_ffmpeg
+def test_undecodable_payload_is_a_bad_request() -> None:
+    decoder = FfmpegDecoder(worker_settings())
+
+    with pytest.raises(HTTPException) as raised:
+        decoder.decode(b"not audio at all", "audio/webm")
+
+    assert raised.value.status_code == 400
+    assert decoder.stats()["active"] == 0
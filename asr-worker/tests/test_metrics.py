@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from fakes import FakeAsrModel, wav_request
+
+from asr_worker.metrics import Counter, Histogram, format_labels, gauge_lines, server_timing_header
+
+
+def test_server_timing_sums_repeated_stages_in_first_seen_order() -> None:
+    timings = [("base64", 0.0012), ("inference", 0.2), ("clip", 0.0001), ("inference", 0.05)]
+    assert server_timing_header(timings) == "base64;dur=1.2, inference;dur=250.0, clip;dur=0.1"
+    assert server_timing_header([]) == ""
+
+
+def test_histogram_renders_cumulative_buckets_per_series() -> None:
+    histogram = Histogram("asr_test_seconds", "Test latency.", (0.1, 1.0), ("model",))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "en")
+    histogram.observe(0.2, "ja")
+
+    assert histogram.render() == [
+        "# HELP asr_test_seconds Test latency.",
+        "# TYPE asr_test_seconds histogram",
+        'asr_test_seconds_bucket{model="en",le="0.1"} 1',
+        'asr_test_seconds_bucket{model="en",le="1"} 2',
+        'asr_test_seconds_bucket{model="en",le="+Inf"} 3',
+        'asr_test_seconds_sum{model="en"} 5.55',
+        'asr_test_seconds_count{model="en"} 3',
+        'asr_test_seconds_bucket{model="ja",le="0.1"} 0',
+        'asr_test_seconds_bucket{model="ja",le="1"} 1',
+        'asr_test_seconds_bucket{model="ja",le="+Inf"} 1',
+        'asr_test_seconds_sum{model="ja"} 0.2',
+        'asr_test_seconds_count{model="ja"} 1',
+    ]
+
+
+def test_counter_gauge_and_label_escaping() -> None:
+    counter = Counter("asr_test_total", "Test counter.", ("model",))
+    counter.inc(1.5, "en")
+    counter.inc(2.5, "en")
+    assert counter.render()[2:] == ['asr_test_total{model="en"} 4']
+
+    assert gauge_lines("asr_test_bytes", "Test gauge.", [({}, 10), ({"model": "a"}, 0.5)])[2:] == [
+        "asr_test_bytes 10",
+        'asr_test_bytes{model="a"} 0.5',
+    ]
+    assert format_labels(("model",), ('say "hi"\\\n',)) == '{model="say \\"hi\\"\\\\\\n"}'
+
+
+def test_requests_report_server_timing_and_metrics(make_client) -> None:
+    client = make_client(FakeAsrModel())
+    response = client.post("/v1/asr/en", json=wav_request())
+
+    stages = [entry.split(";dur=")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert stages == ["base64", "soundfile", "resample", "inference"]
+    metrics = client.get("/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'asr_request_duration_seconds_count{endpoint="en",status="200"} 1' in metrics.text
+    assert 'asr_stage_duration_seconds_count{stage="inference"} 1' in metrics.text
+    assert 'asr_batch_size_count{model="' in metrics.text
+    assert "# TYPE asr_queue_depth gauge" in metrics.text
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from fakes import FakeAsrModel, worker_settings
+
+from asr_worker.app import ModelRegistry
+
+MIB = 1024 * 1024
+
+
+class SizedModel(FakeAsrModel):
+    """A fake model with a fixed footprint whose moves between devices can be held or made to fail."""
+
+    def __init__(self, name: str, size_mib: int = 1) -> None:
+        super().__init__()
+        self.name = name
+        self.size_bytes = size_mib * MIB
+        self.device = "cuda"
+        self.move_started = threading.Event()
+        self.move_gate: threading.Event | None = None
+        self.fail_moves = False
+
+    def footprint_bytes(self) -> int:
+        return self.size_bytes
+
+    def to(self, device: str) -> SizedModel:
+        self.move_started.set()
+        if self.move_gate is not None:
+            self.move_gate.wait(5)
+        if self.fail_moves:
+            raise RuntimeError("out of host memory")
+        self.device = device
+        return self
+
+
+class Loader:
+    def __init__(self) -> None:
+        self.models: dict[str, SizedModel] = {}
+        self.loads: list[str] = []
+
+    def __call__(self, model_name: str, _map_location: str) -> Any:
+        self.loads.append(model_name)
+        return self.models.setdefault(model_name, SizedModel(model_name))
+
+
+def make_registry(**overrides: Any) -> tuple[ModelRegistry, Loader]:
+    loader = Loader()
+    settings = worker_settings(device="cuda", single_model_cache=False, **overrides)
+    return ModelRegistry(settings, loader=loader), loader
+
+
+def test_least_recently_used_model_is_evicted_to_fit_the_budget() -> None:
+    registry, loader = make_registry(model_cache_mb=2)
+    for name in ("a", "b", "a", "c"):
+        registry.get(name)
+
+    assert registry.loaded_models() == ["a", "c"]
+    stats = registry.stats()
+    assert (stats["evictions"], stats["residentBytes"]) == (1, 2 * MIB)
+    registry.get("b")
+    assert registry.loaded_models() == ["b", "c"]
+    assert loader.loads == ["a", "b", "c", "b"]
+
+
+def test_unlimited_budget_keeps_everything() -> None:
+    registry, _ = make_registry(model_cache_mb=0)
+    for name in ("a", "b", "c"):
+        registry.get(name)
+    assert registry.loaded_models() == ["a", "b", "c"]
+
+
+def test_single_model_mode_keeps_one_model_resident() -> None:
+    registry = ModelRegistry(worker_settings(device="cuda", single_model_cache=True), loader=Loader())
+    registry.get("a")
+    registry.get("b")
+    assert registry.loaded_models() == ["b"]
+
+
+def test_pinned_models_are_not_evicted() -> None:
+    registry, _ = make_registry(model_cache_mb=1)
+    with registry.acquire("a"):
+        registry.get("b")
+        assert registry.loaded_models() == ["a", "b"]
+    registry.get("c")
+    assert registry.loaded_models() == ["c"]
+
+
+def test_offloaded_models_are_restored_without_reloading() -> None:
+    registry, loader = make_registry(model_cache_mb=1, model_offload=True)
+    registry.get("a")
+    registry.get("b")
+
+    assert loader.models["a"].device == "cpu"
+    assert registry.stats()["offloadedModels"] == ["a"]
+    assert registry.get("a") is loader.models["a"]
+    assert loader.models["a"].device == "cuda"
+    assert loader.loads == ["a", "b"]
+    stats = registry.stats()
+    assert (stats["offloads"], stats["restores"]) == (2, 1)
+    assert stats["offloadedModels"] == ["b"]
+
+
+def test_offload_budget_drops_the_oldest_offloaded_model() -> None:
+    registry, loader = make_registry(model_cache_mb=1, model_offload=True, model_offload_mb=1)
+    for name in ("a", "b", "c"):
+        registry.get(name)
+    assert registry.stats()["offloadedModels"] == ["b"]
+    registry.get("a")
+    assert loader.loads == ["a", "b", "c", "a"]
+
+
+def test_failed_offload_keeps_the_model_resident() -> None:
+    registry, loader = make_registry(model_cache_mb=1, model_offload=True)
+    registry.get("a").fail_moves = True
+    registry.get("b")
+
+    assert registry.loaded_models() == ["a", "b"]
+    assert registry.stats()["evictions"] == 0
+    assert registry.get("a") is loader.models["a"]
+    assert loader.loads == ["a", "b"]
+
+
+def test_offload_runs_without_holding_the_registry_lock() -> None:
+    registry, loader = make_registry(model_cache_mb=1, model_offload=True)
+    model = registry.get("a")
+    model.move_gate = gate = threading.Event()
+    evicting = threading.Thread(target=registry.get, args=("b",))
+    evicting.start()
+    try:
+        assert model.move_started.wait(5)
+        stats = threading.Thread(target=registry.stats)
+        stats.start()
+        stats.join(1)
+        assert not stats.is_alive(), "registry lock is held during the device move"
+    finally:
+        gate.set()
+        evicting.join(5)
+    assert loader.models["a"].device == "cpu"
+
+
+def test_reacquiring_a_model_mid_offload_waits_for_the_move() -> None:
+    registry, loader = make_registry(model_cache_mb=1, model_offload=True)
+    model = registry.get("a")
+    model.move_gate = gate = threading.Event()
+    evicting = threading.Thread(target=registry.get, args=("b",))
+    evicting.start()
+    assert model.move_started.wait(5)
+    reacquired: list[Any] = []
+    waiter = threading.Thread(target=lambda: reacquired.append(registry.get("a")))
+    waiter.start()
+    waiter.join(0.2)
+    assert not reacquired
+    gate.set()
+    evicting.join(5)
+    waiter.join(5)
+
+    assert reacquired == [model] and model.device == "cuda"
+    assert loader.loads == ["a", "b"]
+    assert registry.stats()["restores"] == 1
+
+
+def test_replicas_are_cached_under_their_own_keys() -> None:
+    registry, loader = make_registry(model_cache_mb=0)
+
+    registry.get("a")
+    registry.get("a", replica=1)
+    registry.get("a", replica=1)
+
+    assert registry.loaded_models() == ["a", "a#1"]
+    assert loader.loads == ["a", "a"]
+    assert (registry.stats()["hits"], registry.stats()["misses"]) == (1, 2)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pytest
+
+from asr_worker.onnx_backend import (
+    FRONTEND_ARRAYS,
+    MAX_SYMBOLS_PER_STEP,
+    ONNX_MANIFEST,
+    MelFrontend,
+    OnnxAsrModel,
+    feeds,
+    has_onnx_export,
+    onnx_model_loader,
+)
+from asr_worker.snapshot import snapshot_path
+
+VOCABULARY = ["<unk>", "▁hel", "lo", "▁world"]
+BLANK = len(VOCABULARY)
+DURATIONS = [0, 1, 2]
+N_MELS = 8
+
+FRONTEND_MANIFEST = {
+    "sampleRate": 16_000,
+    "nFft": 512,
+    "hopLength": 160,
+    "preemphasis": 0.97,
+    "magPower": 2.0,
+    "logZeroGuard": 5.960464477539063e-08,
+    "normalize": "per_feature",
+}
+
+
+def spec(name: str, dtype: str) -> SimpleNamespace:
+    return SimpleNamespace(name=name, type=dtype)
+
+
+class FakeEncoder:
+    """Emits one frame per input column whose first feature is the frame index."""
+
+    def __init__(self, frames: list[int]) -> None:
+        self.frames = frames
+
+    def get_inputs(self) -> list[SimpleNamespace]:
+        return [spec("audio_signal", "tensor(float)"), spec("length", "tensor(int64)")]
+
+    def run(self, _outputs: Any, inputs: dict[str, np.ndarray]) -> list[np.ndarray]:
+        batch = inputs["audio_signal"].shape[0]
+        encoded = np.zeros((batch, 4, max(self.frames)), dtype=np.float32)
+        encoded[:, 0, :] = np.arange(max(self.frames))
+        return [encoded, np.array(self.frames, dtype=np.int64)]
+
+
+class ScriptedDecoderJoint:
+    """Returns scripted ``(token, duration index)`` outputs per frame; a frame's last entry repeats."""
+
+    def __init__(self, script: dict[int, list[tuple[int, int]]], durations: list[int]) -> None:
+        self.script = script
+        self.durations = durations
+        self.calls: list[tuple[int, int, float]] = []
+
+    def get_inputs(self) -> list[SimpleNamespace]:
+        return [
+            spec("encoder_outputs", "tensor(float)"),
+            spec("targets", "tensor(int32)"),
+            spec("target_length", "tensor(int32)"),
+            spec("input_states_1", "tensor(float)"),
+            spec("input_states_2", "tensor(float)"),
+        ]
+
+    def run(self, _outputs: Any, inputs: dict[str, np.ndarray]) -> list[np.ndarray]:
+        frame = int(inputs["encoder_outputs"][0, 0, 0])
+        state = float(inputs["input_states_1"].reshape(-1)[0])
+        visits = sum(1 for seen, _, _ in self.calls if seen == frame)
+        self.calls.append((frame, int(inputs["targets"][0][0]), state))
+        outputs = self.script.get(frame, [(BLANK, 1)])
+        token, duration = outputs[min(visits, len(outputs) - 1)]
+        logits = np.zeros(BLANK + 1 + len(self.durations), dtype=np.float32)
+        logits[token] = 1.0
+        if self.durations:
+            logits[BLANK + 1 + duration] = 1.0
+        states = [inputs["input_states_1"] + 1.0, inputs["input_states_2"] + 1.0]
+        return [logits.reshape(1, 1, 1, -1), np.array([1]), *states]
+
+
+def onnx_model(
+    script: dict[int, list[tuple[int, int]]], frames: list[int], durations: list[int] = DURATIONS
+) -> OnnxAsrModel:
+    # Skips __init__, which needs exported graphs; the sessions are replaced by scripted fakes.
+    model = object.__new__(OnnxAsrModel)
+    model.manifest = {"predictionLayers": 1, "predictionHidden": 2}
+    model.frontend = MelFrontend(FRONTEND_MANIFEST, np.hanning(400).astype(np.float32), filterbank())
+    model.cfg = SimpleNamespace(sample_rate=16_000)
+    model.vocabulary = VOCABULARY
+    model.blank = BLANK
+    model.decoder = "tdt" if durations else "rnnt"
+    model.durations = durations
+    model.encoder = FakeEncoder(frames)
+    model.decoder_joint = ScriptedDecoderJoint(script, durations)
+    return model
+
+
+def filterbank() -> np.ndarray:
+    return np.random.default_rng(0).uniform(0.0, 1.0, (N_MELS, 257)).astype(np.float32)
+
+
+def test_mel_frontend_matches_a_torch_stft_reference() -> None:
+    torch = pytest.importorskip("torch")
+    audio = np.random.default_rng(1).uniform(-0.5, 0.5, 16_000 + 37).astype(np.float32)
+    window = torch.hann_window(400, periodic=False)
+    frontend = MelFrontend(FRONTEND_MANIFEST, window.numpy(), filterbank())
+
+    signal = torch.from_numpy(audio)
+    signal = torch.cat((signal[:1], signal[1:] - 0.97 * signal[:-1]))
+    spectrum = torch.stft(
+        signal,
+        512,
+        hop_length=160,
+        win_length=400,
+        window=window,
+        center=True,
+        pad_mode="constant",
+        return_complex=True,
+    ).abs() ** 2
+    features = torch.log(torch.from_numpy(filterbank()) @ spectrum + FRONTEND_MANIFEST["logZeroGuard"])
+    expected = (features - features.mean(dim=1, keepdim=True)) / (features.std(dim=1, keepdim=True) + 1e-5)
+
+    actual = frontend(audio)
+
+    assert actual.shape == tuple(expected.shape) == (N_MELS, 1 + audio.shape[0] // 160)
+    np.testing.assert_allclose(actual, expected.numpy(), atol=2e-3)
+
+
+def test_mel_batch_pads_to_the_longest_clip() -> None:
+    frontend = MelFrontend(FRONTEND_MANIFEST, np.hanning(400).astype(np.float32), filterbank())
+    short = np.zeros(1600, dtype=np.float32)
+    long = np.random.default_rng(2).uniform(-0.5, 0.5, 4800).astype(np.float32)
+
+    batch, lengths = frontend.batch([short, long])
+
+    assert lengths.tolist() == [11, 31]
+    assert batch.shape == (2, N_MELS, 31)
+    assert not batch[0, :, 11:].any()
+
+
+def test_tdt_greedy_follows_predicted_durations() -> None:
+    script = {
+        0: [(1, 0), (2, 1)],  # two symbols on frame 0, then advance one frame
+        1: [(BLANK, 2)],  # blank that skips frame 2
+        3: [(3, 1)],
+    }
+    model = onnx_model(script, frames=[4])
+
+    assert model.transcribe([np.zeros(1600, dtype=np.float32)]) == ["hello world"]
+    decoder_joint = model.decoder_joint
+    assert [frame for frame, _, _ in decoder_joint.calls] == [0, 0, 1, 3]
+    # The prediction network sees the last emitted token and only advances its state on emissions.
+    assert [(target, state) for _, target, state in decoder_joint.calls] == [(BLANK, 0), (1, 1), (2, 2), (2, 2)]
+
+
+def test_tdt_blank_with_zero_duration_still_advances() -> None:
+    model = onnx_model({0: [(BLANK, 0)], 1: [(1, 1)]}, frames=[2])
+
+    assert model.transcribe([np.zeros(1600, dtype=np.float32)]) == ["hel"]
+    assert [frame for frame, _, _ in model.decoder_joint.calls] == [0, 1]
+
+
+def test_symbols_per_frame_are_capped() -> None:
+    for durations in (DURATIONS, []):
+        model = onnx_model({0: [(2, 0)]}, frames=[1], durations=durations)
+
+        assert model.transcribe([np.zeros(1600, dtype=np.float32)]) == ["lo" * MAX_SYMBOLS_PER_STEP]
+
+
+def test_each_clip_decodes_only_its_own_frames() -> None:
+    model = onnx_model({0: [(1, 1)], 2: [(3, 1)]}, frames=[3, 1])
+
+    assert model.transcribe([np.zeros(4800, dtype=np.float32), np.zeros(1600, dtype=np.float32)]) == [
+        "hel world",
+        "hel",
+    ]
+
+
+def test_detokenize_drops_special_and_unknown_ids() -> None:
+    model = onnx_model({}, frames=[1])
+
+    assert model.detokenize([0, 1, 2, 99, -1, 3]) == "hello world"
+
+
+def test_feeds_cast_to_declared_input_types() -> None:
+    mapped = feeds(ScriptedDecoderJoint({}, DURATIONS), [[[[0.5]]], [[3]], [1], [[0.0]], [[0.0]]])
+
+    assert list(mapped) == ["encoder_outputs", "targets", "target_length", "input_states_1", "input_states_2"]
+    assert mapped["targets"].dtype == np.int32
+    assert mapped["encoder_outputs"].dtype == np.float32
+
+
+def test_loader_requires_an_export(tmp_path: Path) -> None:
+    load = onnx_model_loader(tmp_path)
+
+    assert not has_onnx_export(tmp_path, "nvidia/model")
+    with pytest.raises(FileNotFoundError, match="export-onnx --model nvidia/model"):
+        load("nvidia/model", "cpu")
+
+
+def test_unsupported_decoder_export_is_rejected(tmp_path: Path) -> None:
+    pytest.importorskip("onnxruntime")
+    directory = snapshot_path(tmp_path, "m")
+    directory.mkdir()
+    np.savez(directory / FRONTEND_ARRAYS, window=np.hanning(400).astype(np.float32), filterbank=filterbank())
+    manifest = {**FRONTEND_MANIFEST, "vocabulary": VOCABULARY, "blank": BLANK, "decoder": "ctc"}
+    (directory / ONNX_MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+
+    assert has_onnx_export(tmp_path, "m")
+    with pytest.raises(ValueError, match="unsupported ctc export"):
+        onnx_model_loader(tmp_path)("m", "cpu")
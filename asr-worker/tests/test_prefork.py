@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from fakes import FakeAsrModel, worker_settings
+
+from asr_worker.prefork import check_prefork_settings, shared_model_loader, worker_torch_threads
+
+
+def test_onnx_backend_is_refused() -> None:
+    with pytest.raises(SystemExit, match="ASR_BACKEND=onnx"):
+        check_prefork_settings(worker_settings(backend="onnx"))
+
+
+def test_non_cpu_device_is_refused() -> None:
+    with pytest.raises(SystemExit, match="ASR_DEVICE=cpu"):
+        check_prefork_settings(worker_settings(device="cuda"))
+
+
+def test_cpu_nemo_settings_are_accepted() -> None:
+    check_prefork_settings(worker_settings())
+
+
+def test_workers_split_the_cores_unless_threads_are_configured() -> None:
+    cores = os.cpu_count() or 1
+    assert worker_torch_threads(worker_settings(torch_threads=0), 2) == max(1, cores // 2)
+    assert worker_torch_threads(worker_settings(torch_threads=0), cores * 4) == 1
+    assert worker_torch_threads(worker_settings(torch_threads=3), 2) == 3
+
+
+def test_shared_loader_hands_out_the_parent_models() -> None:
+    model = FakeAsrModel()
+    assert shared_model_loader({"en": model})("en", "cpu") is model
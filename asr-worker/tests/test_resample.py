@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from asr_worker.resample import resample_audio
+
+TARGET_RATE = 16_000
+# Edge samples see the zero padding; compare the interior only.
+EDGE = 400
+
+
+def tone(frequency: float, sample_rate: int, samples: int) -> np.ndarray:
+    return np.sin(2 * np.pi * frequency * np.arange(samples) / sample_rate).astype(np.float32)
+
+
+def test_same_rate_and_empty_input_pass_through() -> None:
+    audio = tone(440, TARGET_RATE, 1000)
+    assert resample_audio(audio, TARGET_RATE, TARGET_RATE) is audio
+    assert resample_audio(np.zeros(0, dtype=np.float32), 48_000, TARGET_RATE).size == 0
+
+
+@pytest.mark.parametrize("source_rate", [8_000, 22_050, 44_100, 48_000])
+def test_output_length_and_tone_are_preserved(source_rate: int) -> None:
+    samples = source_rate + 123
+    resampled = resample_audio(tone(440, source_rate, samples), source_rate, TARGET_RATE)
+
+    assert resampled.dtype == np.float32
+    assert resampled.shape[0] == math.ceil(samples * TARGET_RATE / source_rate)
+    expected = tone(440, TARGET_RATE, resampled.shape[0])
+    assert np.abs(resampled - expected)[EDGE:-EDGE].max() < 1e-3
+
+
+@pytest.mark.parametrize("frequency", [9_000, 12_000])
+def test_content_above_target_nyquist_is_filtered(frequency: int) -> None:
+    resampled = resample_audio(tone(frequency, 48_000, 48_000), 48_000, TARGET_RATE)
+    assert np.sqrt(np.mean(np.square(resampled[EDGE:-EDGE]))) < 1e-3
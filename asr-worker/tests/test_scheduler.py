@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from asr_worker.admission import AdmissionTicket, DeadlineExceeded, begin_admission, end_admission
+from asr_worker.scheduler import BatchScheduler
+
+
+class GatedRunner:
+    """Records each batch and holds the first one until ``release`` so later jobs queue up."""
+
+    def __init__(self) -> None:
+        self.batches: list[tuple[str, int, list[int]]] = []
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def __call__(self, model_name: str, _replica: int, audios: list[np.ndarray], sample_rate: int) -> list[str]:
+        self.batches.append((model_name, sample_rate, [audio.shape[0] for audio in audios]))
+        self.started.set()
+        self.gate.wait(5)
+        return [f"{model_name}:{audio.shape[0]}" for audio in audios]
+
+    def release(self) -> None:
+        self.gate.set()
+
+
+def audio(samples: int) -> np.ndarray:
+    return np.zeros(samples, dtype=np.float32)
+
+
+def submit(scheduler: BatchScheduler, samples: int, sample_rate: int = 16_000) -> Future[str]:
+    return scheduler.submit("m", audio(samples), sample_rate)
+
+
+def submit_as(scheduler: BatchScheduler, samples: int, priority: int, deadline: float | None = None) -> Future[str]:
+    token = begin_admission(AdmissionTicket(priority=priority, deadline=deadline))
+    try:
+        return submit(scheduler, samples)
+    finally:
+        end_admission(token)
+
+
+def block_lane(scheduler: BatchScheduler, runner: GatedRunner) -> Future[str]:
+    first = submit(scheduler, 1)
+    assert runner.started.wait(5)
+    return first
+
+
+def test_queued_jobs_run_as_batches_up_to_the_limit() -> None:
+    runner = GatedRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=3, max_wait_seconds=0.0)
+    first = block_lane(scheduler, runner)
+    queued = [submit(scheduler, samples) for samples in range(2, 7)]
+    runner.release()
+
+    assert first.result(5) == "m:1"
+    assert [future.result(5) for future in queued] == [f"m:{samples}" for samples in range(2, 7)]
+    assert [sizes for _, _, sizes in runner.batches] == [[1], [2, 3, 4], [5, 6]]
+    stats = scheduler.stats()
+    assert (stats["batches"], stats["requests"], stats["largestBatchSize"]) == (3, 6, 3)
+
+
+def test_batches_never_mix_sample_rates() -> None:
+    runner = GatedRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=8, max_wait_seconds=0.0)
+    block_lane(scheduler, runner)
+    futures = [submit(scheduler, 2), submit(scheduler, 3, sample_rate=8_000), submit(scheduler, 4)]
+    runner.release()
+
+    assert [future.result(5) for future in futures] == ["m:2", "m:3", "m:4"]
+    assert [(rate, sizes) for _, rate, sizes in runner.batches[1:]] == [(16_000, [2, 4]), (8_000, [3])]
+
+
+def test_window_waits_for_company() -> None:
+    runner = GatedRunner()
+    runner.release()
+    scheduler = BatchScheduler(runner, max_batch_size=4, max_wait_seconds=0.2)
+    futures = [submit(scheduler, samples) for samples in (1, 2)]
+
+    assert [future.result(5) for future in futures] == ["m:1", "m:2"]
+    assert [sizes for _, _, sizes in runner.batches] == [[1, 2]]
+
+
+def test_models_run_on_separate_lanes() -> None:
+    runner = GatedRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=1, max_wait_seconds=0.0)
+    blocked = block_lane(scheduler, runner)
+    other = scheduler.submit("other", audio(5), 16_000)
+
+    # "m" is stuck behind the gate; "other" must still get a lane of its own.
+    deadline = time.monotonic() + 5
+    while len(runner.batches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [model for model, _, _ in runner.batches] == ["m", "other"]
+    runner.release()
+    assert blocked.result(5) == "m:1"
+    assert other.result(5) == "other:5"
+
+
+def test_batch_failure_reaches_every_job() -> None:
+    def fail(_model: str, _replica: int, _audios: list[np.ndarray], _rate: int) -> list[str]:
+        raise RuntimeError("boom")
+
+    scheduler = BatchScheduler(fail, max_batch_size=4, max_wait_seconds=0.05)
+    futures = [submit(scheduler, samples) for samples in (1, 2)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(5)
+
+
+def test_higher_priority_jobs_are_batched_first() -> None:
+    runner = GatedRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=2, max_wait_seconds=0.0)
+    block_lane(scheduler, runner)
+    futures = [submit_as(scheduler, samples, priority) for samples, priority in ((2, 2), (3, 0), (4, 1), (5, 0))]
+    runner.release()
+
+    assert [future.result(5) for future in futures] == ["m:2", "m:3", "m:4", "m:5"]
+    assert [sizes for _, _, sizes in runner.batches[1:]] == [[3, 5], [4, 2]]
+
+
+def test_jobs_past_their_deadline_are_dropped_before_inference() -> None:
+    runner = GatedRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=4, max_wait_seconds=0.0)
+    block_lane(scheduler, runner)
+    expired = submit_as(scheduler, 2, priority=1, deadline=time.monotonic() + 0.05)
+    live = submit_as(scheduler, 3, priority=1, deadline=time.monotonic() + 30)
+    time.sleep(0.1)
+    runner.release()
+
+    with pytest.raises(DeadlineExceeded):
+        expired.result(5)
+    assert live.result(5) == "m:3"
+    assert [sizes for _, _, sizes in runner.batches[1:]] == [[3]]
+    assert scheduler.stats()["expired"] == 1
+
+
+def test_windows_keep_at_most_max_outstanding_queued() -> None:
+    runner = GatedRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=8, max_wait_seconds=0.0)
+    block_lane(scheduler, runner)
+    futures = scheduler.submit_windows("m", [audio(samples) for samples in range(2, 7)], 16_000, 2)
+
+    assert scheduler.stats()["queueDepth"] == 2
+    runner.release()
+    assert [future.result(5) for future in futures] == [f"m:{samples}" for samples in range(2, 7)]
+    assert all(len(sizes) <= 2 for _, _, sizes in runner.batches)
+    assert sorted(size for _, _, sizes in runner.batches[1:] for size in sizes) == [2, 3, 4, 5, 6]
+
+
+def test_windows_after_a_failure_are_never_run() -> None:
+    ran: list[int] = []
+
+    def fail_on_third(_model: str, _replica: int, audios: list[np.ndarray], _rate: int) -> list[str]:
+        ran.extend(audio.shape[0] for audio in audios)
+        if any(audio.shape[0] == 3 for audio in audios):
+            raise RuntimeError("boom")
+        return ["ok" for _ in audios]
+
+    scheduler = BatchScheduler(fail_on_third, max_batch_size=1, max_wait_seconds=0.0)
+    futures = scheduler.submit_windows("m", [audio(samples) for samples in range(1, 7)], 16_000, 1)
+
+    assert [future.result(5) for future in futures[:2]] == ["ok", "ok"]
+    for future in futures[2:]:
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(5)
+    assert ran == [1, 2, 3]
+
+
+def test_windows_keep_the_request_priority() -> None:
+    runner = GatedRunner()
+    scheduler = BatchScheduler(runner, max_batch_size=1, max_wait_seconds=0.0)
+    block_lane(scheduler, runner)
+    token = begin_admission(AdmissionTicket(priority=0, deadline=None))
+    try:
+        windows = scheduler.submit_windows("m", [audio(2), audio(3)], 16_000, 1)
+    finally:
+        end_admission(token)
+    other = submit_as(scheduler, 9, priority=1)
+    runner.release()
+
+    assert [future.result(5) for future in windows] == ["m:2", "m:3"]
+    assert other.result(5) == "m:9"
+    # The second window is queued from a lane thread but still outranks the priority-1 job.
+    assert [sizes for _, _, sizes in runner.batches[1:]] == [[2], [3], [9]]
+
+
+def test_replicas_run_batches_of_one_model_concurrently() -> None:
+    both_running = threading.Barrier(2, timeout=5)
+    replicas: list[int] = []
+
+    def run(model_name: str, replica: int, audios: list[np.ndarray], _rate: int) -> list[str]:
+        replicas.append(replica)
+        # Breaks (and fails both jobs) unless the two batches are in flight at the same time.
+        both_running.wait()
+        return [f"{model_name}#{replica}" for _ in audios]
+
+    scheduler = BatchScheduler(run, max_batch_size=1, max_wait_seconds=0.0, replicas=2)
+    futures = [submit(scheduler, 1), submit(scheduler, 2)]
+
+    assert sorted(future.result(5) for future in futures) == ["m#0", "m#1"]
+    assert sorted(replicas) == [0, 1]
+    assert scheduler.stats()["replicasPerModel"] == 2
+
+
+def test_shared_lock_serializes_replicas() -> None:
+    running = 0
+    most_running = 0
+    counter_lock = threading.Lock()
+
+    def run(_model: str, _replica: int, audios: list[np.ndarray], _rate: int) -> list[str]:
+        nonlocal running, most_running
+        with counter_lock:
+            running += 1
+            most_running = max(most_running, running)
+        time.sleep(0.02)
+        with counter_lock:
+            running -= 1
+        return ["ok" for _ in audios]
+
+    scheduler = BatchScheduler(run, max_batch_size=1, max_wait_seconds=0.0, replicas=3, shared_lock=threading.Lock())
+    futures = [submit(scheduler, samples) for samples in range(1, 7)]
+
+    assert [future.result(5) for future in futures] == ["ok"] * 6
+    assert most_running == 1
+    assert scheduler.stats()["serialized"] is True
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import io
+import json
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from asr_worker.snapshot import SNAPSHOT_MARKER, build_snapshot, has_snapshot, snapshot_path
+
+
+class ArchivingModel:
+    """Writes a ``.nemo``-style tar the way ``ModelPT.save_to`` does, or fails after a partial write."""
+
+    def __init__(self, weights: bytes = b"weights", fail: bool = False) -> None:
+        self.weights = weights
+        self.fail = fail
+
+    def save_to(self, path: str) -> None:
+        with tarfile.open(path, "w:gz") as tar:
+            for name, payload in (("model_config.yaml", b"sample_rate: 16000\n"), ("model_weights.ckpt", self.weights)):
+                info = tarfile.TarInfo(f"./{name}")
+                info.size = len(payload)
+                tar.addfile(info, io.BytesIO(payload))
+            if self.fail:
+                raise RuntimeError("disk full")
+
+
+def test_snapshot_path_is_a_single_safe_directory(tmp_path: Path) -> None:
+    path = snapshot_path(tmp_path, " nvidia/parakeet-tdt-0.6b-v2 ")
+
+    assert path.parent == tmp_path
+    assert path.name == "nvidia__parakeet-tdt-0.6b-v2"
+    assert snapshot_path(tmp_path, "../../etc").parent == tmp_path
+
+
+def test_build_snapshot_extracts_the_archive(tmp_path: Path) -> None:
+    target = build_snapshot(ArchivingModel(), tmp_path, "nvidia/model")
+
+    assert target == snapshot_path(tmp_path, "nvidia/model")
+    assert has_snapshot(tmp_path, "nvidia/model")
+    assert (target / "model_weights.ckpt").read_bytes() == b"weights"
+    assert json.loads((target / SNAPSHOT_MARKER).read_text(encoding="utf-8"))["model"] == "nvidia/model"
+    # Only the snapshot itself is left; the archive and staging directory are gone.
+    assert [path.name for path in tmp_path.iterdir()] == [target.name]
+
+
+def test_rebuilding_replaces_the_previous_snapshot(tmp_path: Path) -> None:
+    build_snapshot(ArchivingModel(b"old"), tmp_path, "m")
+    (snapshot_path(tmp_path, "m") / "stale.bin").write_bytes(b"x")
+
+    target = build_snapshot(ArchivingModel(b"new"), tmp_path, "m")
+
+    assert (target / "model_weights.ckpt").read_bytes() == b"new"
+    assert not (target / "stale.bin").exists()
+
+
+def test_failed_build_keeps_the_previous_snapshot(tmp_path: Path) -> None:
+    build_snapshot(ArchivingModel(b"old"), tmp_path, "m")
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        build_snapshot(ArchivingModel(b"new", fail=True), tmp_path, "m")
+
+    assert (snapshot_path(tmp_path, "m") / "model_weights.ckpt").read_bytes() == b"old"
+    assert [path.name for path in tmp_path.iterdir()] == ["m"]
+
+
+def test_directory_without_marker_is_not_a_snapshot(tmp_path: Path) -> None:
+    snapshot_path(tmp_path, "m").mkdir()
+
+    assert not has_snapshot(tmp_path, "m")
+    assert not has_snapshot(tmp_path, "missing")
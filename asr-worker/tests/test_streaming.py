@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fakes import FakeAsrModel, wav_request
+from starlette.websockets import WebSocketDisconnect
+
+from asr_worker.app import DEFAULT_MODEL_SAMPLE_RATE
+from asr_worker.streaming import StreamingTranscriber
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+def tone(seconds: float) -> np.ndarray:
+    samples = np.arange(int(seconds * DEFAULT_MODEL_SAMPLE_RATE))
+    return (0.2 * np.sin(samples / 5)).astype(np.float32)
+
+
+def receive_until_done(ws) -> list[dict]:
+    messages = []
+    while True:
+        message = ws.receive_json()
+        messages.append(message)
+        if message["type"] in ("final", "error"):
+            return messages
+
+
+def test_pcm_stream_transcribes_every_sample(make_client) -> None:
+    client = make_client(FakeAsrModel(), stream_window_seconds=2.0)
+    pcm = (tone(5.0) * 32767).astype("<i2").tobytes()
+    with client.websocket_connect("/v1/asr/stream?language=en&encoding=pcm_s16le") as ws:
+        # Odd frame sizes split samples across frames.
+        for start in range(0, len(pcm), 3201):
+            ws.send_bytes(pcm[start : start + 3201])
+        ws.send_text(json.dumps({"type": "end"}))
+        final = receive_until_done(ws)[-1]
+
+    assert final["type"] == "final"
+    assert final["audioSeconds"] == 5.0
+    transcribed = sum(int(part) for part in final["text"].split() if part.isdigit())
+    assert transcribed == 5 * DEFAULT_MODEL_SAMPLE_RATE
+
+
+def test_pcm_stream_over_max_seconds_is_rejected(make_client) -> None:
+    client = make_client(FakeAsrModel(), stream_max_seconds=1.0)
+    with client.websocket_connect("/v1/asr/stream?language=en&encoding=pcm_f32le") as ws:
+        ws.send_bytes(tone(1.5).tobytes())
+        message = ws.receive_json()
+        closed = ws.receive()
+
+    assert message == {"type": "error", "status": 413, "detail": "Stream exceeds ASR_STREAM_MAX_SECONDS"}
+    assert closed["code"] == 1009
+
+
+@requires_ffmpeg
+def test_webm_stream_is_decoded_incrementally(make_client, tmp_path: Path) -> None:
+    source = tmp_path / "tone.f32"
+    source.write_bytes(tone(6.0).tobytes())
+    webm = tmp_path / "tone.webm"
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-f", "f32le", "-ar", "16000", "-ac", "1", "-i", str(source), str(webm)],
+        check=True,
+    )
+    data = webm.read_bytes()
+
+    client = make_client(FakeAsrModel(), stream_window_seconds=2.0)
+    with client.websocket_connect("/v1/asr/stream?language=ja&encoding=opus&mimeType=audio/webm") as ws:
+        for start in range(0, len(data), 1000):
+            ws.send_bytes(data[start : start + 1000])
+        ws.send_text("end")
+        final = receive_until_done(ws)[-1]
+
+    assert final["type"] == "final"
+    assert final["audioSeconds"] == pytest.approx(6.0, abs=0.05)
+
+
+@requires_ffmpeg
+def test_webm_stream_bytes_are_capped(make_client) -> None:
+    # 0.01 s of ASR_STREAM_MAX_SECONDS allows 640 encoded bytes.
+    client = make_client(FakeAsrModel(), stream_max_seconds=0.01)
+    with client.websocket_connect("/v1/asr/stream?encoding=opus") as ws:
+        ws.send_bytes(b"\x1a\x45\xdf\xa3" + bytes(1000))
+        message = ws.receive_json()
+
+    assert message["status"] == 413
+
+
+@requires_ffmpeg
+def test_empty_webm_stream_is_a_client_error(make_client) -> None:
+    client = make_client(FakeAsrModel())
+    with client.websocket_connect("/v1/asr/stream?encoding=opus") as ws:
+        ws.send_text("end")
+        message = ws.receive_json()
+        closed = ws.receive()
+
+    assert message["status"] == 400
+    assert closed["code"] == 1008
+
+
+def test_streams_count_against_the_in_flight_limit(make_client) -> None:
+    client = make_client(FakeAsrModel(), queue_max_depth=1)
+    with client.websocket_connect("/v1/asr/stream?language=en&encoding=pcm_f32le") as ws:
+        assert client.get("/health").json()["admission"]["inFlight"] == 1
+        with pytest.raises(WebSocketDisconnect) as rejected:
+            with client.websocket_connect("/v1/asr/stream?language=en&encoding=pcm_f32le"):
+                pass
+        assert rejected.value.code == 1013
+        assert client.post("/v1/asr/en", json=wav_request()).status_code == 429
+        ws.send_bytes(tone(0.5).tobytes())
+        ws.send_text("end")
+        assert receive_until_done(ws)[-1]["type"] == "final"
+
+    assert client.get("/health").json()["admission"]["inFlight"] == 0
+
+
+def test_stream_with_an_expired_deadline_is_refused(make_client) -> None:
+    model = FakeAsrModel()
+    client = make_client(model)
+    expired = str(int(time.time() * 1000) - 1000)
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect("/v1/asr/stream?language=en", headers={"x-request-deadline": expired}):
+            pass
+    assert rejected.value.code == 1008
+    assert client.get("/health").json()["admission"]["rejected"]["deadline"] == 1
+
+
+def test_stream_past_its_deadline_gets_an_error_frame(make_client) -> None:
+    model = FakeAsrModel()
+    client = make_client(model)
+    deadline = str(int(time.time() * 1000) + 200)
+    with client.websocket_connect("/v1/asr/stream?language=en", headers={"x-request-deadline": deadline}) as ws:
+        time.sleep(0.3)
+        ws.send_bytes((tone(0.5) * 32767).astype("<i2").tobytes())
+        ws.send_text("end")
+        message = ws.receive_json()
+        closed = ws.receive()
+
+    assert message["type"] == "error" and message["status"] == 504
+    assert closed["code"] == 1011
+    assert model.batches == []
+    assert client.get("/health").json()["admission"]["inFlight"] == 0
+
+
+def test_unexpected_stream_failure_gets_an_error_frame(make_client, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def broken_final(_self: StreamingTranscriber) -> str:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(StreamingTranscriber, "final", broken_final)
+    client = make_client(FakeAsrModel())
+    with client.websocket_connect("/v1/asr/stream?language=en") as ws:
+        ws.send_bytes((tone(0.5) * 32767).astype("<i2").tobytes())
+        ws.send_text("end")
+        message = ws.receive_json()
+        closed = ws.receive()
+
+    assert message == {"type": "error", "status": 500, "detail": "ASR transcription failed: boom"}
+    assert closed["code"] == 1011
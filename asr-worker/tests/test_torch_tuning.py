@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from fakes import FakeAsrModel, worker_settings
+
+from asr_worker.app import ModelRegistry
+from asr_worker.torch_tuning import configure_torch_threads, inference_context, quantize_encoder_int8
+
+torch = pytest.importorskip("torch")
+
+
+class TinyAsrModel(torch.nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.encoder = torch.nn.Sequential(torch.nn.Linear(16, 16), torch.nn.ReLU(), torch.nn.Linear(16, 4))
+        self.decoder = torch.nn.Linear(4, 4)
+
+
+@pytest.fixture
+def restore_threads() -> Iterator[None]:
+    threads = torch.get_num_threads()
+    yield
+    torch.set_num_threads(threads)
+
+
+def test_configure_torch_threads_applies_intra_op_threads(restore_threads: None) -> None:
+    reported = configure_torch_threads(1, 0)
+
+    assert reported["intraOp"] == torch.get_num_threads() == 1
+    assert reported["interOp"] == torch.get_num_interop_threads()
+
+
+def test_zero_keeps_the_current_pools(restore_threads: None) -> None:
+    torch.set_num_threads(2)
+
+    assert configure_torch_threads(0, 0) == {"intraOp": 2, "interOp": torch.get_num_interop_threads()}
+
+
+def test_late_inter_op_setting_is_logged_not_raised(
+    restore_threads: None, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    def refuse(_threads: int) -> None:
+        raise RuntimeError("Error: cannot set number of interop threads after parallel work has started")
+
+    monkeypatch.setattr(torch, "set_num_interop_threads", refuse)
+
+    with caplog.at_level(logging.WARNING, logger="asr_worker"):
+        reported = configure_torch_threads(0, 4)
+
+    assert reported["interOp"] == torch.get_num_interop_threads()
+    assert "could not set inter-op threads" in caplog.text
+
+
+def test_quantize_encoder_int8_swaps_only_encoder_linears() -> None:
+    model = TinyAsrModel().eval()
+    features = torch.randn(3, 16)
+    with torch.no_grad():
+        expected = model.encoder(features)
+
+    quantized = quantize_encoder_int8(model)
+
+    assert quantized is model
+    assert all(type(layer) is not torch.nn.Linear for layer in model.encoder if hasattr(layer, "weight"))
+    assert type(model.decoder) is torch.nn.Linear
+    with torch.no_grad():
+        actual = model.encoder(features)
+    assert torch.allclose(actual, expected, atol=0.05)
+
+
+def test_quantize_requires_an_encoder() -> None:
+    with pytest.raises(ValueError, match="no encoder"):
+        quantize_encoder_int8(torch.nn.Linear(2, 2))
+
+
+def test_inference_context_disables_autograd() -> None:
+    weights = torch.ones(2, requires_grad=True)
+
+    with inference_context():
+        result = weights * 2
+
+    assert not result.requires_grad
+    assert torch.is_inference(result)
+
+
+def test_registry_quantizes_models_loaded_on_cpu() -> None:
+    registry = ModelRegistry(worker_settings(cpu_int8=True), loader=lambda _name, _location: TinyAsrModel())
+
+    model = registry.get("m")
+
+    assert type(model.encoder[0]) is not torch.nn.Linear
+    assert registry.stats()["cpuInt8Models"] == ["m"]
+
+
+def test_registry_keeps_fp32_when_quantization_fails(caplog: pytest.LogCaptureFixture) -> None:
+    def load(_model_name: str, _map_location: str) -> Any:
+        return FakeAsrModel()
+
+    registry = ModelRegistry(worker_settings(cpu_int8=True), loader=load)
+
+    with caplog.at_level(logging.WARNING, logger="asr_worker"):
+        registry.get("m")
+
+    assert registry.stats()["cpuInt8Models"] == []
+    assert "int8 quantization failed for m" in caplog.text
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+from fakes import FakeAsrModel, wav_request
+
+
+class PathOnlyModel(FakeAsrModel):
+    """NeMo 1.x style: files only, under the ``paths2audio_files`` name."""
+
+    def transcribe(self, paths2audio_files: list[str], batch_size: int = 1) -> list[str]:  # type: ignore[override]
+        audios = [sf.read(path, dtype="float32")[0] for path in paths2audio_files]
+        return super().transcribe(audios, batch_size)
+
+
+class PathsAsAudioModel(FakeAsrModel):
+    """Takes ``audio`` but opens every item as a file, like releases before array support."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def transcribe(self, audio: list[Any], batch_size: int = 1) -> list[str]:
+        self.calls.append(type(audio[0]).__name__)
+        if not isinstance(audio[0], str):
+            raise TypeError(f"expected str, bytes or os.PathLike object, not {type(audio[0]).__name__}")
+        return super().transcribe([sf.read(path, dtype="float32")[0] for path in audio], batch_size)
+
+
+class BuggyModel(FakeAsrModel):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail = True
+
+    def transcribe(self, audio: list[np.ndarray], batch_size: int = 1) -> list[str]:
+        assert isinstance(audio[0], np.ndarray), "expected in-memory audio"
+        if self.fail:
+            self.fail = False
+            raise TypeError("unsupported operand type(s) for +: 'int' and 'NoneType'")
+        return super().transcribe(audio, batch_size)
+
+
+def test_array_models_get_the_decoded_waveform(make_client) -> None:
+    client = make_client(FakeAsrModel())
+    response = client.post("/v1/asr/en", json=wav_request(seconds=0.5))
+
+    assert response.json()["text"] == "samples 8000"
+    assert client.get("/health").json()["fileTranscribeModels"] == []
+
+
+def test_path_only_signature_uses_files_without_trying_arrays(make_client) -> None:
+    client = make_client(PathOnlyModel())
+    response = client.post("/v1/asr/en", json=wav_request(seconds=0.5))
+
+    assert response.json()["text"] == "samples 8000"
+    health = client.get("/health").json()
+    assert health["fileTranscribeModels"] == [health["enModel"]]
+
+
+def test_array_type_rejection_falls_back_to_files_for_good(make_client) -> None:
+    model = PathsAsAudioModel()
+    client = make_client(model)
+    for _ in range(2):
+        assert client.post("/v1/asr/en", json=wav_request(seconds=0.5)).json()["text"] == "samples 8000"
+
+    assert model.calls == ["ndarray", "str", "str"]
+    health = client.get("/health").json()
+    assert health["fileTranscribeModels"] == [health["enModel"]]
+
+
+def test_other_type_errors_fail_the_request_without_downgrading(make_client) -> None:
+    client = make_client(BuggyModel())
+
+    failed = client.post("/v1/asr/en", json=wav_request(seconds=0.5))
+    assert failed.status_code == 500
+    assert "NoneType" in failed.json()["detail"]
+    assert client.post("/v1/asr/en", json=wav_request(seconds=0.5)).json()["text"] == "samples 8000"
+    assert client.get("/health").json()["fileTranscribeModels"] == []
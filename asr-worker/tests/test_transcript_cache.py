@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from asr_worker.transcript_cache import TranscriptCache, transcript_cache_key
+
+AUDIO = np.linspace(-0.5, 0.5, 1600, dtype=np.float32)
+CONFIG = {"vad": [-50.0, 12.0, 0.2, 0.0], "chunkSeconds": 0.0}
+
+
+def make_cache(**overrides) -> TranscriptCache:
+    options = {"max_entries": 8, "max_bytes": 1 << 20, "ttl_seconds": 0.0, **overrides}
+    return TranscriptCache(**options)
+
+
+def response(text: str) -> dict[str, str]:
+    return {"text": text}
+
+
+def test_key_covers_audio_endpoint_models_and_config() -> None:
+    base = transcript_cache_key(AUDIO, 16000, "en", ["m"], CONFIG)
+    assert base == transcript_cache_key(AUDIO.copy(), 16000, "en", ["m"], dict(reversed(CONFIG.items())))
+    variants = [
+        transcript_cache_key(AUDIO * 0.5, 16000, "en", ["m"], CONFIG),
+        transcript_cache_key(AUDIO, 8000, "en", ["m"], CONFIG),
+        transcript_cache_key(AUDIO, 16000, "ja", ["m"], CONFIG),
+        transcript_cache_key(AUDIO, 16000, "en", ["other"], CONFIG),
+        transcript_cache_key(AUDIO, 16000, "en", ["m"], {**CONFIG, "vad": [-40.0, 12.0, 0.2, 0.0]}),
+        transcript_cache_key(AUDIO, 16000, "en", ["m"], {**CONFIG, "chunkSeconds": 30.0}),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_hit_skips_compute() -> None:
+    cache = make_cache()
+    calls = []
+    compute = lambda: calls.append(1) or response("a")  # noqa: E731
+    assert cache.get_or_compute("k", compute) == response("a")
+    assert cache.get_or_compute("k", compute) == response("a")
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_evicts_least_recently_used_by_count() -> None:
+    cache = make_cache(max_entries=2)
+    cache.get_or_compute("a", lambda: response("a"))
+    cache.get_or_compute("b", lambda: response("b"))
+    cache.get_or_compute("a", lambda: response("unused"))
+    cache.get_or_compute("c", lambda: response("c"))
+    assert cache.get_or_compute("a", lambda: response("recomputed")) == response("a")
+    assert cache.get_or_compute("b", lambda: response("recomputed")) == response("recomputed")
+    assert cache.stats()["evictions"] == 2
+
+
+def test_evicts_by_bytes_and_skips_oversized() -> None:
+    cache = make_cache(max_bytes=64)
+    cache.get_or_compute("big", lambda: response("x" * 100))
+    assert cache.stats()["entries"] == 0
+    cache.get_or_compute("a", lambda: response("a" * 30))
+    cache.get_or_compute("b", lambda: response("b" * 30))
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["bytes"] <= 64
+
+
+def test_expired_entries_are_recomputed(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = make_cache(ttl_seconds=10.0)
+    now = [1000.0]
+    monkeypatch.setattr("asr_worker.transcript_cache.time.time", lambda: now[0])
+    cache.get_or_compute("k", lambda: response("old"))
+    now[0] += 11.0
+    assert cache.get_or_compute("k", lambda: response("new")) == response("new")
+
+
+def test_concurrent_requests_share_one_computation() -> None:
+    cache = make_cache()
+    started = threading.Event()
+    calls = []
+
+    def compute() -> dict[str, str]:
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return response("shared")
+
+    with ThreadPoolExecutor(4) as pool:
+        owner = pool.submit(cache.get_or_compute, "k", compute)
+        started.wait()
+        joiners = [pool.submit(cache.get_or_compute, "k", compute) for _ in range(3)]
+        results = [owner.result(), *(joiner.result() for joiner in joiners)]
+    assert results == [response("shared")] * 4
+    assert len(calls) == 1
+
+
+def test_owner_failure_is_not_shared_with_joiners() -> None:
+    cache = make_cache()
+    started = threading.Event()
+
+    def failing() -> dict[str, str]:
+        started.set()
+        time.sleep(0.2)
+        raise TimeoutError("owner deadline")
+
+    with ThreadPoolExecutor(2) as pool:
+        owner = pool.submit(cache.get_or_compute, "k", failing)
+        started.wait()
+        joiner = pool.submit(cache.get_or_compute, "k", lambda: response("own result"))
+        with pytest.raises(TimeoutError):
+            owner.result()
+        assert joiner.result() == response("own result")
+    assert cache.get_or_compute("k", lambda: response("unused")) == response("own result")
+    assert cache.stats()["inflight"] == 0
+
+
+def test_persisted_entries_survive_restart(tmp_path: Path) -> None:
+    make_cache(persist_dir=str(tmp_path)).get_or_compute("k", lambda: response("disk"))
+    restarted = make_cache(persist_dir=str(tmp_path))
+    assert restarted.get_or_compute("k", lambda: response("unused")) == response("disk")
+    assert restarted.stats()["diskHits"] == 1
+
+
+def test_disk_hits_keep_their_original_ttl(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [time.time()]
+    monkeypatch.setattr("asr_worker.transcript_cache.time.time", lambda: now[0])
+    make_cache(persist_dir=str(tmp_path), ttl_seconds=10.0).get_or_compute("k", lambda: response("disk"))
+    os.utime(tmp_path / "k.json", (now[0] - 8.0, now[0] - 8.0))
+
+    restarted = make_cache(persist_dir=str(tmp_path), ttl_seconds=10.0)
+    assert restarted.get_or_compute("k", lambda: response("unused")) == response("disk")
+    now[0] += 3.0
+    assert restarted.get_or_compute("k", lambda: response("new")) == response("new")
+
+
+def test_startup_prunes_expired_and_oldest_files(tmp_path: Path) -> None:
+    now = time.time()
+    for index, age in enumerate([7200, 300, 200, 100]):
+        path = tmp_path / f"{index}.json"
+        path.write_text('{"text": "' + "x" * 90 + '"}', encoding="utf-8")
+        os.utime(path, (now - age, now - age))
+
+    cache = make_cache(persist_dir=str(tmp_path), ttl_seconds=3600.0, max_disk_bytes=250)
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["2.json", "3.json"]
+    stats = cache.stats()
+    assert stats["diskBytes"] <= 250
+    assert stats["diskEvictions"] == 1
+
+
+def test_writes_keep_directory_under_cap(tmp_path: Path) -> None:
+    cache = make_cache(persist_dir=str(tmp_path), max_entries=1000, max_disk_bytes=2000)
+    for index in range(100):
+        cache.get_or_compute(f"k{index}", lambda index=index: response(f"{index:03d}" + "y" * 80))
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.json")) <= 2000
+    assert (tmp_path / "k99.json").exists()
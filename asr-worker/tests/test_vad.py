@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import base64
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fakes import FakeAsrModel
+
+from asr_worker.app import WorkerSettings
+from asr_worker.vad import FRAME_SECONDS, VadConfig, speech_frame_mask, trim_silence
+
+SAMPLE_RATE = 16_000
+
+
+def tone(seconds: float, frequency: float = 220.0, amplitude: float = 0.3) -> np.ndarray:
+    samples = np.arange(int(seconds * SAMPLE_RATE))
+    return (amplitude * np.sin(2 * np.pi * frequency * samples / SAMPLE_RATE)).astype(np.float32)
+
+
+def noise(seconds: float, amplitude: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (amplitude * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+
+
+def silent_wav_base64(seconds: float) -> str:
+    buffer = io.BytesIO()
+    sf.write(buffer, noise(seconds, 1e-4), SAMPLE_RATE, format="WAV")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def test_silence_and_room_noise_are_silent() -> None:
+    for audio in (np.zeros(2 * SAMPLE_RATE, dtype=np.float32), noise(2.0, 1e-4)):
+        result = trim_silence(audio, SAMPLE_RATE, VadConfig())
+        assert result.is_silent
+        assert result.audio.size == 0
+        assert result.speech_seconds == 0.0
+
+
+def test_leading_and_trailing_silence_is_trimmed_with_padding() -> None:
+    audio = np.concatenate([noise(1.0, 1e-4), tone(1.0), noise(1.0, 1e-4, seed=1)])
+    result = trim_silence(audio, SAMPLE_RATE, VadConfig(padding_seconds=0.2))
+
+    assert not result.is_silent
+    assert result.speech_seconds == 1.4
+    assert np.shares_memory(result.audio, audio)
+
+
+def test_long_pauses_are_shortened_only_when_configured() -> None:
+    audio = np.concatenate([tone(0.5), noise(2.0, 1e-4), tone(0.5)])
+
+    kept = trim_silence(audio, SAMPLE_RATE, VadConfig(padding_seconds=0.2))
+    shortened = trim_silence(audio, SAMPLE_RATE, VadConfig(padding_seconds=0.2, max_pause_seconds=0.4))
+
+    assert kept.speech_seconds == 3.0
+    assert shortened.speech_seconds == 1.8
+
+
+# Same energy, just under the voiced threshold: only the high zero-crossing segment is speech.
+QUIET_AMPLITUDE = 0.0035
+
+
+@pytest.mark.parametrize(
+    ("segment", "is_speech"),
+    [
+        (noise(0.3, QUIET_AMPLITUDE, seed=2), True),
+        (tone(0.3, 100.0, QUIET_AMPLITUDE * np.sqrt(2)), False),
+    ],
+    ids=["fricative", "hum"],
+)
+def test_quiet_fricatives_count_as_speech_but_hum_does_not(segment: np.ndarray, is_speech: bool) -> None:
+    audio = np.concatenate([noise(1.0, 1e-3), segment, tone(0.5), noise(1.0, 1e-3, seed=1)])
+    mask = speech_frame_mask(audio, SAMPLE_RATE, VadConfig())
+
+    segment_frames = mask[int(1.0 / FRAME_SECONDS) : int(1.3 / FRAME_SECONDS)]
+    assert segment_frames.all() if is_speech else not segment_frames.any()
+
+
+def test_vad_only_applies_to_opted_in_endpoints(make_client) -> None:
+    quiet = {"audioBase64": silent_wav_base64(1.0), "mimeType": "audio/wav"}
+    model = FakeAsrModel()
+    client = make_client(model, vad_endpoints="en")
+
+    trimmed = client.post("/v1/asr/en", json=quiet).json()
+    untouched = client.post("/v1/asr/ja", json=quiet).json()
+
+    assert (trimmed["text"], trimmed["speechSeconds"]) == ("", 0.0)
+    assert untouched["text"] == f"samples {SAMPLE_RATE}"
+    assert untouched["speechSeconds"] is None
+    assert model.batches == [1]
+
+
+def test_vad_is_off_by_default() -> None:
+    assert WorkerSettings.__dataclass_fields__["vad_endpoints"].default == ""
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from fakes import FakeAsrModel, wav_request, worker_settings
+from fastapi.testclient import TestClient
+
+from asr_worker.app import create_app
+from asr_worker.warmup import WARMUP_RETRY_AFTER_SECONDS, WorkerWarmup
+
+
+def test_steps_run_in_order_and_report_progress() -> None:
+    ran: list[str] = []
+    warmup = WorkerWarmup([("first", lambda: ran.append("first")), ("second", lambda: ran.append("second"))])
+    assert not warmup.ready
+    assert warmup.wait(5)
+
+    status = warmup.status()
+    assert ran == ["first", "second"]
+    assert (status["ready"], status["step"], status["error"]) == (True, "done", None)
+    assert list(status["completedSteps"]) == ["first", "second"]
+
+
+def test_failed_step_stops_warmup() -> None:
+    def broken() -> None:
+        raise RuntimeError("no weights")
+
+    ran: list[str] = []
+    warmup = WorkerWarmup([("load", broken), ("warm", lambda: ran.append("warm"))])
+    assert not warmup.wait(5)
+    assert warmup.failed and ran == []
+    assert warmup.not_ready_detail() == "ASR worker failed to start: load: no weights"
+
+
+def test_ready_is_503_with_retry_after_until_models_are_loaded() -> None:
+    release = threading.Event()
+
+    def slow_loader(_name: str, _location: str) -> Any:
+        release.wait(5)
+        return FakeAsrModel()
+
+    app = create_app(worker_settings(preload_models=True), model_loader=slow_loader)
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 5
+        while not app.state.warmup.status()["step"].startswith("load ") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        ready = client.get("/ready")
+        assert ready.status_code == 503
+        assert ready.headers["Retry-After"] == str(WARMUP_RETRY_AFTER_SECONDS)
+        assert ready.json()["step"].startswith("load ")
+        blocked = client.post("/v1/asr/en", json=wav_request())
+        assert blocked.status_code == 503 and blocked.headers["Retry-After"]
+        health = client.get("/health")
+        assert health.status_code == 200 and health.json()["warmup"]["ready"] is False
+
+        release.set()
+        assert app.state.warmup.wait(5)
+        assert client.get("/ready").status_code == 200
+        assert client.post("/v1/asr/en", json=wav_request()).status_code == 200
+
+
+def test_failed_warmup_is_503_without_retry_after() -> None:
+    def broken_loader(_name: str, _location: str) -> Any:
+        raise RuntimeError("no weights")
+
+    app = create_app(worker_settings(preload_models=True), model_loader=broken_loader)
+    with TestClient(app) as client:
+        assert not app.state.warmup.wait(5)
+        ready = client.get("/ready")
+        assert ready.status_code == 503
+        assert "Retry-After" not in ready.headers
+        assert "failed to start" in ready.json()["detail"]
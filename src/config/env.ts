@@ -54,6 +54,7 @@ const envSchema = z.object({
   ASR_JA_URL: optionalUrlFromEnv,
   ASR_EN_URL: optionalUrlFromEnv,
   ASR_MIXED_URL: optionalUrlFromEnv,
+  ASR_AUTO_URL: optionalUrlFromEnv,
   ASR_MODEL_FAST: z.string().default("nvidia/parakeet-tdt-0.6b-v2"),
   ASR_MODEL_JA: z.string().default("nvidia/parakeet-tdt_ctc-0.6b-ja"),
   ASR_MODEL_EN: z.string().default("nvidia/parakeet-tdt-0.6b-v2"),
@@ -61,6 +62,7 @@ const envSchema = z.object({
   ASR_LANGUAGE_THRESHOLD: z.coerce.number().min(0).max(1).default(0.75),
   ASR_SKIP_FAST_WHEN_HINTED: booleanWithDefaultFromEnv(true),
   ASR_SKIP_REDUNDANT_DECODE: booleanWithDefaultFromEnv(true),
+  ASR_BINARY_UPLOAD: booleanWithDefaultFromEnv(false),
   MIC_MAX_RECORDING_MS: z.coerce.number().int().positive().default(35000),
   ASR_FAST_TIMEOUT_MS: z.coerce.number().int().positive().default(15000),
   ASR_DECODE_TIMEOUT_MS: z.coerce.number().int().positive().default(60000),
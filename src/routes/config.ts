@@ -25,7 +25,8 @@ export function createConfigRouter(context: AppContext): Router {
         context.env.ASR_FAST_URL ||
           context.env.ASR_JA_URL ||
           context.env.ASR_EN_URL ||
-          context.env.ASR_MIXED_URL
+          context.env.ASR_MIXED_URL ||
+          context.env.ASR_AUTO_URL
       ),
       micMaxRecordingMs: context.env.MIC_MAX_RECORDING_MS,
       ttsEnabled:
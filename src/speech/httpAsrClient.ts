@@ -16,6 +16,7 @@ const asrResponseSchema = z
     transcript: z.string().optional(),
     language: z.enum(["ja", "en", "mixed", "unknown"]).optional(),
     clipped: z.boolean().optional(),
+    route: z.enum(["ja", "en", "mixed"]).nullable().optional(),
     audioSeconds: z.number().min(0).optional(),
     jaConfidence: z.number().min(0).max(1).optional(),
     enConfidence: z.number().min(0).max(1).optional(),
@@ -28,11 +29,19 @@ const asrResponseSchema = z
   })
   .passthrough();
 
+interface AsrUpload {
+  audioBase64: string;
+  mimeType: string;
+  // A plain ArrayBuffer-backed view: fetch's BodyInit rejects Buffer<ArrayBufferLike> under TS 5.7+.
+  audioBytes: Uint8Array<ArrayBuffer> | null;
+}
+
 interface NormalizedAsrResponse {
   text: string;
   language: SpeechLanguage;
   confidence: LanguageConfidence;
   clipped: boolean;
+  route: AsrRoute | null;
 }
 
 export class HttpAsrClient implements AsrClient {
@@ -40,14 +49,23 @@ export class HttpAsrClient implements AsrClient {
 
   async transcribeWithRouting(input: AsrRoutingInput): Promise<AsrTranscriptionResult> {
     const hintedRoute = routeFromHint(input.languageHint);
-    const fast = await this.fastDecode(input, hintedRoute);
+    const upload: AsrUpload = {
+      audioBase64: input.audioBase64,
+      mimeType: input.mimeType,
+      audioBytes: this.env.ASR_BINARY_UPLOAD ? new Uint8Array(Buffer.from(input.audioBase64, "base64")) : null
+    };
+    if (!hintedRoute && this.env.ASR_AUTO_URL) {
+      return this.autoDecode(this.env.ASR_AUTO_URL, upload);
+    }
+
+    const fast = await this.fastDecode(input, upload, hintedRoute);
     const route = selectRoute({
       confidence: fast.confidence,
       threshold: this.env.ASR_LANGUAGE_THRESHOLD,
       routeHint: hintedRoute
     });
 
-    const detailed = await this.detailedDecode(route, input, fast);
+    const detailed = await this.detailedDecode(route, upload, fast);
     const language = resolveLanguage(detailed.text, detailed.language, route);
 
     return {
@@ -58,13 +76,40 @@ export class HttpAsrClient implements AsrClient {
     };
   }
 
-  private async fastDecode(input: AsrRoutingInput, routeHint: AsrRoute | null): Promise<NormalizedAsrResponse> {
+  private async autoDecode(url: string, upload: AsrUpload): Promise<AsrTranscriptionResult> {
+    const raw = await postAudio(url, upload, this.env.ASR_MODEL_FAST, this.env.ASR_DECODE_TIMEOUT_MS);
+    const decoded = normalizeAsrResponse(raw);
+    if (!decoded.text.trim()) {
+      throw new Error("ASR returned an empty transcript");
+    }
+
+    const route =
+      decoded.route ??
+      selectRoute({
+        confidence: decoded.confidence,
+        threshold: this.env.ASR_LANGUAGE_THRESHOLD,
+        routeHint: null
+      });
+    return {
+      text: decoded.text,
+      language: resolveLanguage(decoded.text, decoded.language, route),
+      route,
+      languageConfidence: decoded.confidence
+    };
+  }
+
+  private async fastDecode(
+    input: AsrRoutingInput,
+    upload: AsrUpload,
+    routeHint: AsrRoute | null
+  ): Promise<NormalizedAsrResponse> {
     if (routeHint && routeHint !== "mixed" && this.env.ASR_SKIP_FAST_WHEN_HINTED) {
       return {
         text: "",
         language: routeHint,
         confidence: confidenceFromLanguage(routeHint),
-        clipped: false
+        clipped: false,
+        route: null
       };
     }
 
@@ -73,23 +118,18 @@ export class HttpAsrClient implements AsrClient {
         text: "",
         language: input.languageHint ?? "unknown",
         confidence: confidenceFromLanguage(input.languageHint ?? "unknown"),
-        clipped: false
+        clipped: false,
+        route: null
       };
     }
 
-    const payload = {
-      audioBase64: input.audioBase64,
-      mimeType: input.mimeType,
-      model: this.env.ASR_MODEL_FAST
-    };
-
-    const raw = await postJson(this.env.ASR_FAST_URL, payload, this.env.ASR_FAST_TIMEOUT_MS);
+    const raw = await postAudio(this.env.ASR_FAST_URL, upload, this.env.ASR_MODEL_FAST, this.env.ASR_FAST_TIMEOUT_MS);
     return normalizeAsrResponse(raw);
   }
 
   private async detailedDecode(
     route: AsrRoute,
-    input: AsrRoutingInput,
+    upload: AsrUpload,
     fast: NormalizedAsrResponse
   ): Promise<NormalizedAsrResponse> {
     const endpointByRoute: Record<AsrRoute, string | undefined> = {
@@ -116,12 +156,7 @@ export class HttpAsrClient implements AsrClient {
       throw new Error(`ASR endpoint for route '${route}' is not configured`);
     }
 
-    const payload = {
-      audioBase64: input.audioBase64,
-      mimeType: input.mimeType,
-      model: modelByRoute[route]
-    };
-    const raw = await postJson(endpoint, payload, this.env.ASR_DECODE_TIMEOUT_MS);
+    const raw = await postAudio(endpoint, upload, modelByRoute[route], this.env.ASR_DECODE_TIMEOUT_MS);
     const decoded = normalizeAsrResponse(raw);
 
     if (!decoded.text.trim() && fast.text.trim()) {
@@ -214,7 +249,8 @@ function normalizeAsrResponse(payload: unknown): NormalizedAsrResponse {
     text,
     language,
     confidence,
-    clipped: data.clipped ?? true
+    clipped: data.clipped ?? true,
+    route: data.route ?? null
   };
 }
 
@@ -231,7 +267,49 @@ function confidenceFromLanguage(language: SpeechLanguage): LanguageConfidence {
   return { ja: 0.5, en: 0.5 };
 }
 
-async function postJson(url: string, body: unknown, timeoutMs: number): Promise<unknown> {
+async function postAudio(url: string, upload: AsrUpload, model: string, timeoutMs: number): Promise<unknown> {
+  if (upload.audioBytes) {
+    return postAsr(
+      rawEndpointUrl(url),
+      {
+        headers: {
+          "content-type": "application/octet-stream",
+          "x-audio-mime-type": upload.mimeType,
+          "x-asr-model": model
+        },
+        body: upload.audioBytes
+      },
+      timeoutMs
+    );
+  }
+
+  return postAsr(
+    url,
+    {
+      headers: {
+        "content-type": "application/json"
+      },
+      body: JSON.stringify({
+        audioBase64: upload.audioBase64,
+        mimeType: upload.mimeType,
+        model
+      })
+    },
+    timeoutMs
+  );
+}
+
+function rawEndpointUrl(url: string): string {
+  const parsed = new URL(url);
+  parsed.pathname = `${parsed.pathname.replace(/\/+$/, "")}/raw`;
+  return parsed.toString();
+}
+
+async function postAsr(
+  url: string,
+  request: { headers: Record<string, string>; body: string | Uint8Array<ArrayBuffer> },
+  timeoutMs: number
+): Promise<unknown> {
   const controller = new AbortController();
   const timer = setTimeout(() => controller.abort(), timeoutMs);
 
@@ -240,10 +318,9 @@ async function postJson(url: string, body: unknown, timeoutMs: number): Promise<
     try {
       response = await fetch(url, {
         method: "POST",
-        headers: {
-          "content-type": "application/json"
-        },
-        body: JSON.stringify(body),
+        // Lets the worker skip inference whose result would arrive after this request gave up.
+        headers: { ...request.headers, "x-request-deadline": String(Date.now() + timeoutMs) },
+        body: request.body,
         signal: controller.signal
       });
     } catch (error) {
@@ -154,4 +154,80 @@ describe("HttpAsrClient", () => {
       expect.objectContaining({ method: "POST" })
     );
   });
+
+  it("posts raw audio bytes to the /raw endpoint when binary upload is enabled", async () => {
+    const fetchMock = vi.fn().mockResolvedValueOnce(
+      new Response(JSON.stringify({ text: "Markets rallied today.", language: "en" }), {
+        status: 200
+      })
+    );
+    vi.stubGlobal("fetch", fetchMock);
+
+    const env = loadEnv({
+      ASR_JA_URL: "http://127.0.0.1:9205/v1/asr/ja",
+      ASR_EN_URL: "http://127.0.0.1:9205/v1/asr/en",
+      ASR_MIXED_URL: "http://127.0.0.1:9205/v1/asr/mixed",
+      ASR_SKIP_FAST_WHEN_HINTED: "true",
+      ASR_BINARY_UPLOAD: "true"
+    });
+
+    const audio = Buffer.from("binary-audio-payload-0123456789");
+    const client = new HttpAsrClient(env);
+    const result = await client.transcribeWithRouting({
+      audioBase64: audio.toString("base64"),
+      mimeType: "audio/webm",
+      languageHint: "en"
+    });
+
+    expect(result.text).toBe("Markets rallied today.");
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    const [url, init] = fetchMock.mock.calls[0] as [string, RequestInit];
+    expect(url).toBe("http://127.0.0.1:9205/v1/asr/en/raw");
+    expect(init.headers).toMatchObject({
+      "content-type": "application/octet-stream",
+      "x-audio-mime-type": "audio/webm",
+      "x-asr-model": "nvidia/parakeet-tdt-0.6b-v2"
+    });
+    expect(Buffer.from(init.body as Uint8Array).equals(audio)).toBe(true);
+    const deadline = Number((init.headers as Record<string, string>)["x-request-deadline"]);
+    expect(deadline).toBeGreaterThan(Date.now());
+  });
+
+  it("uses the server-side auto route in one request when no hint is set", async () => {
+    const fetchMock = vi.fn().mockResolvedValueOnce(
+      new Response(
+        JSON.stringify({
+          text: "今日は晴れです",
+          language: "ja",
+          route: "ja",
+          languageConfidence: { ja: 0.9, en: 0.1 }
+        }),
+        { status: 200 }
+      )
+    );
+    vi.stubGlobal("fetch", fetchMock);
+
+    const env = loadEnv({
+      ASR_FAST_URL: "http://127.0.0.1:9206/v1/asr/fast",
+      ASR_JA_URL: "http://127.0.0.1:9206/v1/asr/ja",
+      ASR_EN_URL: "http://127.0.0.1:9206/v1/asr/en",
+      ASR_MIXED_URL: "http://127.0.0.1:9206/v1/asr/mixed",
+      ASR_AUTO_URL: "http://127.0.0.1:9206/v1/asr/auto"
+    });
+
+    const client = new HttpAsrClient(env);
+    const result = await client.transcribeWithRouting({
+      audioBase64: "AAAABBBBCCCCDDDDEEEEFFFF",
+      mimeType: "audio/webm"
+    });
+
+    expect(result.route).toBe("ja");
+    expect(result.language).toBe("ja");
+    expect(result.text).toBe("今日は晴れです");
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(fetchMock).toHaveBeenCalledWith(
+      "http://127.0.0.1:9206/v1/asr/auto",
+      expect.objectContaining({ method: "POST" })
+    );
+  });
 });
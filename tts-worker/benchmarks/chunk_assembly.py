@@ -0,0 +1,73 @@
+"""Micro-benchmark: assembling and encoding per-chunk Kokoro audio, old vs current approach."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+import soundfile as sf
+
+from tts_worker.kokoro_engine import KOKORO_SAMPLE_RATE
+from tts_worker.wav import encode_wav
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="tts-worker chunk assembly benchmark")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--chunk-seconds", type=float, default=2.5, help="audio length of each chunk")
+    parser.add_argument("--iterations", type=int, default=3)
+    return parser.parse_args()
+
+
+def append_assembly(pieces: list[np.ndarray]) -> bytes:
+    combined = pieces[0]
+    for audio in pieces[1:]:
+        combined = np.concatenate([combined, audio])
+    with io.BytesIO() as buffer:
+        sf.write(buffer, combined, KOKORO_SAMPLE_RATE, format="WAV", subtype="PCM_16")
+        return buffer.getvalue()
+
+
+def single_assembly(pieces: list[np.ndarray]) -> bytearray:
+    return encode_wav(pieces, KOKORO_SAMPLE_RATE)
+
+
+def measure(assemble: Callable[[list[np.ndarray]], bytes | bytearray], pieces, iterations: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(iterations):
+        started = time.perf_counter()
+        assemble(pieces)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    assemble(pieces)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    args = parse_args()
+    chunk_samples = int(args.chunk_seconds * KOKORO_SAMPLE_RATE)
+    rng = np.random.default_rng(0)
+    print(f"chunk={args.chunk_seconds:.1f}s ({chunk_samples} samples) iterations={args.iterations} (best of)")
+    print(f"{'chunks':>6} {'append ms':>10} {'single ms':>10} {'speedup':>8} {'append MiB':>11} {'single MiB':>11}")
+    for count in args.chunks:
+        pieces = [rng.uniform(-0.5, 0.5, chunk_samples).astype(np.float32) for _ in range(count)]
+        reference = np.frombuffer(append_assembly(pieces), dtype="<i2", offset=44).astype(np.int32)
+        encoded = np.frombuffer(single_assembly(pieces), dtype="<i2", offset=44).astype(np.int32)
+        if reference.shape != encoded.shape or np.abs(reference - encoded).max() > 1:
+            raise SystemExit(f"outputs differ by more than 1 LSB for {count} chunks")
+        append_seconds, append_peak = measure(append_assembly, pieces, args.iterations)
+        single_seconds, single_peak = measure(single_assembly, pieces, args.iterations)
+        print(
+            f"{count:>6} {append_seconds * 1000:10.1f} {single_seconds * 1000:10.1f} "
+            f"{append_seconds / single_seconds:7.1f}x {append_peak / 2**20:11.1f} {single_peak / 2**20:11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark: Japanese G2P pipelined ahead of Kokoro ONNX vs run in turn, on mixed JA/EN text."""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+from tts_worker.kokoro_engine import KokoroEngine, resolve_model_paths
+
+MIXED_TEXT = (
+    "Today we will practice ordering at a café. まず、店員さんに挨拶をしましょう。"
+    "Good morning, could I get a medium latte, please? "
+    "サイズはどうしますか、と聞かれたら、ミディアムでお願いしますと答えます。"
+    "Would you like anything else with that? いいえ、それで大丈夫です。"
+    "That will be four fifty. カードで払えますか？ Of course, just tap here. "
+    "ありがとうございます。良い一日を！ Thanks, you too."
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="tts-worker G2P/ONNX pipeline benchmark")
+    parser.add_argument("--text", default=MIXED_TEXT)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--voice", default=None)
+    return parser.parse_args()
+
+
+def timed_kokoro(engine: KokoroEngine) -> list[float]:
+    """Wraps the engine's Kokoro call to accumulate the time spent in ONNX inference."""
+    busy = [0.0]
+    create = engine._kokoro_create
+
+    def wrapped(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return create(*args, **kwargs)
+        finally:
+            busy[0] += time.perf_counter() - started
+
+    engine._kokoro_create = wrapped  # type: ignore[method-assign]
+    return busy
+
+
+def main() -> None:
+    args = parse_args()
+    engine = KokoroEngine(model_paths=resolve_model_paths())
+    busy = timed_kokoro(engine)
+    chunks = engine.chunk_text(args.text)
+    japanese = sum(1 for chunk in chunks if chunk.is_phonemes)
+    print(f"chunks={len(chunks)} (ja={japanese}, en={len(chunks) - japanese}) repeat={args.repeat}")
+
+    engine.pipeline_depth = 0
+    engine.synthesize_chunks(chunks, voice=args.voice)  # warmup: session init, dictionary load
+
+    print(f"{'depth':>5} {'wall s':>8} {'cpu s':>8} {'cpu util':>9} {'onnx busy':>10}")
+    for depth in args.depths:
+        engine.pipeline_depth = depth
+        best: tuple[float, float, float] | None = None
+        for _ in range(args.repeat):
+            busy[0] = 0.0
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            engine.synthesize_chunks(chunks, voice=args.voice)
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            if best is None or wall < best[0]:
+                best = (wall, cpu, busy[0])
+        assert best is not None
+        wall, cpu, onnx = best
+        print(f"{depth:>5} {wall:8.2f} {cpu:8.2f} {cpu / wall:8.2f}x {onnx / wall:9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import argparse
+import logging
+import os
 
 
 def parse_args() -> argparse.Namespace:
@@ -8,11 +10,48 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8092)
     parser.add_argument("--smoke", action="store_true")
+    subparsers = parser.add_subparsers(dest="command")
+
+    warm = subparsers.add_parser("warm-phonemes", help="add Japanese G2P results for a text corpus to the phoneme store")
+    warm.add_argument("corpus", nargs="+", help="UTF-8 text files, one request text per line")
+    warm.add_argument("--store", default=None, help="phoneme store path (default: TTS_PHONEME_STORE)")
     return parser.parse_args()
 
 
+def warm_phonemes(args: argparse.Namespace) -> None:
+    from pathlib import Path
+
+    from .g2p import JaPhonemizer, load_misaki_g2p, misaki_identity, warm_phoneme_store
+
+    store = (args.store or os.getenv("TTS_PHONEME_STORE", "")).strip()
+    if not store:
+        raise SystemExit("phoneme store path is not set (use --store or TTS_PHONEME_STORE)")
+
+    lines: list[str] = []
+    for corpus in args.corpus:
+        lines.extend(Path(corpus).expanduser().read_text(encoding="utf-8").splitlines())
+    total, added = warm_phoneme_store(
+        Path(store).expanduser(), lines, JaPhonemizer(load_misaki_g2p()), misaki_identity()
+    )
+    print(f"TTS worker phoneme store: {store} ({total} entries, {added} added)")
+
+
+def configure_logging() -> None:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("[tts-worker] %(message)s"))
+    logger = logging.getLogger("tts_worker")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
 def main() -> None:
     args = parse_args()
+    configure_logging()
+    if args.command == "warm-phonemes":
+        warm_phonemes(args)
+        return
+
     if args.smoke:
         from .chunking import split_text_chunks
         from .kokoro_engine import resolve_model_paths
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
 import base64
-import io
+import logging
 import os
-import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Literal
+from typing import Any, Iterator, Literal
 
-import soundfile as sf
+import numpy as np
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from .kokoro_engine import KokoroEngine, ModelPaths, resolve_model_paths
+from .g2p import misaki_identity, open_phoneme_store
+from .kokoro_engine import KOKORO_SAMPLE_RATE, KokoroEngine, ModelPaths, resolve_model_paths
+from .stats import LatencyWindow
+from .wav import encode_wav, pcm16_bytes, wav_header
 
 Language = Literal["ja", "en"]
 
+logger = logging.getLogger("tts_worker")
+
 
 class TtsRequest(BaseModel):
     text: str = Field(min_length=1, max_length=8000)
@@ -34,13 +39,25 @@ class TtsResponse(BaseModel):
 class WorkerSettings:
     default_voice: str = os.getenv("TTS_DEFAULT_VOICE", "af_heart").strip() or "af_heart"
     max_chars: int = int(os.getenv("TTS_MAX_CHARS", "8000"))
+    audio_cache_mb: float = float(os.getenv("TTS_AUDIO_CACHE_MB", "64"))
+    g2p_memo_entries: int = int(os.getenv("TTS_G2P_MEMO_ENTRIES", "4096"))
+    phoneme_store: str = os.getenv("TTS_PHONEME_STORE", "").strip()
+    pipeline_depth: int = int(os.getenv("TTS_PIPELINE_DEPTH", "2"))
 
 
 def create_app() -> FastAPI:
     settings = WorkerSettings()
     model_paths = resolve_model_paths()
-    engine = KokoroEngine(model_paths=model_paths, default_voice=settings.default_voice)
-    lock = threading.Lock()
+    engine = KokoroEngine(
+        model_paths=model_paths,
+        default_voice=settings.default_voice,
+        audio_cache_bytes=int(settings.audio_cache_mb * 1024 * 1024),
+        g2p_memo_entries=settings.g2p_memo_entries,
+        phoneme_store=open_phoneme_store(settings.phoneme_store, misaki_identity()),
+        pipeline_depth=settings.pipeline_depth,
+    )
+    stream_ttfa = LatencyWindow()
+    stream_total = LatencyWindow()
 
     app = FastAPI(title="english-trainer-tts-worker", version="0.1.0")
 
@@ -52,6 +69,9 @@ def create_app() -> FastAPI:
             "modelPath": str(model_paths.model_path),
             "voicesPath": str(model_paths.voices_path),
             "maxChars": settings.max_chars,
+            "audioCache": engine.audio_cache.stats(),
+            "g2p": engine.ja_phonemizer.stats(),
+            "stream": {"timeToFirstAudio": stream_ttfa.stats(), "total": stream_total.stats()},
         }
 
     @app.post("/v1/tts", response_model=TtsResponse)
@@ -65,7 +85,7 @@ def create_app() -> FastAPI:
             )
 
         voice = (request.voice or settings.default_voice).strip() or settings.default_voice
-        audio_bytes = synthesize_wav(engine, lock, text=text, voice=voice)
+        audio_bytes = synthesize_wav(engine, text=text, voice=voice)
         return TtsResponse(
             audioBase64=base64.b64encode(audio_bytes).decode("ascii"),
             mimeType="audio/wav",
@@ -74,7 +94,7 @@ def create_app() -> FastAPI:
         )
 
     @app.post("/v1/tts/stream")
-    def synthesize_stream(request: TtsRequest) -> Response:
+    def synthesize_stream(request: TtsRequest) -> StreamingResponse:
         text = request.text.strip()
         if not text:
             raise HTTPException(status_code=400, detail="text must be non-empty")
@@ -84,23 +104,42 @@ def create_app() -> FastAPI:
             )
 
         voice = (request.voice or settings.default_voice).strip() or settings.default_voice
-        audio_bytes = synthesize_wav(engine, lock, text=text, voice=voice)
-        return Response(content=audio_bytes, media_type="audio/wav")
+        started = time.perf_counter()
+        pieces = engine.iter_chunk_audio(engine.chunk_text(text), voice=voice)
+        # The first chunk is rendered before responding, so a failure there is still a clean 500.
+        try:
+            first_audio, sample_rate = next(pieces, (np.zeros(1, dtype=np.float32), KOKORO_SAMPLE_RATE))
+        except Exception as error:  # noqa: BLE001
+            raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {error}") from error
+        stream_ttfa.observe(time.perf_counter() - started)
+
+        def body() -> Iterator[bytes]:
+            yield wav_header(sample_rate) + pcm16_bytes(first_audio)
+            try:
+                for audio, _ in pieces:
+                    yield pcm16_bytes(audio)
+            except Exception as error:
+                # The 200 and an open-ended WAV header are already out; re-raising makes the server
+                # abort the connection so the client sees a failed transfer, not a short clip.
+                logger.error("stream synthesis failed mid-stream, aborting the response: %s", error)
+                raise
+            stream_total.observe(time.perf_counter() - started)
+
+        return StreamingResponse(body(), media_type="audio/wav")
 
     return app
 
 
-def synthesize_wav(engine: KokoroEngine, lock: threading.Lock, *, text: str, voice: str) -> bytes:
-    with lock:
-        try:
-            audio, sample_rate = engine.synthesize_text(text, voice=voice)
-        except Exception as error:  # noqa: BLE001
-            raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {error}") from error
+def synthesize_wav(engine: KokoroEngine, *, text: str, voice: str) -> bytearray:
+    try:
+        pieces, sample_rate = engine.collect_chunk_audio(engine.chunk_text(text), voice=voice)
+    except Exception as error:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {error}") from error
 
+    if not pieces:
+        pieces = [np.zeros(1, dtype=np.float32)]
     try:
-        with io.BytesIO() as buffer:
-            sf.write(buffer, audio, sample_rate, format="WAV", subtype="PCM_16")
-            return buffer.getvalue()
+        return encode_wav(pieces, sample_rate)
     except Exception as error:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=f"WAV encode failed: {error}") from error
 
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from .chunking import TextChunk
+from .wav import PCM16_SCALE, write_pcm16
+
+ChunkKey = Tuple[str, str, float, bool, str]
+
+
+def chunk_cache_key(chunk: TextChunk, voice: str) -> ChunkKey:
+    return (chunk.text, chunk.lang, chunk.speed, chunk.is_phonemes, voice)
+
+
+class ChunkAudioCache:
+    """LRU of rendered chunk audio kept as PCM_16, bounded by the bytes it holds."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[ChunkKey, Tuple[np.ndarray, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def __contains__(self, key: ChunkKey) -> bool:
+        """Membership without counting a lookup or refreshing the entry's recency."""
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: ChunkKey) -> Optional[Tuple[np.ndarray, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        samples, sample_rate = entry
+        return np.divide(samples, PCM16_SCALE, dtype=np.float32), sample_rate
+
+    def put(self, key: ChunkKey, audio: np.ndarray, sample_rate: int) -> None:
+        size = audio.shape[0] * 2
+        if size > self.max_bytes:
+            return
+        samples = np.empty(audio.shape[0], dtype=np.int16)
+        write_pcm16(audio, samples)
+        samples.flags.writeable = False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[0].nbytes
+            self._entries[key] = (samples, sample_rate)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hitRatio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
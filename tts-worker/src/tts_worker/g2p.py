@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from .chunking import split_text_chunks
+from .phoneme_store import PhonemeStore, write_phoneme_store
+
+G2P = Callable[[str], Any]
+
+logger = logging.getLogger("tts_worker")
+
+
+def load_misaki_g2p() -> G2P:
+    try:
+        from misaki import ja as misaki_ja  # type: ignore
+    except Exception as error:  # noqa: BLE001
+        raise RuntimeError(f"failed to import misaki.ja: {error}") from error
+    return misaki_ja.JAG2P(version="pyopenjtalk")
+
+
+def misaki_identity() -> str:
+    """Versions that determine G2P output; a phoneme store built by other versions is not used."""
+    versions = []
+    for package in ("misaki", "pyopenjtalk", "fugashi"):
+        try:
+            versions.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}=?")
+    return ";".join(versions)
+
+
+def open_phoneme_store(path: str, identity: str) -> Optional[PhonemeStore]:
+    if not path:
+        return None
+    try:
+        store = PhonemeStore(Path(path).expanduser())
+    except (OSError, ValueError) as error:
+        logger.warning("phoneme store not loaded: %s", error)
+        return None
+    if store.identity != identity:
+        logger.warning(
+            "phoneme store %s was built with %s (running %s); ignoring it, rebuild with `tts-worker warm-phonemes`",
+            path,
+            store.identity,
+            identity,
+        )
+        return None
+    return store
+
+
+class JaPhonemizer:
+    """Japanese G2P behind a bounded in-process memo and an optional on-disk phoneme store."""
+
+    def __init__(self, g2p: G2P, *, memo_entries: int = 0, store: Optional[PhonemeStore] = None) -> None:
+        self._g2p = g2p
+        self.memo_entries = max(0, memo_entries)
+        self.store = store
+        self._memo: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        # Live G2P swaps the process-wide sys.stdout, so only one call may run at a time.
+        self._live_lock = threading.Lock()
+        self._counts = {"memoHits": 0, "storeHits": 0, "live": 0}
+
+    def __call__(self, text: str) -> str:
+        with self._lock:
+            phonemes = self._memo.get(text)
+            if phonemes is not None:
+                self._memo.move_to_end(text)
+                self._counts["memoHits"] += 1
+                return phonemes
+
+        phonemes = self.store.get(text) if self.store is not None else None
+        source = "storeHits"
+        if phonemes is None:
+            phonemes = self.live(text)
+            source = "live"
+
+        with self._lock:
+            self._counts[source] += 1
+            if self.memo_entries > 0:
+                self._memo[text] = phonemes
+                self._memo.move_to_end(text)
+                while len(self._memo) > self.memo_entries:
+                    self._memo.popitem(last=False)
+        return phonemes
+
+    def live(self, text: str) -> str:
+        capture = io.StringIO()
+        # Keep FastAPI stdout clean by redirecting pyopenjtalk progress lines.
+        with self._live_lock, contextlib.redirect_stdout(capture):
+            raw = self._g2p(text)
+
+        echoed = capture.getvalue().strip()
+        if echoed:
+            print(echoed, file=sys.stderr)
+
+        return normalize_g2p_output(raw)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "memoEntries": len(self._memo),
+                "memoMaxEntries": self.memo_entries,
+                "storeEntries": self.store.count if self.store is not None else 0,
+                **self._counts,
+            }
+
+
+def normalize_g2p_output(raw: Any) -> str:
+    if isinstance(raw, str):
+        return raw
+
+    if isinstance(raw, (list, tuple)):
+        for item in raw:
+            if isinstance(item, str) and item.strip():
+                return item
+
+    if hasattr(raw, "phonemes"):
+        value = getattr(raw, "phonemes")
+        if isinstance(value, str) and value.strip():
+            return value
+
+    rendered = str(raw)
+    if rendered.strip():
+        return rendered
+
+    raise RuntimeError("misaki ja g2p returned empty phoneme output")
+
+
+def warm_phoneme_store(path: Path, lines: Iterable[str], phonemizer: JaPhonemizer, identity: str) -> tuple[int, int]:
+    """Adds the phonemes of every Japanese chunk in lines to path; returns (total entries, added)."""
+    entries: dict[str, str] = {}
+    if path.is_file():
+        try:
+            existing = PhonemeStore(path)
+            if existing.identity == identity:
+                entries.update(existing.items())
+        except (OSError, ValueError) as error:
+            logger.warning("existing phoneme store %s is unreadable, rebuilding it: %s", path, error)
+            entries.clear()
+
+    added = 0
+    for line in lines:
+        for chunk in split_text_chunks(line.strip()):
+            if chunk.is_phonemes and chunk.text not in entries:
+                entries[chunk.text] = phonemizer.live(chunk.text)
+                added += 1
+
+    write_phoneme_store(path, entries, identity)
+    return len(entries), added
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
-import contextlib
-import io
 import os
-import sys
+import queue
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Optional, Tuple
+from typing import Any, Iterable, Iterator, Optional, Tuple
 
 import numpy as np
 
+from .audio_cache import ChunkAudioCache, chunk_cache_key
 from .chunking import TextChunk, split_text_chunks
+from .g2p import JaPhonemizer, load_misaki_g2p
+from .phoneme_store import PhonemeStore
+
+KOKORO_SAMPLE_RATE = 24_000
+# How often a G2P worker blocked on a full queue checks whether the consumer has gone away.
+PIPELINE_POLL_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class PreparedChunk:
+    """A chunk ready for the Kokoro stage; ``source_text`` is None when its audio was already cached."""
+
+    chunk: TextChunk
+    source_text: Optional[str]
+
+
+_PIPELINE_DONE = object()
 
 
 @dataclass(frozen=True)
@@ -69,7 +86,16 @@ def verify_model_files(paths: ModelPaths) -> None:
 
 
 class KokoroEngine:
-    def __init__(self, *, model_paths: ModelPaths, default_voice: str = "af_heart") -> None:
+    def __init__(
+        self,
+        *,
+        model_paths: ModelPaths,
+        default_voice: str = "af_heart",
+        audio_cache_bytes: int = 0,
+        g2p_memo_entries: int = 0,
+        phoneme_store: Optional[PhonemeStore] = None,
+        pipeline_depth: int = 0,
+    ) -> None:
         verify_model_files(model_paths)
 
         self.model_paths = model_paths
@@ -80,13 +106,16 @@ class KokoroEngine:
         except Exception as error:  # noqa: BLE001
             raise RuntimeError(f"failed to import kokoro_onnx: {error}") from error
 
-        try:
-            from misaki import ja as misaki_ja  # type: ignore
-        except Exception as error:  # noqa: BLE001
-            raise RuntimeError(f"failed to import misaki.ja: {error}") from error
+        ja_g2p = load_misaki_g2p()
 
         self._kokoro = Kokoro(str(model_paths.model_path), str(model_paths.voices_path))
-        self._ja_g2p = misaki_ja.JAG2P(version="pyopenjtalk")
+        self.ja_phonemizer = JaPhonemizer(ja_g2p, memo_entries=g2p_memo_entries, store=phoneme_store)
+        # Held per ONNX run, so concurrent requests interleave chunk by chunk instead of queueing
+        # behind a whole text. G2P is serialized separately inside JaPhonemizer and runs meanwhile.
+        self._lock = threading.Lock()
+        self.audio_cache = ChunkAudioCache(audio_cache_bytes)
+        # Chunks phonemized ahead of the ONNX stage; 0 runs G2P and ONNX in turn on the caller's thread.
+        self.pipeline_depth = max(0, pipeline_depth)
 
     def chunk_text(self, text: str) -> list[TextChunk]:
         return split_text_chunks(text)
@@ -98,69 +127,121 @@ class KokoroEngine:
     def synthesize_chunks(
         self, chunks: Iterable[TextChunk], *, voice: Optional[str] = None
     ) -> Tuple[np.ndarray, int]:
-        combined: Optional[np.ndarray] = None
+        pieces, sample_rate = self.collect_chunk_audio(chunks, voice=voice)
+        if not pieces:
+            return np.zeros(1, dtype=np.float32), sample_rate
+
+        # One allocation for the whole text; appending chunk by chunk copies everything so far each time.
+        return np.concatenate(pieces), sample_rate
+
+    def collect_chunk_audio(
+        self, chunks: Iterable[TextChunk], *, voice: Optional[str] = None
+    ) -> Tuple[list[np.ndarray], int]:
+        """Every chunk's audio, unjoined, so callers can encode them without a combined float copy."""
+        pieces: list[np.ndarray] = []
+        sample_rate = KOKORO_SAMPLE_RATE
+        for audio, sample_rate in self.iter_chunk_audio(chunks, voice=voice):
+            pieces.append(audio)
+        return pieces, sample_rate
+
+    def iter_chunk_audio(
+        self, chunks: Iterable[TextChunk], *, voice: Optional[str] = None
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """Yields each chunk's audio as soon as it is synthesized, for streaming responses."""
         sample_rate: Optional[int] = None
         selected_voice = voice or self.default_voice
 
-        for chunk in chunks:
-            if not chunk.text:
-                continue
+        for prepared in self._prepare_chunks(chunks, selected_voice):
+            audio, chunk_rate = self._render_chunk(prepared, selected_voice)
 
-            source_text = chunk.text
-            if chunk.is_phonemes:
-                source_text = self._to_ja_phonemes(chunk.text)
+            if sample_rate is None:
+                sample_rate = chunk_rate
+            elif sample_rate != chunk_rate:
+                raise RuntimeError(f"sample rate mismatch: {sample_rate} vs {chunk_rate}")
 
-            audio, chunk_rate = self._kokoro_create(
+            yield audio, chunk_rate
+
+    def _prepare_chunks(self, chunks: Iterable[TextChunk], voice: str) -> Iterator[PreparedChunk]:
+        """G2P for each chunk, run up to pipeline_depth chunks ahead of the caller on a worker thread."""
+        if self.pipeline_depth == 0:
+            for chunk in chunks:
+                if chunk.text:
+                    yield self._prepare_chunk(chunk, voice)
+            return
+
+        ready: queue.Queue[Any] = queue.Queue(maxsize=self.pipeline_depth)
+        abandoned = threading.Event()
+
+        def offer(item: Any) -> bool:
+            while not abandoned.is_set():
+                try:
+                    ready.put(item, timeout=PIPELINE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for chunk in chunks:
+                    if chunk.text and not offer(self._prepare_chunk(chunk, voice)):
+                        return
+            except BaseException as error:  # noqa: BLE001
+                offer(error)
+                return
+            offer(_PIPELINE_DONE)
+
+        threading.Thread(target=produce, name="tts-g2p", daemon=True).start()
+        try:
+            while True:
+                item = ready.get()
+                if item is _PIPELINE_DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # The consumer stopped (finished, failed or the stream was dropped); let the worker exit.
+            abandoned.set()
+
+    def _prepare_chunk(self, chunk: TextChunk, voice: str) -> PreparedChunk:
+        if self.audio_cache.enabled and chunk_cache_key(chunk, voice) in self.audio_cache:
+            return PreparedChunk(chunk=chunk, source_text=None)
+        return PreparedChunk(chunk=chunk, source_text=self._source_text(chunk))
+
+    def _render_chunk(self, prepared: PreparedChunk, voice: str) -> Tuple[np.ndarray, int]:
+        chunk = prepared.chunk
+        # Looked up here rather than when preparing, so a sentence repeated within one text is
+        # served from the copy rendered a moment ago.
+        key = chunk_cache_key(chunk, voice) if self.audio_cache.enabled else None
+        if key is not None:
+            cached = self.audio_cache.get(key)
+            if cached is not None:
+                return cached
+
+        source_text = prepared.source_text
+        if source_text is None:
+            # Evicted since it was prepared.
+            source_text = self._source_text(chunk)
+        with self._lock:
+            audio, sample_rate = self._kokoro_create(
                 source_text,
-                voice=selected_voice,
+                voice=voice,
                 lang=chunk.lang,
                 speed=chunk.speed,
                 is_phonemes=chunk.is_phonemes,
             )
+        if key is not None:
+            self.audio_cache.put(key, audio, sample_rate)
+        return audio, sample_rate
 
-            if sample_rate is None:
-                sample_rate = chunk_rate
-            elif sample_rate != chunk_rate:
-                raise RuntimeError(f"sample rate mismatch: {sample_rate} vs {chunk_rate}")
-
-            if combined is None:
-                combined = audio
-            else:
-                combined = np.concatenate([combined, audio])
-
-        if combined is None or sample_rate is None:
-            return np.zeros(1, dtype=np.float32), 24_000
-
-        return combined.astype(np.float32, copy=False), sample_rate
+    def _source_text(self, chunk: TextChunk) -> str:
+        if chunk.is_phonemes:
+            return self._to_ja_phonemes(chunk.text)
+        return chunk.text
 
     def _to_ja_phonemes(self, text: str) -> str:
-        capture = io.StringIO()
-        # Keep FastAPI stdout clean by redirecting pyopenjtalk progress lines.
-        with contextlib.redirect_stdout(capture):
-            raw = self._ja_g2p(text)
-
-        echoed = capture.getvalue().strip()
-        if echoed:
-            print(echoed, file=sys.stderr)
-
-        if isinstance(raw, str):
-            return raw
-
-        if isinstance(raw, (list, tuple)):
-            for item in raw:
-                if isinstance(item, str) and item.strip():
-                    return item
-
-        if hasattr(raw, "phonemes"):
-            value = getattr(raw, "phonemes")
-            if isinstance(value, str) and value.strip():
-                return value
-
-        rendered = str(raw)
-        if rendered.strip():
-            return rendered
-
-        raise RuntimeError("misaki ja g2p returned empty phoneme output")
+        return self.ja_phonemizer(text)
 
     def _kokoro_create(
         self, text: str, *, voice: str, lang: str, speed: float, is_phonemes: bool
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"TTSPHON1"
+# magic, entry count, identity length; followed by the identity, padded to 8 bytes, then
+# count + 1 uint64 key offsets, count + 1 uint64 value offsets, the UTF-8 keys sorted bytewise
+# and their values.
+HEADER = struct.Struct("<8sII")
+
+
+class PhonemeStore:
+    """Read-only text -> phoneme table, memory-mapped and binary-searched in place."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, count, identity_length = HEADER.unpack_from(self._map, 0)
+        except struct.error as error:
+            raise ValueError(f"truncated phoneme store: {path}") from error
+        if magic != MAGIC:
+            raise ValueError(f"not a phoneme store: {path}")
+        self.identity = self._map[HEADER.size : HEADER.size + identity_length].decode("utf-8")
+        self.count = count
+        table_start = _align8(HEADER.size + identity_length)
+        self._key_offsets = np.frombuffer(self._map, dtype="<u8", count=count + 1, offset=table_start)
+        self._value_offsets = np.frombuffer(
+            self._map, dtype="<u8", count=count + 1, offset=table_start + (count + 1) * 8
+        )
+        self._keys_start = table_start + (count + 1) * 16
+        self._values_start = self._keys_start + int(self._key_offsets[-1])
+        if len(self._map) < self._values_start + int(self._value_offsets[-1]):
+            raise ValueError(f"truncated phoneme store: {path}")
+
+    def get(self, text: str) -> Optional[str]:
+        key = text.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._key(middle)
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                start = self._values_start + int(self._value_offsets[middle])
+                end = self._values_start + int(self._value_offsets[middle + 1])
+                return self._map[start:end].decode("utf-8")
+        return None
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        for index in range(self.count):
+            start = self._values_start + int(self._value_offsets[index])
+            end = self._values_start + int(self._value_offsets[index + 1])
+            yield self._key(index).decode("utf-8"), self._map[start:end].decode("utf-8")
+
+    def _key(self, index: int) -> bytes:
+        start = self._keys_start + int(self._key_offsets[index])
+        end = self._keys_start + int(self._key_offsets[index + 1])
+        return self._map[start:end]
+
+
+def write_phoneme_store(path: Path, entries: Mapping[str, str], identity: str) -> None:
+    """Writes ``entries`` as a store (atomically, so running workers keep their old mapping)."""
+    encoded = sorted((key.encode("utf-8"), value.encode("utf-8")) for key, value in entries.items())
+    identity_bytes = identity.encode("utf-8")
+    key_offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    value_offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(key) for key, _ in encoded], out=key_offsets[1:])
+    np.cumsum([len(value) for _, value in encoded], out=value_offsets[1:])
+
+    header = HEADER.pack(MAGIC, len(encoded), len(identity_bytes)) + identity_bytes
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    with temporary.open("wb") as handle:
+        handle.write(header.ljust(_align8(len(header)), b"\0"))
+        handle.write(key_offsets.tobytes())
+        handle.write(value_offsets.tobytes())
+        handle.writelines(key for key, _ in encoded)
+        handle.writelines(value for _, value in encoded)
+    os.replace(temporary, path)
+
+
+def _align8(size: int) -> int:
+    return (size + 7) & ~7
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any
+
+RECENT_SAMPLES = 256
+
+
+class LatencyWindow:
+    """Count, last value and percentiles over the most recent samples of one latency."""
+
+    def __init__(self, size: int = RECENT_SAMPLES) -> None:
+        self._recent: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._count = 0
+        self._last = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._recent.append(seconds)
+            self._count += 1
+            self._last = seconds
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self._recent)
+            count, last = self._count, self._last
+        if not ordered:
+            return {"count": 0}
+        return {
+            "count": count,
+            "lastMs": round(last * 1000.0, 1),
+            "p50Ms": round(percentile(ordered, 0.5) * 1000.0, 1),
+            "p95Ms": round(percentile(ordered, 0.95) * 1000.0, 1),
+            "maxMs": round(ordered[-1] * 1000.0, 1),
+        }
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
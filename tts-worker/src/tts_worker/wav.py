@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import struct
+from typing import Sequence
+
+import numpy as np
+
+# RIFF/data sizes for a stream whose length is unknown up front; players read until EOF.
+STREAMING_SIZE = 0xFFFFFFFF
+WAV_HEADER_BYTES = 44
+# Samples converted per step; bounds the float scratch needed while encoding.
+PCM16_BLOCK_SAMPLES = 1 << 14
+# Same scale as libsndfile's float -> PCM_16 conversion (which floors; this rounds to nearest).
+PCM16_SCALE = 32768.0
+
+
+def wav_header(sample_rate: int, data_bytes: int = STREAMING_SIZE, channels: int = 1) -> bytes:
+    """44-byte PCM_16 WAV header; the default sizes mark an open-ended stream."""
+    block_align = channels * 2
+    riff_size = STREAMING_SIZE if data_bytes == STREAMING_SIZE else 36 + data_bytes
+    return b"".join(
+        (
+            b"RIFF",
+            struct.pack("<I", riff_size),
+            b"WAVEfmt ",
+            struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, 16),
+            b"data",
+            struct.pack("<I", data_bytes),
+        )
+    )
+
+
+def encode_wav(pieces: Sequence[np.ndarray], sample_rate: int) -> bytearray:
+    """Mono PCM_16 WAV of pieces back to back, each converted straight into one preallocated buffer."""
+    total_samples = sum(piece.shape[0] for piece in pieces)
+    output = bytearray(WAV_HEADER_BYTES + total_samples * 2)
+    output[:WAV_HEADER_BYTES] = wav_header(sample_rate, total_samples * 2)
+    samples = np.frombuffer(output, dtype="<i2", offset=WAV_HEADER_BYTES)
+    offset = 0
+    for piece in pieces:
+        write_pcm16(piece, samples[offset : offset + piece.shape[0]])
+        offset += piece.shape[0]
+    return output
+
+
+def pcm16_bytes(audio: np.ndarray) -> bytes:
+    """Float samples in [-1, 1] as little-endian 16-bit PCM (clipped, rounded)."""
+    samples = np.empty(audio.shape[0], dtype="<i2")
+    write_pcm16(audio, samples)
+    return samples.tobytes()
+
+
+def write_pcm16(audio: np.ndarray, out: np.ndarray) -> None:
+    """Encodes float samples into the int16 array ``out`` a block at a time through one small scratch."""
+    scratch = np.empty(min(PCM16_BLOCK_SAMPLES, audio.shape[0]), dtype=np.float32)
+    for start in range(0, audio.shape[0], PCM16_BLOCK_SAMPLES):
+        block = audio[start : start + PCM16_BLOCK_SAMPLES]
+        work = scratch[: block.shape[0]]
+        np.multiply(block, PCM16_SCALE, out=work, casting="unsafe")
+        np.clip(work, -32768.0, 32767.0, out=work)
+        np.rint(work, out=work)
+        np.copyto(out[start : start + block.shape[0]], work, casting="unsafe")
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import io
+import logging
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi.testclient import TestClient
+
+from tts_worker import app as app_module
+from tts_worker.audio_cache import ChunkAudioCache
+from tts_worker.chunking import TextChunk, split_text_chunks
+from tts_worker.g2p import JaPhonemizer
+from tts_worker.kokoro_engine import KOKORO_SAMPLE_RATE, ModelPaths
+from tts_worker.wav import STREAMING_SIZE, pcm16_bytes
+
+TEXT = "First sentence. Second sentence. Third sentence."
+
+
+def chunk_audio(index: int) -> np.ndarray:
+    samples = np.arange(2400, dtype=np.float32)
+    return (0.1 * (index + 1) * np.sin(samples / 7)).astype(np.float32)
+
+
+class FakeEngine:
+    """Stands in for KokoroEngine: one short tone per chunk, optionally failing at chunk ``fail_at``."""
+
+    fail_at: int | None = None
+
+    def __init__(self, **_: Any) -> None:
+        self.audio_cache = ChunkAudioCache(0)
+        self.ja_phonemizer = JaPhonemizer(lambda text: text)
+
+    def chunk_text(self, text: str) -> list[TextChunk]:
+        return split_text_chunks(text)
+
+    def iter_chunk_audio(
+        self, chunks: Iterable[TextChunk], *, voice: str | None = None
+    ) -> Iterator[tuple[np.ndarray, int]]:
+        for index, _ in enumerate(chunks):
+            if index == self.fail_at:
+                raise RuntimeError("onnx run failed")
+            yield chunk_audio(index), KOKORO_SAMPLE_RATE
+
+
+@pytest.fixture
+def make_client(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(app_module, "KokoroEngine", FakeEngine)
+    paths = ModelPaths(Path("model.onnx"), Path("voices.bin"))
+    monkeypatch.setattr(app_module, "resolve_model_paths", lambda: paths)
+
+    def make(fail_at: int | None = None) -> TestClient:
+        monkeypatch.setattr(FakeEngine, "fail_at", fail_at)
+        return TestClient(app_module.create_app())
+
+    return make
+
+
+def test_stream_is_a_playable_wav_of_every_chunk(make_client) -> None:
+    response = make_client().post("/v1/tts/stream", json={"text": TEXT})
+
+    assert response.status_code == 200
+    body = response.content
+    assert int.from_bytes(body[40:44], "little") == STREAMING_SIZE
+    chunks = len(split_text_chunks(TEXT))
+    assert body[44:] == b"".join(pcm16_bytes(chunk_audio(index)) for index in range(chunks))
+    audio, sample_rate = sf.read(io.BytesIO(body), dtype="int16")
+    assert sample_rate == KOKORO_SAMPLE_RATE
+    assert audio.tobytes() == body[44:]
+
+
+def test_first_chunk_failure_is_a_clean_500(make_client) -> None:
+    response = make_client(fail_at=0).post("/v1/tts/stream", json={"text": TEXT})
+    assert response.status_code == 500
+    assert "onnx run failed" in response.json()["detail"]
+
+
+def test_mid_stream_failure_aborts_the_response(make_client, caplog: pytest.LogCaptureFixture) -> None:
+    client = make_client(fail_at=1)
+    with caplog.at_level(logging.ERROR, logger="tts_worker"):
+        with pytest.raises(RuntimeError, match="onnx run failed"):
+            client.post("/v1/tts/stream", json={"text": TEXT})
+    assert "aborting the response" in caplog.text
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import numpy as np
+
+from tts_worker.audio_cache import ChunkAudioCache, chunk_cache_key
+from tts_worker.chunking import TextChunk
+from tts_worker.wav import PCM16_SCALE
+
+
+def key(text: str) -> tuple[str, str, float, bool, str]:
+    return chunk_cache_key(TextChunk(text=text, lang="en-us", speed=1.0, is_phonemes=False), "af_heart")
+
+
+def audio(samples: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).uniform(-0.9, 0.9, samples).astype(np.float32)
+
+
+def test_key_separates_voice_and_settings() -> None:
+    chunk = TextChunk(text="Hello.", lang="en-us", speed=1.0, is_phonemes=False)
+
+    assert chunk_cache_key(chunk, "af_heart") != chunk_cache_key(chunk, "am_adam")
+    assert chunk_cache_key(chunk, "af_heart") != chunk_cache_key(
+        TextChunk(text="Hello.", lang="en-us", speed=1.2, is_phonemes=False), "af_heart"
+    )
+
+
+def test_get_returns_audio_within_one_pcm16_step() -> None:
+    cache = ChunkAudioCache(1 << 20)
+    original = audio(2400)
+
+    cache.put(key("a"), original, 24_000)
+    cached = cache.get(key("a"))
+
+    assert cached is not None
+    restored, sample_rate = cached
+    assert sample_rate == 24_000
+    assert restored.dtype == np.float32
+    assert np.max(np.abs(restored - original)) <= 1 / PCM16_SCALE
+
+
+def test_evicts_least_recently_used_within_byte_bound() -> None:
+    cache = ChunkAudioCache(3 * 200)  # three 100-sample entries
+    for name in ("a", "b", "c"):
+        cache.put(key(name), audio(100), 24_000)
+
+    assert cache.get(key("a")) is not None  # "b" is now the oldest
+    cache.put(key("d"), audio(100), 24_000)
+
+    assert key("b") not in cache
+    assert all(key(name) in cache for name in ("a", "c", "d"))
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] == 600
+    assert stats["evictions"] == 1
+
+
+def test_replacing_an_entry_does_not_double_count_bytes() -> None:
+    cache = ChunkAudioCache(1000)
+
+    cache.put(key("a"), audio(100), 24_000)
+    cache.put(key("a"), audio(300), 24_000)
+
+    assert cache.stats()["bytes"] == 600
+    assert cache.stats()["entries"] == 1
+
+
+def test_entries_larger_than_the_cache_are_not_stored() -> None:
+    cache = ChunkAudioCache(100)
+    cache.put(key("small"), audio(10), 24_000)
+
+    cache.put(key("large"), audio(51), 24_000)
+
+    assert key("large") not in cache
+    assert key("small") in cache
+    assert cache.stats()["evictions"] == 0
+
+
+def test_disabled_cache_stores_nothing() -> None:
+    cache = ChunkAudioCache(0)
+
+    cache.put(key("a"), audio(1), 24_000)
+
+    assert not cache.enabled
+    assert cache.get(key("a")) is None
+
+
+def test_membership_does_not_count_or_refresh() -> None:
+    cache = ChunkAudioCache(2 * 200)
+    cache.put(key("a"), audio(100), 24_000)
+    cache.put(key("b"), audio(100), 24_000)
+
+    assert key("a") in cache
+    assert key("missing") not in cache
+    cache.put(key("c"), audio(100), 24_000)
+
+    assert key("a") not in cache
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hitRatio"]) == (0, 0, 0.0)
+
+
+def test_stats_hit_ratio() -> None:
+    cache = ChunkAudioCache(1 << 20)
+    cache.put(key("a"), audio(10), 24_000)
+
+    cache.get(key("a"))
+    cache.get(key("a"))
+    cache.get(key("b"))
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hitRatio"] == round(2 / 3, 4)
+    assert stats["maxBytes"] == 1 << 20
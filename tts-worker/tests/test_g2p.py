@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from tts_worker.chunking import split_text_chunks
+from tts_worker.g2p import JaPhonemizer, load_misaki_g2p, misaki_identity, open_phoneme_store, warm_phoneme_store
+from tts_worker.phoneme_store import PhonemeStore
+
+CORPUS = [
+    "今日はいい天気ですね。明日も晴れるでしょう。",
+    "Let's practice. もう一度ゆっくり言ってください。",
+    "すみません、駅はどこですか？",
+    "今日はいい天気ですね。",
+]
+UNSEEN = ["ありがとうございました。", "東京で会いましょう。"]
+
+
+class FakeG2P:
+    """Deterministic stand-in for misaki's JAG2P: prints progress and returns (phonemes, tokens)."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, text: str) -> tuple[str, None]:
+        self.calls += 1
+        print("progress line")
+        return "".join(f"{ord(char):x}." for char in text), None
+
+
+def japanese_chunks(lines: list[str]) -> list[str]:
+    return [chunk.text for line in lines for chunk in split_text_chunks(line) if chunk.is_phonemes]
+
+
+def assert_matches_live(phonemizer: JaPhonemizer, live: JaPhonemizer, texts: list[str]) -> None:
+    for text in texts:
+        assert phonemizer(text) == live.live(text)
+
+
+def test_memo_and_store_return_live_phonemes(tmp_path: Path) -> None:
+    path = tmp_path / "phonemes.bin"
+    total, added = warm_phoneme_store(path, CORPUS, JaPhonemizer(FakeG2P()), "fake")
+    texts = japanese_chunks(CORPUS)
+    assert total == added == len(set(texts))
+
+    g2p = FakeG2P()
+    phonemizer = JaPhonemizer(g2p, memo_entries=16, store=open_phoneme_store(str(path), "fake"))
+    live = JaPhonemizer(FakeG2P())
+    assert_matches_live(phonemizer, live, texts)
+    assert g2p.calls == 0
+
+    assert_matches_live(phonemizer, live, UNSEEN * 2)
+    assert g2p.calls == len(UNSEEN)
+    stats = phonemizer.stats()
+    assert stats["storeHits"] == len(set(texts))
+    assert stats["live"] == len(UNSEEN)
+
+
+def test_memo_is_bounded(capsys: pytest.CaptureFixture[str]) -> None:
+    g2p = FakeG2P()
+    phonemizer = JaPhonemizer(g2p, memo_entries=2)
+    for text in ["あ", "い", "う", "あ"]:
+        assert phonemizer(text) == JaPhonemizer(FakeG2P()).live(text)
+
+    assert phonemizer.stats()["memoEntries"] == 2
+    assert g2p.calls == 4
+    assert capsys.readouterr().out == ""
+
+
+def test_store_from_another_g2p_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "phonemes.bin"
+    warm_phoneme_store(path, CORPUS, JaPhonemizer(FakeG2P()), "fake")
+    assert open_phoneme_store(str(path), "other") is None
+
+    total, added = warm_phoneme_store(path, UNSEEN, JaPhonemizer(FakeG2P()), "other")
+    assert total == added == len(UNSEEN)
+    assert PhonemeStore(path).identity == "other"
+
+
+@pytest.mark.parametrize("keep_bytes", [0, 10, 40, -3])
+def test_truncated_store_is_rebuilt(tmp_path: Path, keep_bytes: int) -> None:
+    path = tmp_path / "phonemes.bin"
+    warm_phoneme_store(path, CORPUS, JaPhonemizer(FakeG2P()), "fake")
+    path.write_bytes(path.read_bytes()[:keep_bytes])
+    assert open_phoneme_store(str(path), "fake") is None
+
+    total, added = warm_phoneme_store(path, CORPUS, JaPhonemizer(FakeG2P()), "fake")
+    assert total == added == len(set(japanese_chunks(CORPUS)))
+    store = open_phoneme_store(str(path), "fake")
+    assert store is not None
+    for text in japanese_chunks(CORPUS):
+        assert store.get(text) == JaPhonemizer(FakeG2P()).live(text)
+
+
+def test_store_matches_misaki(tmp_path: Path) -> None:
+    pytest.importorskip("pyopenjtalk")
+    try:
+        g2p = load_misaki_g2p()
+    except RuntimeError as error:
+        pytest.skip(str(error))
+
+    path = tmp_path / "phonemes.bin"
+    identity = misaki_identity()
+    warm_phoneme_store(path, CORPUS, JaPhonemizer(g2p), identity)
+    phonemizer = JaPhonemizer(g2p, memo_entries=16, store=open_phoneme_store(str(path), identity))
+    assert_matches_live(phonemizer, JaPhonemizer(g2p), japanese_chunks(CORPUS + UNSEEN))
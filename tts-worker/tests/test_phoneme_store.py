@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from tts_worker.phoneme_store import PhonemeStore, write_phoneme_store
+
+ENTRIES = {
+    "こんにちは": "koɲɲiʨiwa",
+    "ありがとう": "aɾʲiɡatoː",
+    "Zebra": "zˈiːbɹə",
+    "apple": "ˈæpəl",
+    "": "empty key",
+    "長い文。" * 50: "long" * 100,
+}
+
+
+def test_lookup_returns_every_written_entry(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    write_phoneme_store(path, ENTRIES, "misaki=1")
+
+    store = PhonemeStore(path)
+
+    assert store.identity == "misaki=1"
+    assert store.count == len(ENTRIES)
+    for text, phonemes in ENTRIES.items():
+        assert store.get(text) == phonemes
+
+
+def test_missing_keys_return_none(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    write_phoneme_store(path, ENTRIES, "misaki=1")
+
+    store = PhonemeStore(path)
+
+    for text in ("こんにち", "こんにちはは", "Apple", "zzz", " "):
+        assert store.get(text) is None
+
+
+def test_items_are_sorted_by_utf8_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    write_phoneme_store(path, ENTRIES, "misaki=1")
+
+    items = list(PhonemeStore(path).items())
+
+    assert dict(items) == ENTRIES
+    assert [key.encode("utf-8") for key, _ in items] == sorted(key.encode("utf-8") for key in ENTRIES)
+
+
+def test_empty_store(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    write_phoneme_store(path, {}, "")
+
+    store = PhonemeStore(path)
+
+    assert store.count == 0
+    assert store.identity == ""
+    assert store.get("anything") is None
+    assert list(store.items()) == []
+
+
+def test_rewrite_replaces_the_store(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    write_phoneme_store(path, {"a": "1"}, "old")
+    old = PhonemeStore(path)
+
+    write_phoneme_store(path, {"b": "2"}, "new")
+    new = PhonemeStore(path)
+
+    # Readers opened before the rewrite keep their mapping.
+    assert old.get("a") == "1"
+    assert (new.identity, new.get("a"), new.get("b")) == ("new", None, "2")
+
+
+def test_other_files_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    path.write_bytes(b"NOTASTORE" + bytes(32))
+
+    with pytest.raises(ValueError, match="not a phoneme store"):
+        PhonemeStore(path)
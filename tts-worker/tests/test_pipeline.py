@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import pytest
+
+from tts_worker.audio_cache import ChunkAudioCache
+from tts_worker.chunking import TextChunk
+from tts_worker.kokoro_engine import KOKORO_SAMPLE_RATE, KokoroEngine
+
+CHUNKS = [
+    TextChunk(text="First.", lang="en-us", speed=1.0),
+    TextChunk(text="にばんめ", lang="ja", speed=1.0, is_phonemes=True),
+    TextChunk(text="", lang="en-us", speed=1.0),
+    TextChunk(text="さんばんめ", lang="ja", speed=1.0, is_phonemes=True),
+    TextChunk(text="Last.", lang="en-us", speed=1.0),
+]
+
+
+class FakeKokoro:
+    """Renders the source text's length as a constant tone so outputs identify their chunk."""
+
+    def __init__(self) -> None:
+        self.rendered: list[str] = []
+        self.before_render = lambda text: None
+
+    def create(self, text: str, *, voice: str, lang: str, speed: float, is_phonemes: bool) -> tuple[Any, int]:
+        self.before_render(text)
+        self.rendered.append(text)
+        return np.full(len(text) * 10, len(text) / 100, dtype=np.float32), KOKORO_SAMPLE_RATE
+
+
+class FakePhonemizer:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.fail_on: str | None = None
+
+    def __call__(self, text: str) -> str:
+        if text == self.fail_on:
+            raise RuntimeError(f"g2p failed on {text}")
+        self.calls.append(text)
+        return f"/{text}/"
+
+
+def make_engine(pipeline_depth: int, audio_cache_bytes: int = 0) -> KokoroEngine:
+    # Skips __init__, which needs the model files and kokoro_onnx.
+    engine = object.__new__(KokoroEngine)
+    engine.default_voice = "af_heart"
+    engine._kokoro = FakeKokoro()
+    engine.ja_phonemizer = FakePhonemizer()
+    engine._lock = threading.Lock()
+    engine.audio_cache = ChunkAudioCache(audio_cache_bytes)
+    engine.pipeline_depth = pipeline_depth
+    return engine
+
+
+def g2p_threads() -> list[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name == "tts-g2p"]
+
+
+@pytest.mark.parametrize("depth", [1, 2, 8])
+def test_pipelined_output_matches_sequential(depth: int) -> None:
+    sequential = make_engine(0)
+    pipelined = make_engine(depth)
+
+    expected = list(sequential.iter_chunk_audio(CHUNKS))
+    actual = list(pipelined.iter_chunk_audio(CHUNKS))
+
+    assert len(actual) == len(expected) == 4
+    for (audio, rate), (expected_audio, expected_rate) in zip(actual, expected):
+        assert rate == expected_rate
+        np.testing.assert_array_equal(audio, expected_audio)
+    assert pipelined._kokoro.rendered == ["First.", "/にばんめ/", "/さんばんめ/", "Last."]
+    assert pipelined.ja_phonemizer.calls == ["にばんめ", "さんばんめ"]
+
+
+def test_g2p_runs_ahead_of_the_onnx_stage() -> None:
+    engine = make_engine(2)
+    second_ready = threading.Event()
+    phonemizer = engine.ja_phonemizer
+
+    def phonemize(text: str) -> str:
+        result = phonemizer(text)
+        if text == "さんばんめ":
+            second_ready.set()
+        return result
+
+    engine.ja_phonemizer = phonemize
+
+    def before_render(text: str) -> None:
+        if text == "/にばんめ/":
+            # Chunk 3's G2P finishes while chunk 1 is still being rendered.
+            assert second_ready.wait(timeout=5)
+
+    engine._kokoro.before_render = before_render
+
+    assert len(list(engine.iter_chunk_audio(CHUNKS))) == 4
+
+
+def test_g2p_error_reaches_the_consumer_after_earlier_chunks() -> None:
+    engine = make_engine(2)
+    engine.ja_phonemizer.fail_on = "さんばんめ"
+
+    stream = engine.iter_chunk_audio(CHUNKS)
+    first, _ = next(stream)
+    second, _ = next(stream)
+    with pytest.raises(RuntimeError, match="g2p failed"):
+        next(stream)
+
+    assert first.shape[0] == len("First.") * 10
+    assert second.shape[0] == len("/にばんめ/") * 10
+
+
+def test_dropping_the_stream_stops_the_g2p_thread() -> None:
+    engine = make_engine(1)
+    chunks = [TextChunk(text=f"ぶん{index}", lang="ja", speed=1.0, is_phonemes=True) for index in range(50)]
+
+    stream = engine.iter_chunk_audio(chunks)
+    next(stream)
+    stream.close()
+
+    deadline = time.monotonic() + 5
+    while g2p_threads() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert not g2p_threads()
+    assert len(engine.ja_phonemizer.calls) < len(chunks)
+
+
+def test_cached_chunks_skip_g2p_and_rendering() -> None:
+    engine = make_engine(2, audio_cache_bytes=1 << 20)
+    first = list(engine.iter_chunk_audio(CHUNKS))
+    engine._kokoro.rendered.clear()
+    engine.ja_phonemizer.calls.clear()
+
+    second = list(engine.iter_chunk_audio(CHUNKS))
+
+    assert engine._kokoro.rendered == []
+    assert engine.ja_phonemizer.calls == []
+    for (audio, _), (cached, _) in zip(first, second):
+        assert np.max(np.abs(audio - cached)) <= 1 / 32768